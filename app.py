@@ -6,12 +6,19 @@ from pathlib import Path
 import sys
 import asyncio
 import base64
+import datetime
+import time
+import uuid
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from src.config import Config
 from src.vector_store import VectorStore
 from src.llm_client import LLMClient
+from src.metadata_fields import RangeFilter
+from src.metrics import observe_stage, record_error, start_exporter
+from src.profiler import profile_request
+from src.relevance_gate import OFF_TOPIC_MESSAGE
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,13 +52,39 @@ def is_irrelevant_question(response):
             return True
     return False
 
+def sidebar_range_filter():
+    st.sidebar.markdown("### Filters")
+    date_from = date_to = lok_sabha = session_from = session_to = None
+
+    if st.sidebar.checkbox("Filter by answer date"):
+        today = datetime.date.today()
+        dates = st.sidebar.date_input(
+            "Answered between",
+            value=(today - datetime.timedelta(days=365), today),
+        )
+        # The widget returns a single date while the second end is being picked
+        if isinstance(dates, (list, tuple)) and len(dates) == 2:
+            date_from, date_to = dates
+
+    if st.sidebar.checkbox("Filter by session"):
+        lok_sabha = int(st.sidebar.number_input(
+            "Lok Sabha", min_value=1, max_value=30, value=Config.DEFAULT_LOK_SABHA, step=1
+        ))
+        session_from, session_to = st.sidebar.slider(
+            "Sessions", min_value=1, max_value=15, value=(1, Config.DEFAULT_SESSION)
+        )
+
+    return RangeFilter(date_from, date_to, lok_sabha, session_from, session_to)
+
 @st.cache_resource
 def initialize_components():
     try:
         if not Config.validate_environment():
             st.error("Environment validation failed. Check your API keys.")
             return None, None
+        start_exporter()
         vector_store = VectorStore()
+        vector_store.preload_partitions()
         llm_client = LLMClient()
         return vector_store, llm_client
     except Exception as e:
@@ -77,27 +110,47 @@ def main():
         st.warning("No ministries have been indexed. Please run the PDF fetcher first.")
         return
     indexed_ministries.sort()
-    selected_ministry = st.sidebar.selectbox("", options=indexed_ministries, index=0)
+    selected_ministry = st.sidebar.selectbox(
+        "", options=indexed_ministries + [Config.ALL_MINISTRIES], index=0
+    )
+    range_filter = sidebar_range_filter()
     query = st.text_input("Enter your question for the selected ministry:", key="query",label_visibility="visible")
     if query and st.button("Submit Question"):
-        with st.spinner("Loading"):
+        with st.spinner("Loading"), profile_request(selected_ministry, stage_root="app"):
             try:
-                documents = vector_store.search_by_text(
+                documents, decision = vector_store.search_for_answer(
                     query=query,
                     ministry=selected_ministry,
                     n_results=Config.MAX_DOCS_PER_QUERY,
+                    range_filter=range_filter,
                 )
                 if not documents:
                     st.warning(f"No relevant documents found for {selected_ministry}.")
                     return
+                if not decision.allowed:
+                    st.markdown("### Response:")
+                    st.markdown(OFF_TOPIC_MESSAGE)
+                    if decision.suggested_ministry:
+                        st.info(
+                            f"This looks like a question for the {decision.suggested_ministry}. "
+                            "Select it in the sidebar to ask there."
+                        )
+                    return
+                if any(doc.get("metadata", {}).get("fallback") for doc in documents):
+                    st.info(
+                        f"No {selected_ministry} records matched, so this answer draws on "
+                        "records from other ministries."
+                    )
                 with st.spinner("Please wait..."):
                     response = run_async(
                         llm_client.generate_response(
                             question=query,
                             context=documents,
                             ministry=selected_ministry,
+                            session_id=st.session_state.setdefault("session_id", uuid.uuid4().hex),
                         )
                     )
+                    render_start = time.perf_counter()
                     st.markdown("### Response:")
                     st.markdown(response)
                 if not is_irrelevant_question(response):
@@ -135,9 +188,11 @@ def main():
                     st.info(
                         "Alert: This question is not relevant to the ministry affairs."
                     )
+                observe_stage("ui_rendering", time.perf_counter() - render_start)
             except Exception as e:
                 st.error(f"Error processing query: {e}")
                 logger.error(f"Error processing query: {e}")
+                record_error("query")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
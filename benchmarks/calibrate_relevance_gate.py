@@ -0,0 +1,204 @@
+# Calibrate the relevance gate thresholds on on-topic, wrong-ministry and off-topic questions
+
+import os
+import sys
+import argparse
+import json
+import logging
+import random
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from src.config import Config
+from src.document_processor import DocumentProcessor
+from src.vector_store import VectorStore
+from benchmarks.common import build_synthetic_index, use_data_dir, write_results
+from benchmarks.synthetic_corpus import MINISTRY_TOPICS, OFF_TOPIC_QUESTIONS, generate_queries
+
+logging.basicConfig(level=logging.WARNING)
+
+
+def load_questions(path: str):
+    # One JSON object per line: {"question": ..., "ministry": ..., "on_topic": true|false}
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def question_sets(args, ministries):
+    rng = random.Random(7)
+    covered = [ministry for ministry in ministries if ministry in MINISTRY_TOPICS]
+
+    on_topic, wrong_ministry, off_topic = [], [], []
+    if covered:
+        on_topic = [(q["question"], q["ministry"], None) for q in generate_queries(args.queries, covered)]
+
+    # The same questions asked of another ministry: the gate should point back to the right one
+    if len(covered) > 1:
+        for q in generate_queries(args.queries, covered, seed=11):
+            other = rng.choice([ministry for ministry in covered if ministry != q["ministry"]])
+            wrong_ministry.append((q["question"], other, q["ministry"]))
+
+    off_topic = [(question, rng.choice(ministries), None) for question in OFF_TOPIC_QUESTIONS]
+
+    if args.questions:
+        for q in load_questions(args.questions):
+            target = on_topic if q.get("on_topic", True) else off_topic
+            target.append((q["question"], q["ministry"], None))
+
+    return {"on_topic": on_topic, "wrong_ministry": wrong_ministry, "off_topic": off_topic}
+
+
+def score_questions(vector_store: VectorStore, questions, n_results: int):
+    gate = vector_store.relevance_gate
+    rows = []
+    for question, ministry, expected in questions:
+        embedding = vector_store.create_embedding(question)
+        documents = vector_store.search_with_embedding(embedding, ministry, n_results)
+        scores = gate.ministry_scores(embedding)
+        rows.append(
+            {
+                "ministry_score": scores.get(ministry, 0.0),
+                "top_score": max((doc["relevance_score"] for doc in documents), default=0.0),
+                "best_ministry": max(scores, key=scores.get) if scores else None,
+                "expected_ministry": expected,
+            }
+        )
+    return rows
+
+
+def pass_rate(rows, min_ministry_score: float, min_top_score: float) -> float:
+    if not rows:
+        return 0.0
+    passed = sum(
+        row["ministry_score"] >= min_ministry_score and row["top_score"] >= min_top_score for row in rows
+    )
+    return passed / len(rows)
+
+
+def sweep(scored, target_pass_rate: float, steps: int):
+    on_topic = scored["on_topic"]
+    ministry_scores = [row["ministry_score"] for row in on_topic]
+    top_scores = [row["top_score"] for row in on_topic]
+
+    # Nothing above the on-topic median could ever meet a sensible pass-rate target
+    ministry_grid = np.linspace(0.0, float(np.median(ministry_scores)), steps)
+    top_grid = np.linspace(0.0, float(np.median(top_scores)), steps)
+
+    best = None
+    for min_ministry_score in ministry_grid:
+        for min_top_score in top_grid:
+            on_topic_pass = pass_rate(on_topic, min_ministry_score, min_top_score)
+            if on_topic_pass < target_pass_rate:
+                continue
+            rejected = 1.0 - pass_rate(scored["off_topic"], min_ministry_score, min_top_score)
+            # Prefer more rejections, then the more lenient thresholds
+            key = (rejected, -min_ministry_score - min_top_score)
+            if best is None or key > best[0]:
+                best = (key, float(min_ministry_score), float(min_top_score), on_topic_pass, rejected)
+
+    if best is None:
+        return None
+    _, min_ministry_score, min_top_score, on_topic_pass, rejected = best
+    return {
+        "min_ministry_score": round(min_ministry_score, 4),
+        "min_top_score": round(min_top_score, 4),
+        "on_topic_pass_rate": on_topic_pass,
+        "off_topic_reject_rate": rejected,
+        "wrong_ministry_reject_rate": 1.0
+        - pass_rate(scored["wrong_ministry"], min_ministry_score, min_top_score),
+    }
+
+
+def run(args):
+    workdir = None
+    if args.from_index:
+        vector_store = VectorStore()
+    else:
+        workdir = Path(tempfile.mkdtemp(prefix="ragdb_gate_"))
+        use_data_dir(workdir / "data")
+        vector_store = VectorStore()
+        print("Building synthetic index...")
+        build_synthetic_index(
+            vector_store, DocumentProcessor(), list(MINISTRY_TOPICS), args.pdfs_per_ministry
+        )
+
+    ministries = sorted(vector_store.indexed_ministries)
+    if not ministries:
+        print("No ministries are indexed")
+        return
+
+    print(f"Building relevance prototypes for {len(ministries)} ministries...")
+    vector_store.build_relevance_prototypes()
+
+    questions = question_sets(args, ministries)
+    if not questions["on_topic"]:
+        print("No on-topic questions: pass --questions for ministries outside the synthetic topics")
+        return
+
+    scored = {name: score_questions(vector_store, rows, args.n_results) for name, rows in questions.items()}
+    recommended = sweep(scored, args.target_pass_rate, args.steps)
+
+    suggestions = [row for row in scored["wrong_ministry"] if row["expected_ministry"]]
+    suggestion_accuracy = (
+        sum(row["best_ministry"] == row["expected_ministry"] for row in suggestions) / len(suggestions)
+        if suggestions
+        else None
+    )
+
+    results = {
+        "questions": {name: len(rows) for name, rows in scored.items()},
+        "target_pass_rate": args.target_pass_rate,
+        "recommended": recommended,
+        "suggestion_accuracy": suggestion_accuracy,
+        "scores": scored,
+    }
+    path = write_results("relevance_gate", results, args.output)
+
+    print("=" * 70)
+    if recommended:
+        print(f"Thresholds passing >= {args.target_pass_rate:.0%} of on-topic questions:")
+        print(f"  RELEVANCE_MIN_MINISTRY_SCORE={recommended['min_ministry_score']}")
+        print(f"  RELEVANCE_MIN_TOP_SCORE={recommended['min_top_score']}")
+        print(f"  off-topic rejected: {recommended['off_topic_reject_rate']:.1%}")
+        print(f"  wrong-ministry rejected: {recommended['wrong_ministry_reject_rate']:.1%}")
+        if args.from_index and not args.dry_run:
+            vector_store.relevance_gate.write_thresholds(
+                recommended["min_ministry_score"],
+                recommended["min_top_score"],
+                calibrated_at=datetime.now().isoformat(),
+                on_topic_pass_rate=recommended["on_topic_pass_rate"],
+                off_topic_reject_rate=recommended["off_topic_reject_rate"],
+            )
+            print(f"  written to {vector_store.relevance_gate.thresholds_path}")
+    else:
+        print(f"No thresholds pass {args.target_pass_rate:.0%} of on-topic questions")
+    if suggestion_accuracy is not None:
+        print(f"Suggested ministry correct for {suggestion_accuracy:.1%} of wrong-ministry questions")
+    print(f"Results written to {path}")
+    print("=" * 70)
+
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Calibrate the pre-LLM relevance gate")
+    parser.add_argument("--from-index", action="store_true", help="Calibrate against the existing vector DB")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write thresholds to the index")
+    parser.add_argument("--questions", help="JSONL of extra labelled questions")
+    parser.add_argument("--pdfs-per-ministry", type=int, default=10, help="Synthetic corpus only")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--n-results", type=int, default=Config.MAX_DOCS_PER_QUERY)
+    parser.add_argument("--target-pass-rate", type=float, default=0.99)
+    parser.add_argument("--steps", type=int, default=41)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,118 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any
+from src.config import Config
+from benchmarks.synthetic_corpus import generate_corpus
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def use_data_dir(data_dir: Path):
+    data_dir = Path(data_dir)
+    Config.DATA_DIR = data_dir
+    Config.PDF_CACHE_DIR = data_dir / "pdf_cache"
+    Config.MINISTRY_PDF_DIR = data_dir / "ministry_pdfs"
+    Config.VECTOR_DB_DIR = data_dir / "vector_db"
+    Config.RESPONSE_CACHE_DIR = data_dir / "response_cache"
+    Config.INDEX_BUILD_SHARD_DIR = data_dir / "build_shards"
+    Config.PARTITION_TRAFFIC_PATH = data_dir / "partition_traffic.json"
+
+    for directory in (Config.PDF_CACHE_DIR, Config.MINISTRY_PDF_DIR, Config.VECTOR_DB_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def build_synthetic_index(
+    vector_store, processor, ministries: List[str], pdfs_per_ministry: int
+) -> int:
+    corpus = generate_corpus(
+        Config.PDF_CACHE_DIR,
+        pdfs_per_ministry=pdfs_per_ministry,
+        ministries=ministries,
+    )
+
+    total_chunks = 0
+    for ministry in ministries:
+        documents = []
+        for question in corpus:
+            if question["ministry"] != ministry:
+                continue
+            documents.extend(
+                processor.process_pdf(
+                    str(Config.PDF_CACHE_DIR / question["filename"]), dict(question)
+                )
+            )
+
+        if documents:
+            vector_store.add_documents(documents, ministry=ministry)
+            total_chunks += len(documents)
+
+    return total_chunks
+
+
+def git_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=Config.BASE_DIR,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return "unknown"
+
+
+def write_results(name: str, results: Dict[str, Any], output: str = None) -> Path:
+    commit = git_commit()
+    payload = {
+        "benchmark": name,
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "embedding_model": Config.EMBEDDING_MODEL,
+            "chunking_strategy": Config.CHUNKING_STRATEGY,
+            "chunk_token_size": Config.CHUNK_TOKEN_SIZE,
+            "chunk_size": Config.CHUNK_SIZE,
+        },
+        "results": results,
+    }
+
+    if output:
+        path = Path(output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = RESULTS_DIR / f"{name}_{commit}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+
+    return path
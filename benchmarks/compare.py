@@ -0,0 +1,43 @@
+# Compare two benchmark result files, e.g. from two commits
+
+import sys
+import json
+
+
+def flatten(data, prefix=""):
+    values = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            values.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[name] = value
+    return values
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python benchmarks/compare.py <baseline.json> <candidate.json>")
+        sys.exit(1)
+
+    with open(sys.argv[1]) as f:
+        baseline = json.load(f)
+    with open(sys.argv[2]) as f:
+        candidate = json.load(f)
+
+    print(f"Baseline: {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"Candidate: {candidate.get('commit')} ({candidate.get('timestamp')})")
+    print("-" * 90)
+    print(f"{'metric':<50} {'baseline':>12} {'candidate':>12} {'change':>10}")
+
+    old = flatten(baseline.get("results", {}))
+    new = flatten(candidate.get("results", {}))
+
+    for name in sorted(set(old) & set(new)):
+        before, after = old[name], new[name]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{name:<50} {before:>12.4g} {after:>12.4g} {change:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# Open-loop load generator for the retrieval + LLM query path
+
+import os
+import sys
+import argparse
+import asyncio
+import logging
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.document_processor import DocumentProcessor
+from src.vector_store import VectorStore
+from src.llm_client import LLMClient
+from src.profiler import RequestProfile, current_profile
+from benchmarks.common import build_synthetic_index, percentiles, use_data_dir, write_results
+from benchmarks.stubs import StubGenerativeModel
+from benchmarks.synthetic_corpus import MINISTRY_TOPICS, generate_queries
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("load_test")
+
+
+class LoadGenerator:
+    def __init__(self, vector_store, llm_client, queries, concurrency, sessions=1, seed=11):
+        self.vector_store = vector_store
+        self.llm_client = llm_client
+        self.queries = queries
+        self.concurrency = concurrency
+        self.sessions = sessions
+        self.rng = random.Random(seed)
+
+    async def _one_request(self, query, session_id, semaphore, samples):
+        arrived = time.perf_counter()
+        # Collects the stage timings the pipeline records, including the LLM queue waits
+        profile = RequestProfile(query["ministry"])
+        current_profile.set(profile)
+
+        async with semaphore:
+            admitted = time.perf_counter()
+            try:
+                documents = await asyncio.to_thread(
+                    self.vector_store.search_by_text,
+                    query["question"],
+                    query["ministry"],
+                    Config.MAX_DOCS_PER_QUERY,
+                )
+                retrieved = time.perf_counter()
+                await self.llm_client.generate_response(
+                    question=query["question"],
+                    context=documents,
+                    ministry=query["ministry"],
+                    session_id=session_id,
+                )
+                finished = time.perf_counter()
+            except Exception as e:
+                logger.warning(f"Request failed: {e}")
+                samples["errors"] += 1
+                return
+
+        samples["client_wait"].append(admitted - arrived)
+        samples["llm_queue"].append(
+            profile.stages.get("llm_admission_wait", 0.0) + profile.stages.get("llm_queue_wait", 0.0)
+        )
+        samples["retrieval"].append(retrieved - admitted)
+        samples["generation"].append(finished - retrieved)
+        samples["latency"].append(finished - arrived)
+        samples["completed_at"].append(finished)
+
+    async def run_step(self, rate: float, duration: float, drain_timeout: float):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        samples = {
+            "client_wait": [],
+            "llm_queue": [],
+            "retrieval": [],
+            "generation": [],
+            "latency": [],
+            "completed_at": [],
+            "errors": 0,
+        }
+        tasks = []
+        shed_before = sum(self.llm_client.admission.shed.values())
+        hedged_before = self.llm_client.hedges["sent"]
+
+        start = time.perf_counter()
+        next_arrival = start
+
+        # Poisson arrivals, independent of how fast requests complete
+        while next_arrival - start < duration:
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            query = self.rng.choice(self.queries)
+            session_id = f"session_{self.rng.randrange(self.sessions)}"
+            tasks.append(
+                asyncio.create_task(self._one_request(query, session_id, semaphore, samples))
+            )
+            next_arrival += self.rng.expovariate(rate)
+
+        done, pending = await asyncio.wait(tasks, timeout=drain_timeout)
+        for task in pending:
+            task.cancel()
+
+        completed = len(samples["latency"])
+        window = (max(samples["completed_at"]) - start) if completed else duration
+
+        return {
+            "offered_rate": rate,
+            "arrival_rate": len(tasks) / duration,
+            "requests": len(tasks),
+            "completed": completed,
+            "abandoned": len(pending),
+            "errors": samples["errors"],
+            "shed": sum(self.llm_client.admission.shed.values()) - shed_before,
+            "hedged": self.llm_client.hedges["sent"] - hedged_before,
+            "circuit": self.llm_client.breaker.state,
+            "throughput": completed / window if window else 0.0,
+            "latency": percentiles(samples["latency"]),
+            "llm_queue_delay": percentiles(samples["llm_queue"]),
+            "client_wait": percentiles(samples["client_wait"]),
+            "retrieval": percentiles(samples["retrieval"]),
+            "generation": percentiles(samples["generation"]),
+        }
+
+
+def find_saturation(steps, slo: float):
+    for step in steps:
+        if step["throughput"] < 0.85 * step["arrival_rate"]:
+            return step["offered_rate"]
+        if step["latency"].get("p95", 0.0) > slo:
+            return step["offered_rate"]
+    return None
+
+
+async def run(args):
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="ragdb_load_"))
+    use_data_dir(workdir / "data")
+    Config.LLM_MAX_WORKERS = args.llm_workers
+    ministries = list(MINISTRY_TOPICS)
+
+    vector_store = VectorStore()
+    if not vector_store.indexed_ministries:
+        print("Building synthetic index...")
+        build_synthetic_index(
+            vector_store, DocumentProcessor(), ministries, args.pdfs_per_ministry
+        )
+
+    llm_client = LLMClient(
+        model=StubGenerativeModel(
+            latency=args.llm_latency,
+            jitter=args.llm_jitter,
+            tail_rate=args.llm_tail_rate,
+            tail_latency=args.llm_tail_latency,
+            error_rate=args.llm_error_rate,
+        )
+    )
+    queries = generate_queries(500, ministries=ministries)
+    generator = LoadGenerator(vector_store, llm_client, queries, args.concurrency, args.sessions)
+
+    rates = [float(rate) for rate in args.rates.split(",")]
+    steps = []
+
+    print(
+        f"{'rate':>8} {'tput':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'llm queue p95':>14} "
+        f"{'errors':>7} {'shed':>6} {'hedged':>7} {'circuit':>9}"
+    )
+    for rate in rates:
+        step = await generator.run_step(rate, args.duration, args.drain_timeout)
+        steps.append(step)
+        print(
+            f"{rate:>8.2f} {step['throughput']:>8.2f} "
+            f"{step['latency'].get('p50', 0.0):>8.2f} "
+            f"{step['latency'].get('p95', 0.0):>8.2f} "
+            f"{step['latency'].get('p99', 0.0):>8.2f} "
+            f"{step['llm_queue_delay'].get('p95', 0.0):>14.2f} "
+            f"{step['errors'] + step['abandoned']:>7} {step['shed']:>6} "
+            f"{step['hedged']:>7} {step['circuit']:>9}"
+        )
+
+        if args.stop_at_saturation and find_saturation([step], args.slo):
+            break
+
+    saturation = find_saturation(steps, args.slo)
+    results = {
+        "parameters": {
+            "concurrency": args.concurrency,
+            "llm_workers": args.llm_workers,
+            "sessions": args.sessions,
+            "llm_latency": args.llm_latency,
+            "llm_tail_rate": args.llm_tail_rate,
+            "llm_tail_latency": args.llm_tail_latency,
+            "llm_error_rate": args.llm_error_rate,
+            "duration": args.duration,
+            "slo_p95": args.slo,
+        },
+        "steps": {f"{step['offered_rate']:g}": step for step in steps},
+        "saturation_rate": saturation,
+    }
+    path = write_results("load_test", results, args.output)
+
+    if saturation:
+        print(f"Saturation at ~{saturation:g} req/s")
+    else:
+        print("No saturation within the tested rates")
+    print(f"Results written to {path}")
+
+    if not args.keep and not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test the query pipeline")
+    parser.add_argument("--rates", default="0.5,1,2,4,8", help="Arrival rates in req/s")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per rate")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--sessions", type=int, default=8, help="Distinct session ids to spread requests over")
+    parser.add_argument("--llm-workers", type=int, default=Config.LLM_MAX_WORKERS)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-tail-rate", type=float, default=0.0, help="Fraction of LLM calls that are slow")
+    parser.add_argument("--llm-tail-latency", type=float, default=10.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of LLM calls that fail")
+    parser.add_argument("--slo", type=float, default=10.0, help="p95 latency SLO in seconds")
+    parser.add_argument("--drain-timeout", type=float, default=120.0)
+    parser.add_argument("--pdfs-per-ministry", type=int, default=20)
+    parser.add_argument("--stop-at-saturation", action="store_true")
+    parser.add_argument("--workdir", help="Use an existing data directory")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp directory")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,230 @@
+# End-to-end ingest, retrieval and question latency benchmark against local stand-ins
+
+import os
+import sys
+import argparse
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.sansad_client import SansadClient
+from src.document_processor import DocumentProcessor
+from src.vector_store import VectorStore
+from src.llm_client import LLMClient
+from benchmarks.common import percentiles, use_data_dir, write_results
+from benchmarks.stubs import StubGenerativeModel, StubSansadServer
+from benchmarks.synthetic_corpus import MINISTRY_TOPICS, generate_corpus, generate_queries
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("benchmarks")
+
+
+async def bench_crawl(client: SansadClient, ministries):
+    downloaded = []
+    pages = 0
+    start = time.perf_counter()
+
+    for ministry in ministries:
+        page = 1
+        while True:
+            questions = await client.fetch_questions(ministry=ministry, page=page)
+            if not questions:
+                break
+            pages += 1
+
+            for question in questions:
+                pdf_path = await client.download_pdf(question["pdf_url"])
+                if pdf_path:
+                    downloaded.append((pdf_path, question))
+            page += 1
+
+    elapsed = time.perf_counter() - start
+    return downloaded, {
+        "pages": pages,
+        "pdfs": len(downloaded),
+        "seconds": elapsed,
+        "pdfs_per_s": len(downloaded) / elapsed if elapsed else 0.0,
+    }
+
+
+def bench_ingest(processor: DocumentProcessor, vector_store: VectorStore, downloaded):
+    by_ministry = {}
+    parse_start = time.perf_counter()
+
+    for pdf_path, question in downloaded:
+        metadata = {
+            "ministry": question["ministry"],
+            "date": question["date"],
+            "session": str(question["session"]),
+            "question_no": str(question["question_no"]),
+            "subject": question["subject"],
+            "pdf_url": question["pdf_url"],
+        }
+        documents = processor.process_pdf(pdf_path, metadata)
+        by_ministry.setdefault(question["ministry"], []).extend(documents)
+
+    parse_seconds = time.perf_counter() - parse_start
+    chunks = sum(len(documents) for documents in by_ministry.values())
+
+    index_start = time.perf_counter()
+    for ministry, documents in by_ministry.items():
+        vector_store.add_documents(documents, ministry=ministry)
+    index_seconds = time.perf_counter() - index_start
+
+    return {
+        "pdfs": len(downloaded),
+        "chunks": chunks,
+        "parse_seconds": parse_seconds,
+        "index_seconds": index_seconds,
+        "pdfs_per_s": len(downloaded) / parse_seconds if parse_seconds else 0.0,
+        "chunks_per_s": chunks / parse_seconds if parse_seconds else 0.0,
+        "embeddings_per_s": chunks / index_seconds if index_seconds else 0.0,
+    }
+
+
+def bench_retrieval(vector_store: VectorStore, queries, warmup: int = 5):
+    for query in queries[:warmup]:
+        vector_store.search_by_text(query["question"], query["ministry"])
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        vector_store.search_by_text(
+            query["question"], query["ministry"], n_results=Config.MAX_DOCS_PER_QUERY
+        )
+        latencies.append(time.perf_counter() - start)
+
+    return percentiles(latencies)
+
+
+async def bench_end_to_end(vector_store: VectorStore, llm_client: LLMClient, queries):
+    total, retrieval, generation = [], [], []
+
+    for query in queries:
+        start = time.perf_counter()
+        documents = vector_store.search_by_text(
+            query["question"], query["ministry"], n_results=Config.MAX_DOCS_PER_QUERY
+        )
+        retrieved = time.perf_counter()
+        await llm_client.generate_response(
+            question=query["question"], context=documents, ministry=query["ministry"]
+        )
+        finished = time.perf_counter()
+
+        total.append(finished - start)
+        retrieval.append(retrieved - start)
+        generation.append(finished - retrieved)
+
+    return {
+        "total": percentiles(total),
+        "retrieval": percentiles(retrieval),
+        "generation": percentiles(generation),
+    }
+
+
+async def run(args):
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="ragdb_bench_"))
+    use_data_dir(workdir / "data")
+    ministries = list(MINISTRY_TOPICS)[: args.ministries]
+
+    print(f"Generating synthetic corpus in {workdir}...")
+    corpus = generate_corpus(
+        workdir / "corpus",
+        pdfs_per_ministry=args.pdfs_per_ministry,
+        ministries=ministries,
+    )
+
+    server = await StubSansadServer(
+        workdir / "corpus", corpus, latency=args.api_latency
+    ).start()
+
+    results = {
+        "parameters": {
+            "ministries": len(ministries),
+            "pdfs_per_ministry": args.pdfs_per_ministry,
+            "queries": args.queries,
+            "api_latency": args.api_latency,
+            "llm_latency": args.llm_latency,
+        }
+    }
+
+    try:
+        print("Benchmarking crawl...")
+        client = SansadClient()
+        client.base_url = server.api_url
+        downloaded, results["crawl"] = await bench_crawl(client, ministries)
+    finally:
+        await server.stop()
+
+    print("Benchmarking ingest...")
+    processor = DocumentProcessor()
+    vector_store = VectorStore()
+    results["ingest"] = bench_ingest(processor, vector_store, downloaded)
+
+    queries = generate_queries(args.queries, ministries=ministries)
+
+    print("Benchmarking retrieval...")
+    results["retrieval"] = bench_retrieval(vector_store, queries)
+
+    print("Benchmarking end-to-end questions...")
+    llm_client = LLMClient(
+        model=StubGenerativeModel(latency=args.llm_latency, jitter=args.llm_jitter)
+    )
+    results["end_to_end"] = await bench_end_to_end(
+        vector_store, llm_client, queries[: args.e2e_questions]
+    )
+
+    path = write_results("end_to_end", results, args.output)
+
+    print("=" * 70)
+    print(f"Crawl: {results['crawl']['pdfs_per_s']:.1f} PDFs/s")
+    print(
+        f"Ingest: {results['ingest']['pdfs_per_s']:.1f} PDFs/s, "
+        f"{results['ingest']['chunks_per_s']:.1f} chunks/s, "
+        f"{results['ingest']['embeddings_per_s']:.1f} embeddings/s"
+    )
+    print(
+        f"Retrieval: p50 {results['retrieval']['p50'] * 1000:.1f} ms, "
+        f"p95 {results['retrieval']['p95'] * 1000:.1f} ms, "
+        f"p99 {results['retrieval']['p99'] * 1000:.1f} ms"
+    )
+    print(
+        f"End-to-end: p50 {results['end_to_end']['total']['p50'] * 1000:.1f} ms, "
+        f"p95 {results['end_to_end']['total']['p95'] * 1000:.1f} ms"
+    )
+    print(f"Results written to {path}")
+    print("=" * 70)
+
+    if not args.keep and not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ingest, retrieval and question latency"
+    )
+    parser.add_argument("--ministries", type=int, default=len(MINISTRY_TOPICS))
+    parser.add_argument("--pdfs-per-ministry", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--e2e-questions", type=int, default=20)
+    parser.add_argument("--api-latency", type=float, default=0.0)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--workdir", help="Reuse this directory instead of a temp dir")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--keep", action="store_true", help="Keep the temp directory")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,174 @@
+import asyncio
+import random
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+from aiohttp import web
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubUpstreamError(Exception):
+    def __init__(self, code: int = 503):
+        super().__init__(f"stub upstream error {code}")
+        self.code = code
+
+
+class StubGenerativeModel:
+    """Stands in for genai.GenerativeModel with configurable latency, tail latency and errors.
+
+    ``tail_rate`` of calls take ``tail_latency`` instead, and ``error_rate`` of calls
+    fail with ``error_code`` after the normal latency. Setting ``outage`` fails every
+    call at once. ``latencies`` scripts the first calls exactly, in order.
+    """
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        jitter: float = 0.2,
+        seed: int = None,
+        tail_rate: float = 0.0,
+        tail_latency: float = 10.0,
+        error_rate: float = 0.0,
+        error_code: int = 503,
+        latencies: List[float] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_latency = tail_latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.latencies = list(latencies or [])
+        self.outage = False
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def _sleep_time(self) -> float:
+        with self._lock:
+            self.calls += 1
+            if self.latencies:
+                return self.latencies.pop(0)
+            if self._rng.random() < self.tail_rate:
+                return self.tail_latency
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def _maybe_fail(self):
+        with self._lock:
+            failed = self.outage or self._rng.random() < self.error_rate
+            self.errors += failed
+        if failed:
+            raise StubUpstreamError(self.error_code)
+
+    def generate_content(
+        self, prompt, generation_config=None, safety_settings=None, stream=False
+    ):
+        text = (
+            "According to the parliamentary records provided, the Government has "
+            f"taken several steps on this matter. (stub answer for a {len(prompt)} character prompt)"
+        )
+        if stream:
+            return self._stream(text)
+
+        # An outage refuses the connection straight away
+        if self.outage:
+            self._maybe_fail()
+        time.sleep(self._sleep_time())
+        self._maybe_fail()
+        return StubResponse(text)
+
+    def _stream(self, text: str):
+        self._maybe_fail()
+        words = text.split(" ")
+        delay = self._sleep_time() / len(words)
+        for i, word in enumerate(words):
+            time.sleep(delay)
+            yield StubResponse(word if i == 0 else " " + word)
+
+
+class StubSansadServer:
+    """Local stand-in for the sansad.in question API and PDF host."""
+
+    def __init__(self, pdf_dir: Path, questions: List[Dict[str, Any]], latency: float = 0.0):
+        self.pdf_dir = Path(pdf_dir)
+        self.questions = questions
+        self.latency = latency
+        self.requests = 0
+        self.runner = None
+        self.base_url = None
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/api_ls/question/qetFilteredQuestionsAns"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        app = web.Application()
+        app.router.add_get("/api_ls/question/qetFilteredQuestionsAns", self._questions)
+        app.router.add_get("/pdf/{filename}", self._pdf)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return self
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+
+    async def _questions(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        ministry = request.query.get("ministry")
+        lok_sabha = request.query.get("loksabhaNo")
+        session = request.query.get("sessionNumber")
+        page = int(request.query.get("pageNo", 1))
+        page_size = int(request.query.get("pageSize", 100))
+
+        matching = [
+            q
+            for q in self.questions
+            if (not ministry or q["ministry"] == ministry)
+            and (not lok_sabha or str(q["lok_sabha"]) == lok_sabha)
+            and (not session or str(q["session"]) == session)
+        ]
+        # The live API lists newest questions first
+        matching.sort(key=lambda q: int(q["question_no"]), reverse=True)
+        page_items = matching[(page - 1) * page_size : page * page_size]
+
+        return web.json_response(
+            [
+                {
+                    "listOfQuestions": [
+                        {
+                            "quesNo": q["question_no"],
+                            "subjects": q["subject"],
+                            "ministry": q["ministry"],
+                            "questionText": q["question_text"],
+                            "questionsFilePath": f"{self.base_url}/pdf/{q['filename']}",
+                            "date": q["date"],
+                            "sessionNo": q["session"],
+                        }
+                        for q in page_items
+                    ]
+                }
+            ]
+        )
+
+    async def _pdf(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        path = self.pdf_dir / request.match_info["filename"]
+        if not path.exists():
+            return web.Response(status=404)
+        return web.FileResponse(path)
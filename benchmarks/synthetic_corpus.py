@@ -0,0 +1,263 @@
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Dict, Any
+
+MINISTRY_TOPICS = {
+    "Ministry of Agriculture and Farmers Welfare": [
+        "crop insurance", "minimum support price", "soil health cards", "kisan credit",
+        "irrigation coverage", "fertilizer subsidy", "organic farming", "farm mechanisation",
+    ],
+    "Ministry of Railways": [
+        "Vande Bharat trains", "station redevelopment", "track electrification",
+        "freight corridors", "passenger safety", "Kavach signalling", "ticket reservation",
+        "gauge conversion",
+    ],
+    "Ministry of Health and Family Welfare": [
+        "Ayushman Bharat", "primary health centres", "immunisation coverage",
+        "medical colleges", "tuberculosis elimination", "maternal mortality",
+        "generic medicines", "telemedicine services",
+    ],
+    "Ministry of Education": [
+        "National Education Policy", "school dropout rates", "teacher vacancies",
+        "mid-day meals", "higher education enrolment", "scholarship schemes",
+        "digital classrooms", "Kendriya Vidyalayas",
+    ],
+    "Ministry of Finance": [
+        "goods and services tax", "fiscal deficit", "direct tax collections",
+        "public sector banks", "disinvestment proceeds", "small savings schemes",
+        "customs duty", "credit guarantee",
+    ],
+    "Ministry of Power": [
+        "rural electrification", "smart meters", "transmission losses",
+        "thermal capacity", "distribution companies", "green energy corridors",
+        "peak demand", "power purchase agreements",
+    ],
+}
+
+STATES = [
+    "Uttar Pradesh", "Maharashtra", "Bihar", "West Bengal", "Tamil Nadu", "Rajasthan",
+    "Karnataka", "Gujarat", "Odisha", "Kerala", "Assam", "Punjab",
+]
+
+# Questions no ministry answers, for calibrating the relevance gate
+OFF_TOPIC_QUESTIONS = [
+    "What is the weather going to be like in Delhi tomorrow?",
+    "Who won the cricket world cup in 2011?",
+    "Give me a recipe for butter chicken.",
+    "What is the capital of France?",
+    "Recommend a good movie to watch tonight.",
+    "How do I reverse a linked list in Python?",
+    "Tell me a joke about cats.",
+    "How tall is Mount Everest?",
+    "Write a short poem about the monsoon.",
+    "What is the best smartphone under twenty thousand rupees?",
+    "Who is the lead actor in the latest Marvel film?",
+    "How many calories are in a banana?",
+    "Translate good morning into Spanish.",
+    "What time does the sun set in Mumbai?",
+    "Which football club has won the most Champions League titles?",
+    "How do I fix a flat bicycle tyre?",
+    "What are the lyrics of a popular Bollywood song?",
+    "Suggest a name for my new puppy.",
+    "How does a black hole form?",
+    "What is the square root of 144?",
+    "Plan a three day holiday itinerary for Goa.",
+    "What should I gift my friend for her birthday?",
+    "How do I improve my chess openings?",
+    "How do I change the wallpaper on my laptop?",
+    "What is the plot of Harry Potter?",
+    "How do I make my houseplants grow faster?",
+    "Which programming language should I learn first?",
+    "Who painted the Mona Lisa?",
+    "What is the difference between a crocodile and an alligator?",
+    "What is the fastest land animal?",
+]
+
+SENTENCE_TEMPLATES = [
+    "The Government has sanctioned Rs. {amount} crore for {topic} in {state} during {year}.",
+    "As on {day}, a total of {count} beneficiaries have been covered under {topic}.",
+    "The progress of {topic} is reviewed periodically with the State Government of {state}.",
+    "Under {topic}, {count} projects were completed in {state} in the last three years.",
+    "No proposal regarding {topic} in {state} is under consideration at present.",
+    "The budget allocation for {topic} increased by {percent} percent over the previous year.",
+    "Guidelines for {topic} were revised in {year} after consultation with stakeholders.",
+    "The details of funds released for {topic} are given in the Annexure.",
+]
+
+
+def question_text(rng: random.Random, ministry: str, topic: str) -> str:
+    state = rng.choice(STATES)
+    return f"Will the Minister of {ministry.replace('Ministry of ', '')} be pleased to state the status of {topic} in {state}?"
+
+
+def answer_text(rng: random.Random, topic: str, sentences: int) -> str:
+    parts = []
+    for _ in range(sentences):
+        parts.append(
+            rng.choice(SENTENCE_TEMPLATES).format(
+                amount=rng.randint(10, 9000),
+                topic=topic,
+                state=rng.choice(STATES),
+                year=rng.randint(2015, 2024),
+                day=(date(2024, 1, 1) + timedelta(days=rng.randint(0, 300))).isoformat(),
+                count=rng.randint(100, 500000),
+                percent=rng.randint(2, 40),
+            )
+        )
+    return " ".join(parts)
+
+
+def _escape_pdf_text(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(text: str, width: int = 90) -> List[str]:
+    lines = []
+    current = ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > width:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+
+def write_pdf(path: Path, paragraphs: List[str], lines_per_page: int = 55):
+    lines = []
+    for paragraph in paragraphs:
+        lines.extend(_wrap(paragraph))
+        lines.append("")
+
+    pages = [
+        lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)
+    ] or [[""]]
+
+    objects = []
+    page_ids = []
+    font_id = 3 + 2 * len(pages)
+
+    for index, page_lines in enumerate(pages):
+        page_id = 3 + 2 * index
+        content_id = page_id + 1
+        page_ids.append(page_id)
+
+        stream = "BT /F1 10 Tf 12 TL 50 790 Td\n" + "".join(
+            f"({_escape_pdf_text(line)}) Tj T*\n" for line in page_lines
+        ) + "ET"
+        objects.append(
+            (
+                page_id,
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>",
+            )
+        )
+        objects.append(
+            (content_id, f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        )
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects = [
+        (1, "<< /Type /Catalog /Pages 2 0 R >>"),
+        (2, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>"),
+    ] + objects
+    objects.append((font_id, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"))
+
+    body = b"%PDF-1.4\n"
+    offsets = {}
+    for object_id, content in objects:
+        offsets[object_id] = len(body)
+        body += f"{object_id} 0 obj\n{content}\nendobj\n".encode("latin-1")
+
+    xref_offset = len(body)
+    size = max(offsets) + 1
+    xref = f"xref\n0 {size}\n0000000000 65535 f \n"
+    for object_id in range(1, size):
+        xref += f"{offsets[object_id]:010d} 00000 n \n"
+    body += xref.encode("latin-1")
+    body += (
+        f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    ).encode("latin-1")
+
+    path.write_bytes(body)
+
+
+def generate_corpus(
+    output_dir: Path,
+    pdfs_per_ministry: int = 20,
+    ministries: List[str] = None,
+    sentences_per_answer: int = 40,
+    lok_sabha: int = 18,
+    session: int = 4,
+    seed: int = 42,
+) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    ministries = ministries or list(MINISTRY_TOPICS)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    questions = []
+    question_no = 1
+
+    for ministry in ministries:
+        topics = MINISTRY_TOPICS.get(ministry) or ["general administration"]
+
+        for _ in range(pdfs_per_ministry):
+            topic = rng.choice(topics)
+            asked_on = date(2024, 7, 1) + timedelta(days=rng.randint(0, 120))
+            filename = f"AU{question_no}.pdf"
+
+            question = question_text(rng, ministry, topic)
+            answer = answer_text(rng, topic, sentences_per_answer)
+
+            write_pdf(
+                output_dir / filename,
+                [
+                    f"GOVERNMENT OF INDIA {ministry.upper()}",
+                    f"LOK SABHA UNSTARRED QUESTION NO. {question_no}",
+                    f"TO BE ANSWERED ON {asked_on.strftime('%d.%m.%Y')}",
+                    topic.upper(),
+                    question,
+                    "ANSWER",
+                    answer,
+                ],
+            )
+
+            metadata = {
+                "question_no": str(question_no),
+                "subject": topic.title(),
+                "ministry": ministry,
+                "question_text": question,
+                "filename": filename,
+                "date": asked_on.strftime("%d.%m.%Y"),
+                "lok_sabha": lok_sabha,
+                "session": str(session),
+            }
+            with open((output_dir / filename).with_suffix(".json"), "w") as f:
+                json.dump(metadata, f, indent=2)
+
+            questions.append(metadata)
+            question_no += 1
+
+    return questions
+
+
+def generate_queries(
+    count: int, ministries: List[str] = None, seed: int = 7
+) -> List[Dict[str, str]]:
+    rng = random.Random(seed)
+    ministries = ministries or list(MINISTRY_TOPICS)
+    queries = []
+
+    for _ in range(count):
+        ministry = rng.choice(ministries)
+        topic = rng.choice(MINISTRY_TOPICS.get(ministry) or ["general administration"])
+        queries.append(
+            {"ministry": ministry, "question": question_text(rng, ministry, topic)}
+        )
+
+    return queries
@@ -0,0 +1,312 @@
+# Recall-versus-latency sweep for HNSW parameters, over-fetch, chunk size and n_results
+
+import os
+import sys
+import argparse
+import itertools
+import logging
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import chromadb
+from chromadb.config import Settings
+from chromadb.utils import embedding_functions
+from src.chunk_store import ChunkTextStore
+from src.config import Config
+from src.document_processor import DocumentProcessor
+from src.token_splitter import TokenTextSplitter
+from benchmarks.common import percentiles, use_data_dir, write_results
+from benchmarks.synthetic_corpus import MINISTRY_TOPICS, generate_corpus, generate_queries
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("tune_retrieval")
+
+ADD_BATCH_SIZE = 1000
+
+
+def _int_list(value: str):
+    return [int(v) for v in value.split(",") if v]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def synthetic_datasets(args, embed, workdir: Path):
+    ministries = list(MINISTRY_TOPICS)
+    corpus = generate_corpus(
+        workdir / "corpus", pdfs_per_ministry=args.pdfs_per_ministry, ministries=ministries
+    )
+    queries = generate_queries(args.queries, ministries=ministries, seed=99)
+    query_vectors = normalize(np.array(embed([q["question"] for q in queries]), dtype=np.float32))
+    query_ministries = [q["ministry"] for q in queries]
+
+    for chunk_tokens in _int_list(args.chunk_tokens):
+        processor = DocumentProcessor()
+        processor.text_splitter = TokenTextSplitter(chunk_tokens=chunk_tokens)
+
+        ids, texts, metadatas = [], [], []
+        for question in corpus:
+            pdf_path = workdir / "corpus" / question["filename"]
+            for document in processor.process_pdf(str(pdf_path), dict(question)):
+                ids.append(document.id)
+                texts.append(document.text)
+                metadatas.append(
+                    {
+                        "ministry": question["ministry"],
+                        "filename": question["filename"],
+                    }
+                )
+
+        vectors = normalize(np.array(embed(texts), dtype=np.float32))
+        yield chunk_tokens, {
+            "ids": ids,
+            "texts": texts,
+            "metadatas": metadatas,
+            "vectors": vectors,
+            "query_vectors": query_vectors,
+            "query_ministries": query_ministries,
+        }
+
+
+def index_dataset(args):
+    settings = Settings(anonymized_telemetry=False, is_persistent=True)
+    client = chromadb.PersistentClient(path=str(Config.VECTOR_DB_DIR), settings=settings)
+    collection = client.get_collection("ministry_documents")
+    chunk_texts = ChunkTextStore()
+
+    ids, texts, metadatas, vectors = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(
+            include=["embeddings", "documents", "metadatas"], limit=5000, offset=offset
+        )
+        if not page["ids"]:
+            break
+        stored = chunk_texts.get_many(page["ids"])
+        ids.extend(page["ids"])
+        texts.extend(stored.get(doc_id) or text for doc_id, text in zip(page["ids"], page["documents"]))
+        metadatas.extend(page["metadatas"])
+        vectors.extend(page["embeddings"])
+        offset += len(page["ids"])
+
+    # Hold out a random sample of stored chunks and use them as queries
+    rng = random.Random(13)
+    held_out = set(rng.sample(range(len(ids)), min(args.queries, len(ids) // 10)))
+    keep = [i for i in range(len(ids)) if i not in held_out]
+    vectors = normalize(np.array(vectors, dtype=np.float32))
+
+    return {
+        "ids": [ids[i] for i in keep],
+        "texts": [texts[i] for i in keep],
+        "metadatas": [metadatas[i] for i in keep],
+        "vectors": vectors[keep],
+        "query_vectors": vectors[sorted(held_out)],
+        "query_ministries": [metadatas[i].get("ministry") for i in sorted(held_out)],
+    }
+
+
+def ground_truth(dataset, k: int):
+    ministries = np.array([m.get("ministry") for m in dataset["metadatas"]])
+    truth = []
+
+    for query, ministry in zip(dataset["query_vectors"], dataset["query_ministries"]):
+        candidates = np.where(ministries == ministry)[0]
+        scores = dataset["vectors"][candidates] @ query
+        order = candidates[np.argsort(-scores)]
+
+        seen, top = set(), []
+        for index in order:
+            text = dataset["texts"][index]
+            if text in seen:
+                continue
+            seen.add(text)
+            top.append(index)
+            if len(top) >= k:
+                break
+        truth.append(top)
+
+    return truth
+
+
+def estimated_index_bytes(count: int, dim: int, m: int) -> int:
+    # Computed from hnswlib's layout (level-0 links and vector per element, plus upper
+    # levels), not measured; chroma persists the index lazily, so its files lag the build
+    level0 = count * ((2 * m) * 4 + 4 + dim * 4 + 8)
+    upper = count * (m * 4 + 4) / max(m - 1, 1)
+    return int(level0 + upper)
+
+
+def build_collection(client, dataset, m: int, construction_ef: int, search_ef: int, name: str):
+    collection = client.create_collection(
+        name=name,
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:M": m,
+            "hnsw:construction_ef": construction_ef,
+            "hnsw:search_ef": search_ef,
+        },
+    )
+
+    start = time.perf_counter()
+    for i in range(0, len(dataset["ids"]), ADD_BATCH_SIZE):
+        collection.add(
+            ids=dataset["ids"][i : i + ADD_BATCH_SIZE],
+            embeddings=dataset["vectors"][i : i + ADD_BATCH_SIZE].tolist(),
+            documents=dataset["texts"][i : i + ADD_BATCH_SIZE],
+            metadatas=dataset["metadatas"][i : i + ADD_BATCH_SIZE],
+        )
+    return collection, time.perf_counter() - start
+
+
+def evaluate(collection, dataset, truth, id_to_index, n_results: int, overfetch: int):
+    latencies, recalls, source_recalls = [], [], []
+
+    for query, ministry, expected in zip(
+        dataset["query_vectors"], dataset["query_ministries"], truth
+    ):
+        start = time.perf_counter()
+        results = collection.query(
+            query_embeddings=[query.tolist()],
+            n_results=n_results * overfetch,
+            where={"ministry": {"$eq": ministry}},
+        )
+        seen, returned = set(), []
+        for doc_id, text in zip(results["ids"][0], results["documents"][0]):
+            if text in seen:
+                continue
+            seen.add(text)
+            returned.append(id_to_index[doc_id])
+            if len(returned) >= n_results:
+                break
+        latencies.append(time.perf_counter() - start)
+
+        expected = expected[:n_results]
+        if not expected:
+            continue
+        recalls.append(len(set(returned) & set(expected)) / len(expected))
+
+        expected_sources = {dataset["metadatas"][i].get("filename") for i in expected}
+        returned_sources = {dataset["metadatas"][i].get("filename") for i in returned}
+        source_recalls.append(len(expected_sources & returned_sources) / len(expected_sources))
+
+    return {
+        "recall": float(np.mean(recalls)) if recalls else 0.0,
+        "source_recall": float(np.mean(source_recalls)) if source_recalls else 0.0,
+        "latency": percentiles(latencies),
+    }
+
+
+def run(args):
+    workdir = Path(tempfile.mkdtemp(prefix="ragdb_tune_"))
+    embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=Config.EMBEDDING_MODEL
+    )
+
+    if args.from_index:
+        datasets = [(None, index_dataset(args))]
+    else:
+        use_data_dir(workdir / "data")
+        datasets = synthetic_datasets(args, embedding_function, workdir)
+
+    n_results_list = _int_list(args.n_results)
+    max_k = max(n_results_list)
+    client = chromadb.PersistentClient(
+        path=str(workdir / "sweep_db"),
+        settings=Settings(anonymized_telemetry=False, allow_reset=True, is_persistent=True),
+    )
+
+    rows = []
+    for chunk_tokens, dataset in datasets:
+        print(f"Dataset: {len(dataset['ids'])} chunks, chunk size {chunk_tokens or 'as indexed'}")
+        truth = ground_truth(dataset, max_k)
+        id_to_index = {doc_id: i for i, doc_id in enumerate(dataset["ids"])}
+        dim = dataset["vectors"].shape[1]
+
+        for m, construction_ef, search_ef in itertools.product(
+            _int_list(args.m), _int_list(args.construction_ef), _int_list(args.search_ef)
+        ):
+            name = f"sweep_{len(rows)}"
+            collection, build_seconds = build_collection(
+                client, dataset, m, construction_ef, search_ef, name
+            )
+
+            for n_results, overfetch in itertools.product(
+                n_results_list, _int_list(args.overfetch)
+            ):
+                metrics = evaluate(collection, dataset, truth, id_to_index, n_results, overfetch)
+                row = {
+                    "chunk_tokens": chunk_tokens,
+                    "m": m,
+                    "construction_ef": construction_ef,
+                    "search_ef": search_ef,
+                    "n_results": n_results,
+                    "overfetch": overfetch,
+                    "chunks": len(dataset["ids"]),
+                    "build_seconds": build_seconds,
+                    "estimated_index_bytes": estimated_index_bytes(len(dataset["ids"]), dim, m),
+                    **metrics,
+                }
+                rows.append(row)
+                print(
+                    f"chunk={chunk_tokens} M={m:<3} cef={construction_ef:<4} sef={search_ef:<4} "
+                    f"k={n_results:<3} overfetch={overfetch} recall={row['recall']:.3f} "
+                    f"p50={row['latency']['p50'] * 1000:.1f}ms p99={row['latency']['p99'] * 1000:.1f}ms "
+                    f"index~{row['estimated_index_bytes'] / 1e6:.1f}MB (est.)"
+                )
+
+            client.delete_collection(name)
+
+    qualifying = [row for row in rows if row["recall"] >= args.target_recall]
+    best = min(qualifying, key=lambda row: row["latency"]["p99"]) if qualifying else None
+
+    results = {"rows": rows, "target_recall": args.target_recall, "recommended": best}
+    path = write_results("retrieval_tuning", results, args.output)
+
+    print("=" * 70)
+    if best:
+        print(f"Fastest setting with recall >= {args.target_recall}:")
+        print(f"  HNSW_M={best['m']}")
+        print(f"  HNSW_CONSTRUCTION_EF={best['construction_ef']}")
+        print(f"  HNSW_SEARCH_EF={best['search_ef']}")
+        print(f"  SEARCH_OVERFETCH_FACTOR={best['overfetch']}")
+        if best["chunk_tokens"]:
+            print(f"  CHUNK_TOKEN_SIZE={best['chunk_tokens']} (n_results={best['n_results']})")
+    else:
+        print(f"No setting reached recall {args.target_recall}")
+    print(f"Results written to {path}")
+    print("=" * 70)
+
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sweep HNSW and retrieval settings")
+    parser.add_argument("--from-index", action="store_true", help="Use the existing vector DB")
+    parser.add_argument("--pdfs-per-ministry", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--m", default="8,16,32")
+    parser.add_argument("--construction-ef", default="100,200")
+    parser.add_argument("--search-ef", default="10,50,100")
+    parser.add_argument("--overfetch", default="1,2,4")
+    parser.add_argument("--n-results", default="5,10")
+    parser.add_argument("--chunk-tokens", default="128,240", help="Synthetic corpus only")
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,18 @@
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.vector_store import VectorStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+
+# Chunks indexed before typed date/session fields existed are invisible to range filters
+vector_store = VectorStore()
+updated = vector_store.backfill_typed_metadata()
+
+print(f"Added typed date/session fields to {updated} documents")
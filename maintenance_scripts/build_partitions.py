@@ -0,0 +1,20 @@
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.config import Config
+from src.vector_store import VectorStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+
+# Indexes built before partition residency was enabled have no partition files yet
+Config.PARTITION_RESIDENCY_ENABLED = True
+vector_store = VectorStore()
+vector_store.rebuild_partitions()
+
+print(f"Wrote partitions for {len(vector_store.indexed_ministries)} ministries")
@@ -0,0 +1,27 @@
+import os
+import sys
+import logging
+import sqlite3
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.config import Config
+from src.vector_store import VectorStore
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+
+# Indexes built before the chunk text store keep every text (and its full-text index) in chroma
+vector_store = VectorStore()
+moved = vector_store.migrate_chunk_text()
+vector_store.chunk_texts.compact()
+
+# chroma's SQLite file keeps the freed pages until it is vacuumed
+with sqlite3.connect(Path(Config.VECTOR_DB_DIR) / "chroma.sqlite3", timeout=30) as conn:
+    conn.execute("VACUUM")
+
+print(f"Moved {moved} chunk texts out of chroma")
+print(vector_store.chunk_texts.stats())
@@ -0,0 +1,100 @@
+# Report how many indexed chunks exceed the embedding model's token window
+
+import os
+import sys
+import logging
+from collections import defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import chromadb
+from chromadb.config import Settings
+from src.chunk_store import ChunkTextStore
+from src.config import Config
+from src.token_splitter import get_token_splitter
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("chunk_window_report")
+
+PAGE_SIZE = 5000
+
+
+def main():
+    settings = Settings(
+        anonymized_telemetry=False,
+        allow_reset=True,
+        is_persistent=True,
+        persist_directory=str(Config.VECTOR_DB_DIR),
+    )
+    client = chromadb.PersistentClient(path=str(Config.VECTOR_DB_DIR), settings=settings)
+    collection = client.get_collection("ministry_documents")
+    chunk_texts = ChunkTextStore()
+    splitter = get_token_splitter()
+    window = Config.EMBEDDING_MAX_TOKENS
+
+    total = 0
+    over_window = 0
+    token_counts = []
+    per_ministry = defaultdict(lambda: [0, 0])
+
+    offset = 0
+    while True:
+        results = collection.get(
+            include=["documents", "metadatas"], limit=PAGE_SIZE, offset=offset
+        )
+        if not results["ids"]:
+            break
+
+        # Older indexes keep the text in chroma; newer ones in the chunk text store
+        stored = chunk_texts.get_many(results["ids"])
+        documents = [
+            stored.get(doc_id) or text or ""
+            for doc_id, text in zip(results["ids"], results.get("documents") or [])
+        ]
+
+        counts = splitter.count_tokens(documents)
+
+        for count, metadata in zip(counts, results["metadatas"]):
+            ministry = (metadata or {}).get("ministry", "Unknown Ministry")
+            per_ministry[ministry][0] += 1
+            if count > window:
+                over_window += 1
+                per_ministry[ministry][1] += 1
+
+        token_counts.extend(counts)
+        total += len(documents)
+        offset += len(documents)
+
+    if not total:
+        print("No chunks found in the vector store")
+        return
+
+    token_counts.sort()
+    p95 = token_counts[min(len(token_counts) - 1, int(len(token_counts) * 0.95))]
+
+    print("=" * 70)
+    print(f"Embedding model: {Config.EMBEDDING_MODEL} (window {window} tokens)")
+    print(f"Total chunks: {total}")
+    print(
+        f"Chunks exceeding the window: {over_window} ({over_window / total * 100:.1f}%)"
+    )
+    print(f"Median tokens per chunk: {token_counts[len(token_counts) // 2]}")
+    print(f"p95 tokens per chunk: {p95}")
+    print(f"Max tokens per chunk: {token_counts[-1]}")
+    print("-" * 70)
+
+    for ministry, (count, over) in sorted(
+        per_ministry.items(), key=lambda x: x[1][1], reverse=True
+    ):
+        if over:
+            print(f"{ministry}: {over}/{count} chunks over the window")
+
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,10 @@ from tqdm import tqdm
 import sys
 import json
 import shutil
+import argparse
 from src.config import Config
 from src.document_processor import DocumentProcessor
+from src.sharded_build import build_sharded_index
 from src.vector_store import VectorStore
 
 logging.basicConfig(
@@ -22,8 +24,9 @@ logger = logging.getLogger("ministry_database")
 
 class MinistryDatabaseCreator:
 
-    def __init__(self, force_rebuild=False):
+    def __init__(self, force_rebuild=False, build_workers=None):
         self.force_rebuild = force_rebuild
+        self.build_workers = build_workers or Config.INDEX_BUILD_WORKERS
         self.doc_processor = DocumentProcessor()
         self.vector_store = VectorStore()
         self.stats = {
@@ -56,6 +59,7 @@ class MinistryDatabaseCreator:
 
         print("\nStep 4: Building vector database...")
         await self.build_vector_database()
+        self.vector_store.build_relevance_prototypes()
 
         elapsed_time = time.time() - start_time
 
@@ -181,6 +185,22 @@ class MinistryDatabaseCreator:
             print("Clearing existing vector store...")
             self.vector_store.clear()
 
+        if self.build_workers > 1:
+            ministries = [
+                ministry
+                for ministry in Config.MINISTRIES
+                if self.force_rebuild or not self.vector_store.is_ministry_indexed(ministry)
+            ]
+            print(f"Building {len(ministries)} ministries across {self.build_workers} processes...")
+            result = build_sharded_index(self.vector_store, ministries, self.build_workers)
+            self.stats["total_chunks"] = result["chunks"]
+            self.stats["errors"] += result["failed"]
+            print(
+                f"\nMerged {result['merged']} chunks from {result['pdfs']} PDFs "
+                f"in {len(result['shards'])} shards"
+            )
+            return
+
         total_chunks = 0
         indexed_ministries = 0
 
@@ -218,6 +238,15 @@ class MinistryDatabaseCreator:
 
 if __name__ == "__main__":
 
-    force_rebuild = "--force" in sys.argv
-    creator = MinistryDatabaseCreator(force_rebuild=force_rebuild)
+    parser = argparse.ArgumentParser(description="Classify cached PDFs and build the ministry index")
+    parser.add_argument("--force", action="store_true", help="Clear and rebuild every ministry")
+    parser.add_argument(
+        "--build-workers",
+        type=int,
+        default=Config.INDEX_BUILD_WORKERS,
+        help="Processes building ministry shards in parallel",
+    )
+    args = parser.parse_args()
+
+    creator = MinistryDatabaseCreator(force_rebuild=args.force, build_workers=args.build_workers)
     asyncio.run(creator.create_database())
\ No newline at end of file
@@ -0,0 +1,36 @@
+# Shared embedding sidecar: app workers set EMBEDDING_SERVICE_URL to batch through one encoder
+
+import os
+import sys
+import argparse
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from aiohttp import web
+from src.config import Config
+from src.embedding_service import create_embedding_app
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("embedding_service")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve batched embeddings over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Config.EMBEDDING_SERVICE_PORT)
+    args = parser.parse_args()
+
+    logger.info(
+        f"Embedding service on http://{args.host}:{args.port} "
+        f"(batch size {Config.EMBEDDING_BATCH_MAX_SIZE}, max wait {Config.EMBEDDING_BATCH_MAX_WAIT * 1000:.0f}ms)"
+    )
+    web.run_app(create_embedding_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
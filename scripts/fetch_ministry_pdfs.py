@@ -2,9 +2,14 @@
 
 import os
 import asyncio
+import argparse
+import json
 import logging
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 from tqdm import tqdm
 import time
 from datetime import datetime
@@ -15,6 +20,9 @@ from src.config import Config
 from src.sansad_client import SansadClient
 from src.document_processor import DocumentProcessor
 from src.vector_store import VectorStore
+from src.crawl_journal import CrawlJournal, DONE, FAILED, ABANDONED
+from src.ingest_pipeline import IngestPipeline
+from src.sharded_build import build_sharded_index
 
 logging.basicConfig(
     level=logging.INFO,
@@ -24,39 +32,137 @@ logging.basicConfig(
 logger = logging.getLogger("pdf_fetcher")
 
 
+class Shard(NamedTuple):
+    lok_sabha: int
+    session: int
+    ministry: str
+
+
+def shard_prefix(lok_sabha, session):
+    # The default shard keeps plain filenames so the existing cache and delta sync still match
+    if int(lok_sabha) == Config.DEFAULT_LOK_SABHA and int(session) == Config.DEFAULT_SESSION:
+        return ""
+    return f"LS{lok_sabha}_S{session}_"
+
+
+def parse_int_list(value):
+    numbers = []
+    for part in value.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            numbers.extend(range(int(start), int(end) + 1))
+        elif part:
+            numbers.append(int(part))
+    return numbers
+
+
+def build_shards(lok_sabhas, sessions, ministries):
+    return [
+        Shard(lok_sabha, session, ministry)
+        for lok_sabha in lok_sabhas
+        for session in sessions
+        for ministry in ministries
+    ]
+
+
+def select_shard_range(shards, shard_range):
+    if not shard_range:
+        return shards
+    start, _, end = shard_range.partition(":")
+    return shards[int(start or 0) : int(end) if end else len(shards)]
+
+
 class ComprehensivePDFFetcher:
-    def __init__(self):
+    def __init__(self, resume=False, build_index=True):
 
         self.sansad_client = SansadClient()
-        self.doc_processor = DocumentProcessor()
-        self.vector_store = VectorStore()
+        self.doc_processor = DocumentProcessor() if build_index else None
+        self.vector_store = VectorStore() if build_index else None
+        self.journal = CrawlJournal()
+        self.resume = resume
+        self.pipeline = None
+        self.submitted = set()
+
+        if not resume:
+            self.journal.reset()
 
         self.stats = {
             "total_pdfs_found": 0,
             "total_pdfs_downloaded": 0,
             "ministries_processed": 0,
+            "pages_skipped": 0,
             "errors": 0,
         }
 
-    async def fetch_pdfs_for_ministry(self, ministry):
-        logger.info(f"Fetching PDFs for {ministry}")
+    def _write_sidecar(self, pdf_path, metadata):
+        json_path = os.path.splitext(pdf_path)[0] + ".json"
+        try:
+            with open(json_path, "w") as f:
+                json.dump(metadata, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Error writing metadata for {pdf_path}: {e}")
+
+    async def _download(self, pdf_url, ministry, metadata=None):
+        metadata = metadata or {}
+        prefix = shard_prefix(
+            metadata.get("lok_sabha", Config.DEFAULT_LOK_SABHA),
+            metadata.get("session", Config.DEFAULT_SESSION),
+        )
+        pdf_path = await self.sansad_client.download_pdf(pdf_url, filename_prefix=prefix)
+
+        if pdf_path:
+            if metadata:
+                self._write_sidecar(pdf_path, metadata)
+            self.journal.mark_download_done(pdf_url, ministry, pdf_path)
+            self.stats["total_pdfs_downloaded"] += 1
+            if self.pipeline:
+                await self._submit(Path(pdf_path))
+            return True
+
+        status = self.journal.mark_download_failed(
+            pdf_url, ministry, "download failed", metadata
+        )
+        if status == ABANDONED:
+            logger.warning(f"Giving up on {pdf_url} after {Config.CRAWL_MAX_ATTEMPTS} attempts")
+        return False
+
+    async def fetch_pdfs_for_ministry(self, ministry, lok_sabha=None, session=None):
+        lok_sabha = lok_sabha or Config.DEFAULT_LOK_SABHA
+        session = session or Config.DEFAULT_SESSION
+        logger.info(f"Fetching PDFs for {ministry} (Lok Sabha {lok_sabha}, session {session})")
+
+        if self.journal.listing_done(ministry, lok_sabha, session):
+            logger.info(f"{ministry} already crawled, skipping")
+            self.stats["ministries_processed"] += 1
+            return 0
 
         downloaded_count = 0
         page = 1
-        max_pages = 625
+        max_pages = Config.CRAWL_MAX_PAGES
         has_more_pages = True
 
         while has_more_pages and page <= max_pages:
+            if self.journal.page_done(ministry, lok_sabha, session, page) or (
+                self.journal.page_abandoned(ministry, lok_sabha, session, page)
+            ):
+                self.stats["pages_skipped"] += 1
+                page += 1
+                continue
+
             try:
                 questions = await self.sansad_client.fetch_questions(
-                    ministry=ministry, page=page
+                    ministry=ministry, page=page, lok_sabha=lok_sabha, session=session
                 )
 
+                if questions is None:
+                    raise RuntimeError("listing page could not be fetched")
+
                 if not questions:
                     logger.info(
                         f"No more questions found for {ministry} after page {page-1}"
                     )
                     has_more_pages = False
+                    self.journal.mark_listing_done(ministry, lok_sabha, session, page - 1)
                     break
 
                 logger.info(
@@ -71,25 +177,74 @@ class ComprehensivePDFFetcher:
                     if not pdf_url:
                         continue
 
-                    pdf_path = await self.sansad_client.download_pdf(pdf_url)
+                    # Failed URLs are picked up by retry_failed_downloads once due
+                    if self.journal.download_status(pdf_url) in (DONE, FAILED, ABANDONED):
+                        continue
 
-                    if pdf_path:
+                    metadata = {
+                        "question_no": str(question.get("question_no", "")),
+                        "subject": question.get("subject", ""),
+                        "ministry": ministry,
+                        "date": question.get("date") or "Unknown",
+                        "lok_sabha": str(lok_sabha),
+                        "session": str(question.get("session") or session),
+                        "pdf_url": pdf_url,
+                    }
+                    if await self._download(pdf_url, ministry, metadata):
                         downloaded_count += 1
-                        self.stats["total_pdfs_downloaded"] += 1
+
+                self.journal.mark_page_done(ministry, lok_sabha, session, page, len(questions))
                 page += 1
-                await asyncio.sleep(0.5)
 
             except Exception as e:
                 logger.error(f"Error fetching PDFs for {ministry} on page {page}: {e}")
                 self.stats["errors"] += 1
+                status = self.journal.mark_page_failed(ministry, lok_sabha, session, page, str(e))
+                if status != ABANDONED:
+                    # Leave the listing open so --resume picks up from this page
+                    break
+                logger.warning(f"Giving up on {ministry} page {page} after {Config.CRAWL_MAX_ATTEMPTS} attempts")
                 page += 1
 
         self.stats["ministries_processed"] += 1
         logger.info(f"Downloaded {downloaded_count} PDFs for {ministry}")
         return downloaded_count
 
-    async def fetch_all_ministries(self):
+    async def fetch_shards(self, shards, workers=1):
+        queue = asyncio.Queue()
+        for shard in shards:
+            queue.put_nowait(shard)
+
+        progress = tqdm(total=len(shards), desc="Processing shards")
+
+        async def worker():
+            while True:
+                try:
+                    shard = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    count = await self.fetch_pdfs_for_ministry(
+                        shard.ministry, shard.lok_sabha, shard.session
+                    )
+                    print(
+                        f"Downloaded {count} PDFs for {shard.ministry} "
+                        f"(Lok Sabha {shard.lok_sabha}, session {shard.session})"
+                    )
+                except Exception as e:
+                    logger.error(f"Error crawling shard {shard}: {e}")
+                    self.stats["errors"] += 1
+                progress.update(1)
+
+        await asyncio.gather(*(worker() for _ in range(max(1, workers))))
+        progress.close()
+
+    async def fetch_all_ministries(self, shards=None, workers=1):
         start_time = time.time()
+        shards = shards or build_shards(
+            [Config.DEFAULT_LOK_SABHA], [Config.DEFAULT_SESSION], Config.MINISTRIES
+        )
 
         print(f"Starting COMPREHENSIVE PDF fetch process at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("=" * 70)
@@ -99,9 +254,15 @@ class ComprehensivePDFFetcher:
 
         os.makedirs(Config.PDF_CACHE_DIR, exist_ok=True)
 
-        for ministry in tqdm(Config.MINISTRIES, desc="Processing ministries"):
-            count = await self.fetch_pdfs_for_ministry(ministry)
-            print(f"Downloaded {count} PDFs for {ministry}")
+        if self.resume:
+            summary = self.journal.summary()
+            print(
+                f"Resuming: {summary['listings']} ministries and {summary['pages']} pages "
+                f"already crawled, {summary[DONE]} PDFs downloaded"
+            )
+
+        await self.fetch_shards(shards, workers)
+        await self.retry_failed_downloads()
 
         elapsed_time = time.time() - start_time
 
@@ -109,13 +270,92 @@ class ComprehensivePDFFetcher:
         print("=" * 70)
         print(f"Total PDFs found: {self.stats['total_pdfs_found']}")
         print(f"Total PDFs downloaded: {self.stats['total_pdfs_downloaded']}")
+        print(f"Shards processed: {self.stats['ministries_processed']}/{len(shards)}")
+        print(f"Pages skipped from journal: {self.stats['pages_skipped']}")
+        summary = self.journal.summary()
+        print(f"Listing pages that failed (retried on --resume): {summary['failed_pages']}")
         print(
-            f"Ministries processed: {self.stats['ministries_processed']}/{len(Config.MINISTRIES)}"
+            f"Downloads awaiting retry: {summary[FAILED]}, abandoned: {summary[ABANDONED]}"
         )
         print(f"Errors encountered: {self.stats['errors']}")
         print(f"Total fetch time: {elapsed_time:.1f} seconds")
         print("=" * 70)
 
+    async def retry_failed_downloads(self):
+        due = self.journal.due_retries()
+        if not due:
+            return
+
+        logger.info(f"Retrying {len(due)} failed downloads")
+        for entry in tqdm(due, desc="Retrying failed downloads"):
+            await self._download(entry["url"], entry["ministry"], entry["metadata"])
+
+    def _organize_pdf(self, pdf_path):
+        json_path = pdf_path.with_suffix(".json")
+        if not json_path.exists():
+            return None
+
+        try:
+            with open(json_path, "r") as f:
+                ministry = json.load(f).get("ministry")
+        except Exception as e:
+            logger.error(f"Error loading metadata from {json_path}: {e}")
+            return None
+
+        if ministry in Config.MINISTRIES:
+            ministry_dir = Config.get_ministry_dir(ministry)
+        else:
+            ministry = "Unknown Ministry"
+            ministry_dir = Config.MINISTRY_PDF_DIR / "Unknown_Ministry"
+        ministry_dir.mkdir(parents=True, exist_ok=True)
+
+        for source in (pdf_path, json_path):
+            target = ministry_dir / source.name
+            if target.exists():
+                continue
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+
+        return ministry, ministry_dir / pdf_path.name
+
+    async def _submit(self, pdf_path):
+        organized = self._organize_pdf(pdf_path)
+        if not organized:
+            return
+
+        ministry, ministry_pdf = organized
+        key = (ministry, ministry_pdf.name)
+        if key in self.submitted or self.vector_store.has_source(ministry_pdf.name, ministry):
+            return
+
+        self.submitted.add(key)
+
+        metadata = self.doc_processor.ministry_pdf_metadata(ministry, ministry_pdf)
+        await self.pipeline.submit(str(ministry_pdf), metadata)
+
+    async def run_pipeline(self, shards, workers=1):
+        print("\nStreaming downloads through parse and index stages...")
+        self.pipeline = await IngestPipeline(self.vector_store).start()
+
+        try:
+            await self.fetch_all_ministries(shards, workers)
+
+            # PDFs fetched by an earlier, interrupted run are still waiting to be indexed
+            for pdf_path in sorted(Path(Config.PDF_CACHE_DIR).glob("*.pdf")):
+                await self._submit(pdf_path)
+        finally:
+            stats = await self.pipeline.close()
+            self.pipeline = None
+
+        print(
+            f"Indexed {stats['chunks_indexed']} chunks from {stats['parsed']} PDFs "
+            f"({stats['failed']} failed); parse busy {stats['parse_seconds']:.1f}s, "
+            f"index busy {stats['index_seconds']:.1f}s, "
+            f"downloads blocked on backpressure {stats['submit_wait_seconds']:.1f}s"
+        )
+
     async def classify_and_organize_pdfs(self):
         print("\nClassifying and organizing PDFs...")
         pdf_files = list(Path(Config.PDF_CACHE_DIR).glob("*.pdf"))
@@ -126,10 +366,33 @@ class ComprehensivePDFFetcher:
 
         print(f"Found {len(pdf_files)} PDFs to classify")
 
-    async def build_vector_database(self):
+        organized = 0
+        unclassified = 0
+        for pdf_path in tqdm(pdf_files, desc="Organizing PDFs"):
+            if self._organize_pdf(pdf_path):
+                organized += 1
+            else:
+                unclassified += 1
+
+        print(f"Organized {organized} PDFs by ministry ({unclassified} without metadata)")
+
+    async def build_vector_database(self, build_workers=None):
         print("\nBuilding vector database...")
 
         self.vector_store.clear()
+        build_workers = build_workers or Config.INDEX_BUILD_WORKERS
+
+        if build_workers > 1:
+            result = await asyncio.to_thread(
+                build_sharded_index, self.vector_store, Config.MINISTRIES, build_workers
+            )
+            self.stats["errors"] += result["failed"]
+            print(
+                f"\nMerged {result['merged']} chunks from {result['pdfs']} PDFs "
+                f"built in {len(result['shards'])} shards"
+            )
+            return
+
         total_chunks = 0
         indexed_ministries = 0
 
@@ -157,13 +420,127 @@ class ComprehensivePDFFetcher:
         )
 
 
+def crawl_worker(shards, workers, resume, processes):
+    # Each process gets its own limiter, so split the request budget between them
+    Config.SANSAD_RATE_INITIAL /= processes
+    Config.SANSAD_RATE_MAX /= processes
+
+    fetcher = ComprehensivePDFFetcher(resume=resume, build_index=False)
+    asyncio.run(fetcher.fetch_all_ministries(shards, workers))
+    return fetcher.stats
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch all ministry PDFs and build the index")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the crawl journal instead of starting over",
+    )
+    parser.add_argument(
+        "--lok-sabhas",
+        default=str(Config.DEFAULT_LOK_SABHA),
+        help="Lok Sabhas to crawl, e.g. 17,18 or 16-18",
+    )
+    parser.add_argument(
+        "--sessions",
+        default=str(Config.DEFAULT_SESSION),
+        help="Session numbers to crawl, e.g. 1-7",
+    )
+    parser.add_argument("--ministries", nargs="*", help="Ministries to crawl (default: all)")
+    parser.add_argument(
+        "--shard-range",
+        help="Slice START:END of the shard list, for splitting a backfill across machines",
+    )
+    parser.add_argument("--list-shards", action="store_true", help="Print shards and exit")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent shards per process")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Crawler processes; they cannot stream into the index, so use --phased or --crawl-only",
+    )
+    parser.add_argument(
+        "--crawl-only", action="store_true", help="Download PDFs without rebuilding the index"
+    )
+    parser.add_argument(
+        "--build-workers",
+        type=int,
+        default=Config.INDEX_BUILD_WORKERS,
+        help="Processes building ministry shards in parallel during a phased rebuild",
+    )
+    parser.add_argument(
+        "--phased",
+        action="store_true",
+        help="Download everything, then rebuild the index from scratch, instead of streaming",
+    )
+    args = parser.parse_args()
+
+    # Worker processes download only; streaming indexing needs the single-process pipeline
+    if args.processes > 1 and not (args.phased or args.crawl_only):
+        parser.error("--processes > 1 needs --phased (download, then rebuild) or --crawl-only")
+    return args
+
+
 async def main():
+    args = parse_args()
+
+    shards = build_shards(
+        parse_int_list(args.lok_sabhas),
+        parse_int_list(args.sessions),
+        args.ministries or Config.MINISTRIES,
+    )
+    selected = select_shard_range(shards, args.shard_range)
+
+    if args.list_shards:
+        offset = shards.index(selected[0]) if selected else 0
+        for i, shard in enumerate(selected, start=offset):
+            print(f"{i}\tLS{shard.lok_sabha}\tsession {shard.session}\t{shard.ministry}")
+        return
+
     Config.setup_directories()
+    print(f"Crawling {len(selected)} of {len(shards)} shards")
+
+    if args.processes > 1:
+        if not args.resume:
+            CrawlJournal().reset()
+
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=args.processes) as pool:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        crawl_worker,
+                        selected[i :: args.processes],
+                        args.workers,
+                        True,
+                        args.processes,
+                    )
+                    for i in range(args.processes)
+                )
+            )
+        for stats in results:
+            print(f"Worker stats: {stats}")
+
+        if args.crawl_only:
+            return
+        fetcher = ComprehensivePDFFetcher(resume=True)
+    else:
+        fetcher = ComprehensivePDFFetcher(resume=args.resume, build_index=not args.crawl_only)
+
+        if not args.phased and not args.crawl_only:
+            await fetcher.run_pipeline(selected, args.workers)
+            print("\nProcess complete! You can now run the App")
+            return
+
+        await fetcher.fetch_all_ministries(selected, args.workers)
+        if args.crawl_only:
+            return
 
-    fetcher = ComprehensivePDFFetcher()
-    await fetcher.fetch_all_ministries()
     await fetcher.classify_and_organize_pdfs()
-    await fetcher.build_vector_database()
+    await fetcher.build_vector_database(args.build_workers)
+    await asyncio.to_thread(fetcher.vector_store.build_relevance_prototypes)
 
     print("\nProcess complete! You can now run the App")
 
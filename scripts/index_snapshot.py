@@ -0,0 +1,74 @@
+# Export, verify and restore compressed vector index snapshots
+
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.index_snapshot import (
+    SnapshotError,
+    export_snapshot,
+    restore_if_needed,
+    restore_snapshot,
+    verify_snapshot,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("index_snapshot")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage vector index snapshots")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Snapshot the vector DB")
+    export_parser.add_argument("--output", type=Path, default=Config.INDEX_SNAPSHOT_PATH)
+
+    verify_parser = subparsers.add_parser("verify", help="Check a snapshot")
+    verify_parser.add_argument("path", type=Path, nargs="?", default=Config.INDEX_SNAPSHOT_PATH)
+
+    restore_parser = subparsers.add_parser("restore", help="Install a snapshot")
+    restore_parser.add_argument("path", type=Path, nargs="?", default=Config.INDEX_SNAPSHOT_PATH)
+    restore_parser.add_argument(
+        "--if-needed",
+        action="store_true",
+        help="Only restore when the snapshot differs from the installed one",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "export":
+            path = export_snapshot(args.output)
+            print(f"Snapshot written to {path}")
+
+        elif args.command == "verify":
+            manifest = verify_snapshot(args.path)
+            print(
+                f"Snapshot {manifest['snapshot_id']} OK: {len(manifest['files'])} files, "
+                f"created {manifest['created_at']}"
+            )
+
+        elif args.command == "restore":
+            if args.if_needed:
+                restored = restore_if_needed(args.path)
+                print("Snapshot restored" if restored else "Snapshot restore not needed")
+            else:
+                manifest = restore_snapshot(args.path)
+                print(f"Restored snapshot {manifest['snapshot_id']} into {Config.VECTOR_DB_DIR}")
+
+    except SnapshotError as e:
+        logger.error(f"Snapshot {args.command} failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Background ingestion worker and job queue management
+
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.job_queue import JobQueue, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from src.ingest_worker import INDEX_PDFS, REEMBED_MINISTRY, IngestWorker, limit_resources
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.FileHandler("ingest_worker.log"), logging.StreamHandler()],
+)
+logger = logging.getLogger("ingest_worker")
+
+PRIORITIES = {"low": PRIORITY_LOW, "normal": PRIORITY_NORMAL, "high": PRIORITY_HIGH}
+
+
+def print_jobs(queue, status=None):
+    counts = queue.counts()
+    print(", ".join(f"{name}: {count}" for name, count in counts.items()))
+
+    for job in queue.list_jobs(status):
+        progress = ""
+        if job["progress_total"]:
+            progress = f" {job['progress_done']}/{job['progress_total']}"
+        note = f" ({job['progress_note']})" if job["progress_note"] else ""
+        error = f" error: {job['error']}" if job["error"] else ""
+        print(
+            f"#{job['id']:<5} {job['status']:<8} p{job['priority']:<3} {job['kind']:<17}"
+            f"attempt {job['attempts']}/{job['max_attempts']}{progress}{note}{error}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queue and run background ingestion jobs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Start a worker")
+    run_parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    run_parser.add_argument("--cpu-budget", type=float, help="Fraction of one core to use")
+    run_parser.add_argument("--nice", type=int, help="Niceness increment")
+
+    index_parser = subparsers.add_parser("index-pdfs", help="Queue PDFs for indexing")
+    index_parser.add_argument("paths", nargs="+", type=Path)
+    index_parser.add_argument("--ministry")
+    index_parser.add_argument("--priority", choices=PRIORITIES, default="normal")
+
+    reembed_parser = subparsers.add_parser("reembed", help="Queue a ministry re-embed")
+    reembed_parser.add_argument("ministry", choices=Config.MINISTRIES)
+    reembed_parser.add_argument("--priority", choices=PRIORITIES, default="low")
+
+    status_parser = subparsers.add_parser("status", help="Show queued and recent jobs")
+    status_parser.add_argument("--status", choices=["queued", "running", "done", "failed"])
+
+    args = parser.parse_args()
+    queue = JobQueue()
+
+    if args.command == "run":
+        limit_resources(nice=args.nice)
+        IngestWorker(queue, cpu_budget=args.cpu_budget).run(once=args.once)
+
+    elif args.command == "index-pdfs":
+        paths = []
+        for path in args.paths:
+            paths.extend(sorted(path.glob("*.pdf")) if path.is_dir() else [path])
+
+        payload = {"paths": [str(path.resolve()) for path in paths]}
+        if args.ministry:
+            payload["ministry"] = args.ministry
+        job_id = queue.enqueue(INDEX_PDFS, payload, PRIORITIES[args.priority])
+        print(f"Queued job {job_id} to index {len(paths)} PDFs")
+
+    elif args.command == "reembed":
+        job_id = queue.enqueue(
+            REEMBED_MINISTRY, {"ministry": args.ministry}, PRIORITIES[args.priority]
+        )
+        print(f"Queued job {job_id} to re-embed {args.ministry}")
+
+    elif args.command == "status":
+        print_jobs(queue, args.status)
+
+
+if __name__ == "__main__":
+    main()
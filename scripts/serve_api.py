@@ -0,0 +1,31 @@
+# Headless HTTP API for search and answers, alongside the Streamlit UI
+
+import os
+import sys
+import argparse
+import logging
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.config import Config
+from src.api_server import run_server
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve /search and /answer over HTTP")
+    parser.add_argument("--host", default=Config.API_HOST)
+    parser.add_argument("--port", type=int, default=Config.API_PORT)
+    parser.add_argument("--workers", type=int, default=Config.API_WORKERS)
+    args = parser.parse_args()
+
+    run_server(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
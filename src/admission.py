@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Optional
+from .config import Config
+from .metrics import observe_stage, record_admission, record_shed
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"LLM request shed: {reason}")
+        self.reason = reason
+
+
+class _Ticket:
+    __slots__ = ("session", "loop", "future", "granted")
+
+    def __init__(self, session: str, loop: asyncio.AbstractEventLoop):
+        self.session = session
+        self.loop = loop
+        self.future = loop.create_future()
+        self.granted = False
+
+
+class AdmissionController:
+    """Bounded, per-session fair queue in front of the LLM executor.
+
+    At most ``slots`` requests run at once. Waiting requests are served round-robin
+    across sessions, so one user firing many questions cannot starve the rest, and
+    a request that cannot start within ``max_wait`` is shed rather than left hanging.
+    State is guarded by a thread lock so one controller can serve callers running
+    on different event loops, as Streamlit sessions do.
+    """
+
+    def __init__(
+        self,
+        slots: int = None,
+        max_queue: int = None,
+        max_per_session: int = None,
+        max_wait: float = None,
+    ):
+        self.slots = slots or Config.LLM_MAX_WORKERS
+        self.max_queue = Config.LLM_ADMISSION_QUEUE_SIZE if max_queue is None else max_queue
+        self.max_per_session = max_per_session or Config.LLM_ADMISSION_MAX_PER_SESSION
+        self.max_wait = Config.LLM_ADMISSION_MAX_WAIT if max_wait is None else max_wait
+
+        self._lock = threading.Lock()
+        self._waiting: "OrderedDict[str, deque]" = OrderedDict()
+        self._depth = 0
+        self._in_flight = 0
+        self.shed = Counter()
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _report(self):
+        record_admission(self._depth, self._in_flight)
+
+    def _shed(self, reason: str) -> AdmissionRejected:
+        self.shed[reason] += 1
+        record_shed(reason)
+        return AdmissionRejected(reason)
+
+    def _enqueue(self, session: str) -> Optional[_Ticket]:
+        with self._lock:
+            if self._in_flight < self.slots and not self._depth:
+                self._in_flight += 1
+                self._report()
+                return None
+
+            if self._depth >= self.max_queue:
+                reason = "queue_full"
+            elif len(self._waiting.get(session, ())) >= self.max_per_session:
+                reason = "session_limit"
+            else:
+                ticket = _Ticket(session, asyncio.get_running_loop())
+                self._waiting.setdefault(session, deque()).append(ticket)
+                self._depth += 1
+                self._report()
+                return ticket
+
+        raise self._shed(reason)
+
+    def _dispatch(self):
+        # Caller holds the lock. The session served goes to the back of the rotation.
+        while self._in_flight < self.slots and self._waiting:
+            session, tickets = self._waiting.popitem(last=False)
+            ticket = tickets.popleft()
+            if tickets:
+                self._waiting[session] = tickets
+
+            self._depth -= 1
+            self._in_flight += 1
+            ticket.granted = True
+            try:
+                ticket.loop.call_soon_threadsafe(_grant, ticket.future)
+            except RuntimeError:
+                # The waiter's event loop is gone; hand the slot to the next in line
+                self._in_flight -= 1
+
+    def _cancel(self, ticket: _Ticket) -> bool:
+        """Withdraw a waiting ticket; False if it was granted a slot in the meantime."""
+        with self._lock:
+            if ticket.granted:
+                return False
+            tickets = self._waiting.get(ticket.session)
+            tickets.remove(ticket)
+            if not tickets:
+                del self._waiting[ticket.session]
+            self._depth -= 1
+            self._report()
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+            self._report()
+
+    @asynccontextmanager
+    async def slot(self, session: Optional[str] = None):
+        session = session or "anonymous"
+        start = time.perf_counter()
+        ticket = self._enqueue(session)
+
+        if ticket is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.future), self.max_wait)
+            except asyncio.TimeoutError:
+                if self._cancel(ticket):
+                    raise self._shed("queue_timeout")
+            except asyncio.CancelledError:
+                if not self._cancel(ticket):
+                    self._release()
+                raise
+
+        observe_stage("llm_admission_wait", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+def _grant(future: asyncio.Future):
+    if not future.done():
+        future.set_result(True)
@@ -0,0 +1,290 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import socket
+from typing import Dict, Any, List
+from aiohttp import web
+from .config import Config
+from .llm_client import LLMClient
+from .metadata_fields import RangeFilter, parse_date, parse_int
+from .metrics import record_error, registry, start_exporter
+from .profiler import profile_request
+from .relevance_gate import OFF_TOPIC_MESSAGE
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+VECTOR_STORE = web.AppKey("vector_store", VectorStore)
+LLM_CLIENT = web.AppKey("llm_client", LLMClient)
+READY = web.AppKey("ready", bool)
+LOADER = web.AppKey("loader", asyncio.Task)
+
+
+def _source(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": document.get("id"),
+        "text": document.get("text"),
+        "metadata": document.get("metadata", {}),
+        "relevance_score": document.get("relevance_score"),
+    }
+
+
+def _is_fallback(documents: List[Dict[str, Any]]) -> bool:
+    # Set when the chosen ministry had no match and other ministries answered instead
+    return any((document.get("metadata") or {}).get("fallback") for document in documents)
+
+
+def _require_ready(request: web.Request):
+    if not request.app[READY]:
+        raise web.HTTPServiceUnavailable(text="Worker is still loading")
+
+
+def _read_range_filter(body: Dict[str, Any]) -> RangeFilter:
+    values = {}
+    for key, parse in (
+        ("date_from", parse_date),
+        ("date_to", parse_date),
+        ("lok_sabha", parse_int),
+        ("session_from", parse_int),
+        ("session_to", parse_int),
+    ):
+        if body.get(key) in (None, ""):
+            continue
+        values[key] = parse(body[key])
+        if values[key] is None:
+            raise web.HTTPBadRequest(text=f"'{key}' is not a valid value: {body[key]!r}")
+
+    range_filter = RangeFilter(**values)
+    try:
+        range_filter.where_clauses()
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+    return range_filter
+
+
+async def _read_query(request: web.Request, require_ministry: bool = False) -> Dict[str, Any]:
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise web.HTTPBadRequest(text="Request body must be JSON")
+    if not isinstance(body, dict):
+        raise web.HTTPBadRequest(text="Request body must be a JSON object")
+
+    question = str(body.get("question", "")).strip()
+    if not question:
+        raise web.HTTPBadRequest(text="'question' is required")
+
+    ministry = body.get("ministry")
+    if require_ministry and not ministry:
+        raise web.HTTPBadRequest(text="'ministry' is required")
+
+    try:
+        n_results = min(int(body.get("n_results", Config.MAX_DOCS_PER_QUERY)), 50)
+    except (TypeError, ValueError):
+        raise web.HTTPBadRequest(text="'n_results' must be an integer")
+
+    stream = body.get("stream", False)
+    if not isinstance(stream, bool):
+        raise web.HTTPBadRequest(text="'stream' must be true or false")
+
+    return {
+        "question": question,
+        "ministry": ministry,
+        "n_results": max(1, n_results),
+        "stream": stream,
+        # Admission control queues fairly across sessions; fall back to the client address
+        "session_id": request.headers.get("X-Session-Id") or request.remote,
+        "range_filter": _read_range_filter(body),
+    }
+
+
+async def _search(request: web.Request, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+    vector_store = request.app[VECTOR_STORE]
+    return await asyncio.to_thread(
+        vector_store.search_by_text,
+        query["question"],
+        query["ministry"],
+        query["n_results"],
+        query["range_filter"],
+    )
+
+
+async def search(request: web.Request) -> web.Response:
+    _require_ready(request)
+    query = await _read_query(request)
+
+    with profile_request(query["ministry"], stage_root="api_search"):
+        try:
+            documents = await _search(request, query)
+        except Exception as e:
+            record_error("api_search")
+            logger.error(f"Error serving search: {e}")
+            raise web.HTTPInternalServerError(text="Search failed")
+
+    return web.json_response(
+        {"results": [_source(doc) for doc in documents], "fallback": _is_fallback(documents)}
+    )
+
+
+async def answer(request: web.Request) -> web.StreamResponse:
+    _require_ready(request)
+    query = await _read_query(request, require_ministry=True)
+    llm_client = request.app[LLM_CLIENT]
+
+    with profile_request(query["ministry"], stage_root="api_answer"):
+        try:
+            documents, decision = await asyncio.to_thread(
+                request.app[VECTOR_STORE].search_for_answer,
+                query["question"],
+                query["ministry"],
+                query["n_results"],
+                query["range_filter"],
+            )
+        except Exception as e:
+            record_error("api_answer")
+            logger.error(f"Error retrieving context: {e}")
+            raise web.HTTPInternalServerError(text="Search failed")
+
+        # Off-topic questions are answered here without an LLM round trip
+        if not decision.allowed:
+            off_topic = {
+                "answer": OFF_TOPIC_MESSAGE,
+                "reason": decision.reason,
+                "suggested_ministry": decision.suggested_ministry,
+            }
+            if not query["stream"]:
+                return web.json_response({**off_topic, "sources": []})
+            body = json.dumps({"type": "off_topic", **off_topic}) + "\n" + '{"type": "done"}\n'
+            return web.Response(text=body, content_type="application/x-ndjson")
+
+        sources = [_source(doc) for doc in documents]
+        fallback = _is_fallback(documents)
+
+        if not query["stream"]:
+            text = await llm_client.generate_response(
+                query["question"], documents, query["ministry"], query["session_id"]
+            )
+            return web.json_response({"answer": text, "sources": sources, "fallback": fallback})
+
+        # Newline-delimited JSON: sources first, then text deltas, then a final marker
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        await response.write(
+            json.dumps({"type": "sources", "sources": sources, "fallback": fallback}).encode() + b"\n"
+        )
+
+        try:
+            async for delta in llm_client.generate_response_stream(
+                query["question"], documents, query["ministry"], query["session_id"]
+            ):
+                await response.write(json.dumps({"type": "delta", "text": delta}).encode() + b"\n")
+            await response.write(b'{"type": "done"}\n')
+        except ConnectionResetError:
+            logger.info("Client disconnected during streamed answer")
+        except Exception as e:
+            record_error("api_answer")
+            logger.error(f"Error streaming answer: {e}")
+            await response.write(
+                json.dumps({"type": "error", "error": "Answer generation failed"}).encode() + b"\n"
+            )
+
+        await response.write_eof()
+        return response
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+async def ready(request: web.Request) -> web.Response:
+    if not request.app[READY]:
+        return web.json_response({"status": "starting"}, status=503)
+
+    vector_store = request.app[VECTOR_STORE]
+    body = {"status": "ready", "ministries": sorted(vector_store.indexed_ministries)}
+    if vector_store.partitions is not None:
+        body["resident_partitions"] = vector_store.partitions.resident()
+    # An open circuit still serves retrieval-only answers, so the worker stays ready
+    body["llm_circuit"] = request.app[LLM_CLIENT].breaker.state
+    return web.json_response(body)
+
+
+async def metrics(request: web.Request) -> web.Response:
+    return web.Response(text=registry.render(), content_type="text/plain")
+
+
+async def _load_components(app: web.Application):
+    app[READY] = False
+
+    async def load():
+        try:
+            if VECTOR_STORE not in app:
+                app[VECTOR_STORE] = await asyncio.to_thread(VectorStore)
+            if LLM_CLIENT not in app:
+                app[LLM_CLIENT] = LLMClient()
+
+            # Load the encoder now so the first real query does not pay for it
+            await asyncio.to_thread(app[VECTOR_STORE].create_embedding, "warm up")
+            await asyncio.to_thread(app[VECTOR_STORE].preload_partitions)
+            app[READY] = True
+            logger.info("API worker ready")
+        except Exception as e:
+            logger.error(f"Error loading API components: {e}")
+
+    # Liveness answers immediately; readiness flips once the encoder is loaded
+    app[LOADER] = asyncio.create_task(load())
+
+
+def create_app(vector_store: VectorStore = None, llm_client: LLMClient = None) -> web.Application:
+    app = web.Application()
+    if vector_store is not None:
+        app[VECTOR_STORE] = vector_store
+    if llm_client is not None:
+        app[LLM_CLIENT] = llm_client
+
+    app.on_startup.append(_load_components)
+    app.router.add_post("/search", search)
+    app.router.add_post("/answer", answer)
+    app.router.add_get("/healthz", health)
+    app.router.add_get("/readyz", ready)
+    app.router.add_get("/metrics", metrics)
+    return app
+
+
+def _serve(host: str, port: int, reuse_port: bool, worker: int = 0):
+    # Every worker keeps its own registry, so each exports on its own port
+    start_exporter(worker)
+    web.run_app(create_app(), host=host, port=port, reuse_port=reuse_port, print=None)
+
+
+def run_server(host: str = None, port: int = None, workers: int = None):
+    host = host or Config.API_HOST
+    port = port or Config.API_PORT
+    workers = workers or Config.API_WORKERS
+
+    if workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        logger.warning("SO_REUSEPORT is unavailable on this platform; running one worker")
+        workers = 1
+
+    logger.info(f"Serving API on http://{host}:{port} with {workers} worker(s)")
+
+    if workers == 1:
+        _serve(host, port, reuse_port=False)
+        return
+
+    # Each worker binds the same port and the kernel spreads connections between them
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_serve, args=(host, port, True, worker), daemon=True)
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
@@ -0,0 +1,182 @@
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import List, Dict, Iterable
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_LEVEL = 6
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    text_hash TEXT NOT NULL
+);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ChunkTextStore:
+    """Chunk texts kept out of chroma, compressed and read through a memory map.
+
+    Each text is appended zlib-compressed to one data file and a SQLite table maps
+    the chunk id to its offset and a content hash. Searches rank and deduplicate on
+    ids and hashes alone, then decompress only the chunks they return.
+    """
+
+    def __init__(self, directory: Path = None):
+        directory = Path(directory or Config.VECTOR_DB_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Snapshots copy files in name order, so the index is copied before the data
+        # file and every offset it holds is present in the copied data
+        self.index_path = directory / "chunk_texts.sqlite3"
+        self.data_path = directory / "chunk_texts.zlib"
+        self.data_path.touch(exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._map_lock = threading.Lock()
+        self._mapped = None
+
+        self._conn = sqlite3.connect(str(self.index_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(sql, params).fetchall()
+
+    def _select(self, columns: str, ids: List[str]) -> List[tuple]:
+        rows = []
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            batch = ids[i : i + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            rows.extend(
+                self._execute(f"SELECT {columns} FROM chunks WHERE id IN ({placeholders})", tuple(batch))
+            )
+        return rows
+
+    def put_many(self, ids: List[str], texts: List[str]):
+        blobs = [zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL) for text in texts]
+
+        with self._write_lock:
+            # Data is durable before the index points at it
+            with open(self.data_path, "ab") as f:
+                offset = f.seek(0, os.SEEK_END)
+                rows = []
+                for doc_id, text, blob in zip(ids, texts, blobs):
+                    f.write(blob)
+                    rows.append((doc_id, offset, len(blob), text_hash(text)))
+                    offset += len(blob)
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._lock:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO chunks (id, offset, length, text_hash) VALUES (?, ?, ?, ?)",
+                        rows,
+                    )
+
+    def _view(self) -> mmap.mmap:
+        # Other processes append to the file or swap in a compacted one, so the map is
+        # keyed on the file it was made from and remade once that file changes
+        stat = os.stat(self.data_path)
+        key = (stat.st_ino, stat.st_size)
+        mapped = self._mapped
+        if mapped is not None and mapped[0] == key:
+            return mapped[1]
+
+        with self._map_lock:
+            if self._mapped is None or self._mapped[0] != key:
+                with open(self.data_path, "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._mapped = ((stat.st_ino, stat.st_size), view)
+            return self._mapped[1]
+
+    def get_many(self, ids: Iterable[str]) -> Dict[str, str]:
+        rows = self._select("id, offset, length", list(dict.fromkeys(ids)))
+        if not rows:
+            return {}
+
+        view = self._view()
+        return {
+            doc_id: zlib.decompress(view[offset : offset + length]).decode("utf-8")
+            for doc_id, offset, length in rows
+        }
+
+    def hashes(self, ids: Iterable[str]) -> Dict[str, str]:
+        return dict(self._select("id, text_hash", list(dict.fromkeys(ids))))
+
+    def delete_many(self, ids: List[str]):
+        # The bytes stay in the data file until the next compact()
+        for i in range(0, len(ids), 500):
+            batch = ids[i : i + 500]
+            placeholders = ", ".join("?" for _ in batch)
+            self._execute(f"DELETE FROM chunks WHERE id IN ({placeholders})", tuple(batch))
+
+    def stats(self) -> Dict[str, int]:
+        chunks, live_bytes = self._execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks")[0]
+        data_bytes = self.data_path.stat().st_size
+        return {"chunks": chunks, "data_bytes": data_bytes, "dead_bytes": data_bytes - live_bytes}
+
+    def _rewrite(self, records: Iterable[tuple]):
+        tmp_path = self.data_path.with_suffix(".tmp")
+        rows = []
+        with open(tmp_path, "wb") as f:
+            for doc_id, blob, digest in records:
+                rows.append((doc_id, f.tell(), len(blob), digest))
+                f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM chunks")
+                self._conn.executemany(
+                    "INSERT INTO chunks (id, offset, length, text_hash) VALUES (?, ?, ?, ?)", rows
+                )
+                # Replacing rather than truncating leaves open maps on the old file readable
+                os.replace(tmp_path, self.data_path)
+
+        with self._map_lock:
+            self._mapped = None
+
+    def compact(self) -> int:
+        """Rewrite the data file without deleted chunks. Run while no search is reading it."""
+        with self._write_lock:
+            before = self.data_path.stat().st_size
+            rows = self._execute("SELECT id, offset, length, text_hash FROM chunks ORDER BY offset")
+            view = self._view() if rows else None
+            self._rewrite(
+                (doc_id, view[offset : offset + length], digest) for doc_id, offset, length, digest in rows
+            )
+
+        reclaimed = before - self.data_path.stat().st_size
+        logger.info(f"Compacted chunk text store: reclaimed {reclaimed / 1e6:.1f} MB")
+        return reclaimed
+
+    def clear(self):
+        with self._write_lock:
+            self._rewrite([])
@@ -24,11 +24,49 @@ class Config:
     PDF_CACHE_DIR = DATA_DIR / "pdf_cache"
     MINISTRY_PDF_DIR = DATA_DIR / "ministry_pdfs"
     VECTOR_DB_DIR = DATA_DIR / "vector_db"
+    SNAPSHOT_DIR = DATA_DIR / "snapshots"
+    RESPONSE_CACHE_DIR = DATA_DIR / "response_cache"
+    INDEX_SNAPSHOT_PATH = Path(
+        os.getenv("INDEX_SNAPSHOT_PATH", str(SNAPSHOT_DIR / "index_snapshot.tar.gz"))
+    )
+
+    SYNC_STATE_PATH = DATA_DIR / "sync_state.json"
+    DELTA_SYNC_MAX_PAGES = 625
+    DELTA_SYNC_MAX_ATTEMPTS = 5
+
+    CRAWL_JOURNAL_PATH = Path(
+        os.getenv("CRAWL_JOURNAL_PATH", str(DATA_DIR / "crawl_journal.sqlite3"))
+    )
+    CRAWL_MAX_PAGES = 625
+    CRAWL_MAX_ATTEMPTS = 8
+    CRAWL_RETRY_BASE_DELAY = 60
+    CRAWL_RETRY_MAX_DELAY = 6 * 60 * 60
+
+    CURRENT_USER = os.getenv("USERNAME", "anonymous")
 
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Concurrent query embeddings are coalesced; a sidecar URL replaces the local encoder
+    EMBEDDING_BATCHING_ENABLED = os.getenv("EMBEDDING_BATCHING_ENABLED", "true").lower() == "true"
+    EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "32"))
+    EMBEDDING_BATCH_MAX_WAIT = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT", "0.005"))
+    EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL")
+    EMBEDDING_SERVICE_PORT = int(os.getenv("EMBEDDING_SERVICE_PORT", "8093"))
+
+    # Applied only when the collection is created; chroma's defaults are 100/10/16
+    HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+    HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "10"))
+    HNSW_M = int(os.getenv("HNSW_M", "16"))
+    SEARCH_OVERFETCH_FACTOR = int(os.getenv("SEARCH_OVERFETCH_FACTOR", "2"))
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
 
+    # all-MiniLM-L6-v2 truncates at 256 word-pieces, including [CLS] and [SEP]
+    EMBEDDING_MAX_TOKENS = 256
+    CHUNKING_STRATEGY = os.getenv("CHUNKING_STRATEGY", "tokens")
+    CHUNK_TOKEN_SIZE = 240
+    CHUNK_TOKEN_OVERLAP = 32
+
     SANSAD_API_URL = "https://sansad.in/api_ls/question/qetFilteredQuestionsAns"
     PDF_BASE_URL = "https://sansad.in/"
     DEFAULT_LOK_SABHA = 18
@@ -38,9 +76,101 @@ class Config:
     MAX_RETRIES = 3
     TIMEOUT = 30
     RATE_LIMIT_DELAY = 1
+    RATE_LIMIT_MAX_BACKOFF = 60
+
+    # Listing pages for closed sessions are cached forever; the open session uses the TTL
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "900"))
+
+    # Shared AIMD limiter for sansad.in, in requests per second
+    SANSAD_RATE_INITIAL = float(os.getenv("SANSAD_RATE_INITIAL", "2.0"))
+    SANSAD_RATE_MIN = 0.2
+    SANSAD_RATE_MAX = float(os.getenv("SANSAD_RATE_MAX", "10.0"))
+    SANSAD_RATE_BURST = 5
+    SANSAD_RATE_INCREASE = 0.05
+    SANSAD_RATE_DECREASE_FACTOR = 0.5
     MAX_DOCS_PER_QUERY = 10
+
+    # Serve searches from per-ministry partitions loaded on demand instead of one resident HNSW
+    PARTITION_RESIDENCY_ENABLED = os.getenv("PARTITION_RESIDENCY_ENABLED", "false").lower() == "true"
+    PARTITION_MEMORY_BUDGET_MB = int(os.getenv("PARTITION_MEMORY_BUDGET_MB", "512"))
+    PARTITION_PRELOAD = os.getenv("PARTITION_PRELOAD", "true").lower() == "true"
+    PARTITION_TRAFFIC_PATH = DATA_DIR / "partition_traffic.json"
+    PARTITION_TRAFFIC_DECAY = 0.999
+
+    # Off-topic questions are answered before the LLM by comparing the query with each
+    # ministry's prototype vectors and the best retrieval score. Calibrated thresholds in
+    # VECTOR_DB_DIR/relevance_gate.json override these defaults.
+    RELEVANCE_GATE_ENABLED = os.getenv("RELEVANCE_GATE_ENABLED", "true").lower() == "true"
+    RELEVANCE_MIN_MINISTRY_SCORE = float(os.getenv("RELEVANCE_MIN_MINISTRY_SCORE", "0.15"))
+    RELEVANCE_MIN_TOP_SCORE = float(os.getenv("RELEVANCE_MIN_TOP_SCORE", "0.2"))
+    RELEVANCE_PROTOTYPES_PER_MINISTRY = 8
+    RELEVANCE_PROTOTYPE_SAMPLE = 2000
+
+    # Cross-ministry search fans out one query per ministry and merges what returns in time
+    ALL_MINISTRIES = "All Ministries"
+    SCATTER_MAX_WORKERS = int(os.getenv("SCATTER_MAX_WORKERS", "8"))
+    SCATTER_DEADLINE = float(os.getenv("SCATTER_DEADLINE", "1.5"))
+    SCATTER_PER_MINISTRY_CAP = int(os.getenv("SCATTER_PER_MINISTRY_CAP", "3"))
+    LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "1"))
+    # Past these limits a question gets a retrieval-only answer instead of waiting for the LLM
+    LLM_ADMISSION_QUEUE_SIZE = int(os.getenv("LLM_ADMISSION_QUEUE_SIZE", "16"))
+    LLM_ADMISSION_MAX_PER_SESSION = int(os.getenv("LLM_ADMISSION_MAX_PER_SESSION", "2"))
+    LLM_ADMISSION_MAX_WAIT = float(os.getenv("LLM_ADMISSION_MAX_WAIT", "20"))
+    # Each answer gets one deadline; a second request starts once the first passes the observed p95
+    LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "30"))
+    LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+    LLM_HEDGE_INITIAL_DELAY = float(os.getenv("LLM_HEDGE_INITIAL_DELAY", "8.0"))
+    LLM_LATENCY_WINDOW = 200
+    LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+    # Timed-out calls keep running until gemini answers; past this many, new calls are refused
+    LLM_MAX_ABANDONED_CALLS = int(os.getenv("LLM_MAX_ABANDONED_CALLS", "8"))
     PDF_BATCH_SIZE = 20
 
+    INGEST_PARSE_WORKERS = int(
+        os.getenv("INGEST_PARSE_WORKERS", str(max(1, (os.cpu_count() or 2) - 1)))
+    )
+    INGEST_PARSE_QUEUE_SIZE = 64
+    INGEST_INDEX_QUEUE_SIZE = 16
+    INGEST_INDEX_BATCH_SIZE = 256
+
+    # Full rebuilds split ministries across processes, each building its own shard to merge
+    INDEX_BUILD_WORKERS = int(os.getenv("INDEX_BUILD_WORKERS", "1"))
+    INDEX_BUILD_SHARD_DIR = DATA_DIR / "build_shards"
+
+    JOB_QUEUE_PATH = Path(os.getenv("JOB_QUEUE_PATH", str(DATA_DIR / "ingest_jobs.sqlite3")))
+    JOB_MAX_ATTEMPTS = 3
+    JOB_RETRY_BASE_DELAY = 30
+    JOB_RETRY_MAX_DELAY = 30 * 60
+    JOB_STALE_TIMEOUT = 15 * 60
+    # Sent from a background thread, so long PDFs and CPU-budget pauses never look stale
+    JOB_HEARTBEAT_INTERVAL = 60
+    JOB_POLL_INTERVAL = 5
+
+    # Keep background ingestion from starving live queries
+    INGEST_WORKER_NICE = int(os.getenv("INGEST_WORKER_NICE", "10"))
+    INGEST_WORKER_CPU_BUDGET = float(os.getenv("INGEST_WORKER_CPU_BUDGET", "0.5"))
+    INGEST_WORKER_THREADS = int(os.getenv("INGEST_WORKER_THREADS", "1"))
+
+    API_HOST = os.getenv("API_HOST", "127.0.0.1")
+    API_PORT = int(os.getenv("API_PORT", "8080"))
+    API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    # API worker i exports on METRICS_PORT + i; the dump runs whenever a path is set
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+    METRICS_DUMP_PATH = os.getenv("METRICS_DUMP_PATH")
+    METRICS_DUMP_INTERVAL = 60
+
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_SLOW_THRESHOLD = float(os.getenv("PROFILE_SLOW_THRESHOLD", "5.0"))
+    PROFILE_SAMPLE_INTERVAL = 0.01
+    PROFILE_DIR = DATA_DIR / "profiles"
+    PROFILE_MAX_FILES = 50
+    PROFILE_MAX_BYTES = 50 * 1024 * 1024
+
     MINISTRIES = [
         "Ministry of Agriculture and Farmers Welfare",
         "Ministry of Chemicals and Fertilizers",
@@ -96,6 +226,15 @@ class Config:
         "NITI Aayog",
     ]
 
+    @classmethod
+    def hnsw_metadata(cls):
+        return {
+            "hnsw:space": "cosine",
+            "hnsw:construction_ef": cls.HNSW_CONSTRUCTION_EF,
+            "hnsw:search_ef": cls.HNSW_SEARCH_EF,
+            "hnsw:M": cls.HNSW_M,
+        }
+
     @staticmethod
     def sanitize_ministry_name(ministry):
         return ministry.replace(" ", "_").replace(",", "").replace("'", "")
@@ -0,0 +1,240 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    ministry TEXT NOT NULL,
+    lok_sabha INTEGER NOT NULL,
+    session INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    question_count INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (ministry, lok_sabha, session, page)
+);
+CREATE TABLE IF NOT EXISTS failed_pages (
+    ministry TEXT NOT NULL,
+    lok_sabha INTEGER NOT NULL,
+    session INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (ministry, lok_sabha, session, page)
+);
+CREATE TABLE IF NOT EXISTS listings (
+    ministry TEXT NOT NULL,
+    lok_sabha INTEGER NOT NULL,
+    session INTEGER NOT NULL,
+    last_page INTEGER NOT NULL,
+    completed_at TEXT NOT NULL,
+    PRIMARY KEY (ministry, lok_sabha, session)
+);
+CREATE TABLE IF NOT EXISTS downloads (
+    url TEXT PRIMARY KEY,
+    ministry TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL,
+    last_error TEXT,
+    path TEXT,
+    metadata TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS downloads_retry ON downloads (status, next_attempt_at);
+"""
+
+DONE = "done"
+FAILED = "failed"
+ABANDONED = "abandoned"
+
+
+class CrawlJournal:
+    """Durable record of crawled listing pages and PDF downloads.
+
+    Every write is committed immediately, so a crash loses at most the
+    page or download that was in flight.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or Config.CRAWL_JOURNAL_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(downloads)")}
+        if "metadata" not in columns:
+            self._conn.execute("ALTER TABLE downloads ADD COLUMN metadata TEXT")
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(sql, params).fetchall()
+
+    def reset(self):
+        with self._lock:
+            with self._conn:
+                for table in ("pages", "failed_pages", "listings", "downloads"):
+                    self._conn.execute(f"DELETE FROM {table}")
+        logger.info(f"Cleared crawl journal at {self.path}")
+
+    def page_done(self, ministry: str, lok_sabha: int, session: int, page: int) -> bool:
+        rows = self._execute(
+            "SELECT 1 FROM pages WHERE ministry=? AND lok_sabha=? AND session=? AND page=?",
+            (ministry, lok_sabha, session, page),
+        )
+        return bool(rows)
+
+    def mark_page_done(
+        self, ministry: str, lok_sabha: int, session: int, page: int, question_count: int
+    ):
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                    (ministry, lok_sabha, session, page, question_count, datetime.now().isoformat()),
+                )
+                self._conn.execute(
+                    "DELETE FROM failed_pages WHERE ministry=? AND lok_sabha=? AND session=? AND page=?",
+                    (ministry, lok_sabha, session, page),
+                )
+
+    def page_abandoned(self, ministry: str, lok_sabha: int, session: int, page: int) -> bool:
+        rows = self._execute(
+            """
+            SELECT 1 FROM failed_pages
+            WHERE ministry=? AND lok_sabha=? AND session=? AND page=? AND status=?
+            """,
+            (ministry, lok_sabha, session, page, ABANDONED),
+        )
+        return bool(rows)
+
+    def mark_page_failed(
+        self, ministry: str, lok_sabha: int, session: int, page: int, error: str = None
+    ) -> str:
+        """Record a listing page that could not be fetched; the listing stays open for --resume."""
+        rows = self._execute(
+            "SELECT attempts FROM failed_pages WHERE ministry=? AND lok_sabha=? AND session=? AND page=?",
+            (ministry, lok_sabha, session, page),
+        )
+        attempts = (rows[0][0] if rows else 0) + 1
+        status = ABANDONED if attempts >= Config.CRAWL_MAX_ATTEMPTS else FAILED
+
+        self._execute(
+            "INSERT OR REPLACE INTO failed_pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (ministry, lok_sabha, session, page, status, attempts, error, datetime.now().isoformat()),
+        )
+        return status
+
+    def listing_done(self, ministry: str, lok_sabha: int, session: int) -> bool:
+        rows = self._execute(
+            "SELECT 1 FROM listings WHERE ministry=? AND lok_sabha=? AND session=?",
+            (ministry, lok_sabha, session),
+        )
+        return bool(rows)
+
+    def mark_listing_done(self, ministry: str, lok_sabha: int, session: int, last_page: int):
+        self._execute(
+            "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?)",
+            (ministry, lok_sabha, session, last_page, datetime.now().isoformat()),
+        )
+
+    def download_status(self, url: str) -> Optional[str]:
+        rows = self._execute("SELECT status FROM downloads WHERE url=?", (url,))
+        return rows[0][0] if rows else None
+
+    def mark_download_done(self, url: str, ministry: str, path: str):
+        self._execute(
+            """
+            INSERT INTO downloads (url, ministry, status, attempts, path, updated_at)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+                status=excluded.status, attempts=attempts + 1, path=excluded.path,
+                next_attempt_at=NULL, last_error=NULL, updated_at=excluded.updated_at
+            """,
+            (url, ministry, DONE, path, datetime.now().isoformat()),
+        )
+
+    def mark_download_failed(
+        self, url: str, ministry: str, error: str = None, metadata: Dict[str, Any] = None
+    ) -> str:
+        rows = self._execute("SELECT attempts FROM downloads WHERE url=?", (url,))
+        attempts = (rows[0][0] if rows else 0) + 1
+
+        # Exponential backoff that survives restarts, capped and eventually given up
+        if attempts >= Config.CRAWL_MAX_ATTEMPTS:
+            status, next_attempt_at = ABANDONED, None
+        else:
+            status = FAILED
+            delay = min(
+                Config.CRAWL_RETRY_BASE_DELAY * (2 ** (attempts - 1)),
+                Config.CRAWL_RETRY_MAX_DELAY,
+            )
+            next_attempt_at = time.time() + delay
+
+        self._execute(
+            """
+            INSERT OR REPLACE INTO downloads
+                (url, ministry, status, attempts, next_attempt_at, last_error, path,
+                 metadata, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)
+            """,
+            (
+                url,
+                ministry,
+                status,
+                attempts,
+                next_attempt_at,
+                error,
+                json.dumps(metadata) if metadata else None,
+                datetime.now().isoformat(),
+            ),
+        )
+        return status
+
+    def due_retries(self, now: float = None) -> List[Dict[str, Any]]:
+        rows = self._execute(
+            """
+            SELECT url, ministry, attempts, metadata FROM downloads
+            WHERE status=? AND next_attempt_at <= ?
+            ORDER BY next_attempt_at
+            """,
+            (FAILED, now or time.time()),
+        )
+        return [
+            {
+                "url": url,
+                "ministry": ministry,
+                "attempts": attempts,
+                "metadata": json.loads(metadata) if metadata else {},
+            }
+            for url, ministry, attempts, metadata in rows
+        ]
+
+    def summary(self) -> Dict[str, int]:
+        counts = {DONE: 0, FAILED: 0, ABANDONED: 0}
+        for status, count in self._execute(
+            "SELECT status, COUNT(*) FROM downloads GROUP BY status"
+        ):
+            counts[status] = count
+        counts["pages"] = self._execute("SELECT COUNT(*) FROM pages")[0][0]
+        counts["failed_pages"] = self._execute("SELECT COUNT(*) FROM failed_pages")[0][0]
+        counts["listings"] = self._execute("SELECT COUNT(*) FROM listings")[0][0]
+        return counts
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Set, Tuple
+from .config import Config
+from .sansad_client import SansadClient
+from .document_processor import DocumentProcessor
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class SyncError(Exception):
+    pass
+
+
+def question_number(question: Dict[str, Any]) -> int:
+    match = re.search(r"\d+", str(question.get("question_no", "")))
+    return int(match.group()) if match else 0
+
+
+def pending_attempts(watermark: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    pending = (watermark or {}).get("pending") or {}
+    # Older state files kept a plain list of question numbers
+    if isinstance(pending, list):
+        pending = dict.fromkeys(pending, 0)
+    return dict(pending)
+
+
+class DeltaSync:
+    def __init__(
+        self,
+        sansad_client: SansadClient = None,
+        doc_processor: DocumentProcessor = None,
+        vector_store: VectorStore = None,
+    ):
+        self.sansad_client = sansad_client or SansadClient()
+        self.doc_processor = doc_processor or DocumentProcessor()
+        self.vector_store = vector_store or VectorStore()
+        self.state_path = Path(Config.SYNC_STATE_PATH)
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            if self.state_path.exists():
+                with open(self.state_path, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Error loading sync state: {e}")
+        return {"watermarks": {}}
+
+    def _save_state(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.error(f"Error saving sync state: {e}")
+
+    @staticmethod
+    def _key(ministry: str, lok_sabha: int, session: int) -> str:
+        return f"{lok_sabha}:{session}:{ministry}"
+
+    def get_watermark(
+        self, ministry: str, lok_sabha: int = None, session: int = None
+    ) -> Optional[Dict[str, Any]]:
+        key = self._key(
+            ministry,
+            lok_sabha or Config.DEFAULT_LOK_SABHA,
+            session or Config.DEFAULT_SESSION,
+        )
+        return self.state["watermarks"].get(key)
+
+    async def _fetch_new_questions(
+        self, ministry: str, watermark: Optional[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], Set[str]]:
+        """New and pending questions, plus the pending numbers the listing no longer has."""
+        seen_number = watermark["question_no"] if watermark else 0
+        outstanding = set(pending_attempts(watermark))
+        missing = set()
+        new_questions = []
+        page = 1
+
+        while page <= Config.DELTA_SYNC_MAX_PAGES:
+            # The open session's pages change as questions are answered, so never
+            # trust the cache's freshness window here
+            questions = await self.sansad_client.fetch_questions(
+                ministry=ministry, page=page, revalidate=True
+            )
+            if questions is None:
+                raise SyncError(f"Could not fetch page {page} of the {ministry} listing")
+            if not questions:
+                break
+
+            fresh = [
+                q
+                for q in questions
+                if question_number(q) > seen_number or str(question_number(q)) in outstanding
+            ]
+            new_questions.extend(fresh)
+            outstanding -= {str(question_number(q)) for q in fresh}
+
+            # The listing is newest first, so a pending question numbered above this
+            # page's lowest would have shown up by now
+            lowest = min(question_number(q) for q in questions)
+            passed = {number for number in outstanding if int(number) >= lowest}
+            missing |= passed
+            outstanding -= passed
+
+            # Stop at the first page made up entirely of already-seen questions
+            if (
+                seen_number
+                and not outstanding
+                and not any(question_number(q) > seen_number for q in questions)
+            ):
+                break
+
+            page += 1
+
+        return new_questions, missing | outstanding
+
+    def _write_sidecar(self, pdf_path: str, metadata: Dict[str, Any]):
+        json_path = os.path.splitext(pdf_path)[0] + ".json"
+        try:
+            with open(json_path, "w") as f:
+                json.dump(metadata, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Error writing metadata for {pdf_path}: {e}")
+
+    async def _index_question(self, question: Dict[str, Any], ministry: str) -> bool:
+        pdf_path = await self.sansad_client.download_pdf(question.get("pdf_url"))
+        if not pdf_path:
+            return False
+
+        filename = os.path.basename(pdf_path)
+        if self.vector_store.has_source(filename, ministry):
+            logger.info(f"{filename} already indexed, skipping")
+            return True
+
+        metadata = {
+            "ministry": ministry,
+            "question_no": str(question.get("question_no", "")),
+            "subject": question.get("subject", ""),
+            "date": question.get("date") or "Unknown",
+            "session": str(question.get("session") or Config.DEFAULT_SESSION),
+            "lok_sabha": str(Config.DEFAULT_LOK_SABHA),
+            "pdf_url": question.get("pdf_url", ""),
+        }
+        self._write_sidecar(pdf_path, metadata)
+
+        documents = self.doc_processor.process_pdf(pdf_path, metadata)
+        if not documents:
+            return False
+
+        self.vector_store.add_documents(documents, ministry=ministry)
+        return True
+
+    async def sync_ministry(self, ministry: str) -> Dict[str, int]:
+        key = self._key(ministry, Config.DEFAULT_LOK_SABHA, Config.DEFAULT_SESSION)
+        watermark = self.state["watermarks"].get(key)
+        pending = pending_attempts(watermark)
+
+        # A failed fetch raises before the watermark or its pending retries are touched
+        new_questions, missing = await self._fetch_new_questions(ministry, watermark)
+        stats = {"new_questions": len(new_questions), "indexed": 0, "failed": 0}
+
+        highest = watermark["question_no"] if watermark else 0
+        latest_date = watermark.get("date") if watermark else None
+        retries = {}
+
+        def retry_later(number: str):
+            attempts = pending.get(number, 0) + 1
+            if attempts >= Config.DELTA_SYNC_MAX_ATTEMPTS:
+                logger.warning(
+                    f"Giving up on question {number} for {ministry} after {attempts} attempts"
+                )
+            else:
+                retries[number] = attempts
+
+        for number in missing:
+            retry_later(number)
+
+        with self.vector_store.deferred_partition_refresh():
+            for question in new_questions:
+                number = question_number(question)
+                try:
+                    indexed = await self._index_question(question, ministry)
+                except Exception as e:
+                    logger.error(f"Error indexing question {number} for {ministry}: {e}")
+                    indexed = False
+
+                if indexed:
+                    stats["indexed"] += 1
+                    if number > highest:
+                        highest = number
+                        latest_date = question.get("date") or latest_date
+                else:
+                    stats["failed"] += 1
+                    retry_later(str(number))
+
+        if not new_questions and retries == pending:
+            logger.info(f"{ministry}: up to date")
+            return stats
+
+        # Failed questions stay pending so the next run retries them
+        self.state["watermarks"][key] = {
+            "question_no": highest,
+            "date": latest_date,
+            "pending": retries,
+            "updated_at": datetime.now().isoformat(),
+        }
+        self._save_state()
+
+        logger.info(
+            f"{ministry}: {stats['indexed']} new answers indexed, {stats['failed']} failed"
+        )
+        return stats
+
+    async def sync_all(self, ministries: List[str] = None) -> Dict[str, int]:
+        totals = {"new_questions": 0, "indexed": 0, "failed": 0, "errors": 0}
+
+        for ministry in ministries or Config.MINISTRIES:
+            try:
+                stats = await self.sync_ministry(ministry)
+                for name, value in stats.items():
+                    totals[name] += value
+            except Exception as e:
+                logger.error(f"Error syncing {ministry}: {e}")
+                totals["errors"] += 1
+
+        logger.info(
+            f"Delta sync complete: {totals['indexed']} new answers indexed, "
+            f"{totals['failed']} failed, {totals['errors']} ministries not synced"
+        )
+        return totals
@@ -8,23 +8,29 @@ from datetime import datetime
 from langchain_community.document_loaders import PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from .config import Config
+from .metadata_fields import typed_metadata
+from .pdf_catalog import ChunkRecord, PdfRecord
+from .token_splitter import get_token_splitter
 
 logger = logging.getLogger(__name__)
 
 
 class DocumentProcessor:
     def __init__(self):
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=Config.CHUNK_SIZE,
-            chunk_overlap=Config.CHUNK_OVERLAP,
-            length_function=len,
-        )
+        if Config.CHUNKING_STRATEGY == "tokens":
+            self.text_splitter = get_token_splitter()
+        else:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=Config.CHUNK_SIZE,
+                chunk_overlap=Config.CHUNK_OVERLAP,
+                length_function=len,
+            )
 
         self.processed_pdfs = set()
 
     def process_pdf(
         self, pdf_path: str, metadata: Dict[str, Any] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[ChunkRecord]:
         try:
             logger.info(f"Processing PDF: {pdf_path}")
 
@@ -33,8 +39,10 @@ class DocumentProcessor:
                 return []
 
             pdf_name = os.path.basename(pdf_path)
-            if pdf_name in self.processed_pdfs:
-                logger.info(f"PDF already processed: {pdf_name}")
+            # Redistributed PDFs share a name across ministry directories
+            pdf_key = os.path.abspath(pdf_path)
+            if pdf_key in self.processed_pdfs:
+                logger.info(f"PDF already processed: {pdf_path}")
                 return []
 
             loader = PyPDFLoader(pdf_path)
@@ -52,8 +60,6 @@ class DocumentProcessor:
 
             text_chunks = self.text_splitter.split_text(full_text)
 
-            documents = []
-
             if not metadata:
                 metadata = {}
                 json_path = os.path.splitext(pdf_path)[0] + ".json"
@@ -64,30 +70,24 @@ class DocumentProcessor:
                     except Exception as e:
                         logger.error(f"Error loading metadata from {json_path}: {e}")
 
-            for i, chunk in enumerate(text_chunks):
-                if not chunk.strip():
-                    continue
-
-                doc_id = self._generate_document_id(pdf_path, i)
-
-                doc = {
-                    "id": doc_id,
-                    "text": chunk.strip(),
-                    "metadata": {
-                        **(metadata or {}),
-                        "chunk_index": i,
-                        "total_chunks": len(text_chunks),
-                        "source": pdf_path,
-                        "filename": os.path.basename(pdf_path),
-                        "processed_at": datetime.now().isoformat(),
-                    },
-                    "distance": 0.0,
-                    "relevance_score": 0.0,
-                }
+            # Range filters compare integers, so normalize the sidecar's strings once per PDF
+            pdf = PdfRecord(
+                filename=pdf_name,
+                source=pdf_path,
+                metadata=dict(metadata or {}),
+                filter_fields=typed_metadata(metadata or {}),
+                total_chunks=len(text_chunks),
+                processed_at=datetime.now().isoformat(),
+            )
 
-                documents.append(doc)
+            # Chunks share one PdfRecord instead of each carrying a copy of its metadata
+            documents = [
+                ChunkRecord(self._generate_document_id(pdf_path, i), chunk.strip(), i, pdf)
+                for i, chunk in enumerate(text_chunks)
+                if chunk.strip()
+            ]
 
-            self.processed_pdfs.add(pdf_name)
+            self.processed_pdfs.add(pdf_key)
 
             logger.info(
                 f"Successfully processed {pdf_path} into {len(documents)} chunks"
@@ -102,7 +102,29 @@ class DocumentProcessor:
         content = f"{pdf_path}_{chunk_index}_{datetime.now().timestamp()}"
         return hashlib.md5(content.encode()).hexdigest()
 
-    def process_ministry_pdfs(self, ministry: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def ministry_pdf_metadata(ministry: str, pdf_path: Path) -> Dict[str, Any]:
+        pdf_path = Path(pdf_path)
+        metadata = {
+            "ministry": ministry,
+            "date": "Unknown",
+            "session": str(Config.DEFAULT_SESSION),
+            "lok_sabha": str(Config.DEFAULT_LOK_SABHA),
+            "pdf_url": f"/data/ministry_pdfs/{Config.sanitize_ministry_name(ministry)}/{pdf_path.name}",
+        }
+
+        json_path = pdf_path.with_suffix(".json")
+        if json_path.exists():
+            try:
+                with open(json_path, "r") as f:
+                    file_metadata = json.load(f)
+                    metadata.update(file_metadata)
+            except Exception as e:
+                logger.error(f"Error loading metadata from {json_path}: {e}")
+
+        return metadata
+
+    def process_ministry_pdfs(self, ministry: str) -> List[ChunkRecord]:
         try:
             logger.info(f"Processing PDFs for ministry: {ministry}")
 
@@ -123,22 +145,7 @@ class DocumentProcessor:
             all_documents = []
 
             for pdf_path in pdf_files:
-                metadata = {
-                    "ministry": ministry,
-                    "date": "Unknown",
-                    "session": str(Config.DEFAULT_SESSION),
-                    "pdf_url": f"/data/ministry_pdfs/{Config.sanitize_ministry_name(ministry)}/{pdf_path.name}",
-                }
-
-                json_path = pdf_path.with_suffix(".json")
-                if json_path.exists():
-                    try:
-                        with open(json_path, "r") as f:
-                            file_metadata = json.load(f)
-                            metadata.update(file_metadata)
-                    except Exception as e:
-                        logger.error(f"Error loading metadata from {json_path}: {e}")
-
+                metadata = self.ministry_pdf_metadata(ministry, pdf_path)
                 documents = self.process_pdf(str(pdf_path), metadata)
 
                 if documents:
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+from typing import Callable, List
+from aiohttp import web
+from .config import Config
+from .metrics import observe_stage, record_batch_size
+
+logger = logging.getLogger(__name__)
+
+Embeddings = List[List[float]]
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text embedding calls into batched forward passes.
+
+    The first request in a batch waits at most ``max_wait`` seconds for others
+    to join, so a lone query pays only that delay while concurrent ones share
+    one pass through the encoder.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], Embeddings],
+        max_batch_size: int = None,
+        max_wait: float = None,
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size or Config.EMBEDDING_BATCH_MAX_SIZE
+        self.max_wait = Config.EMBEDDING_BATCH_MAX_WAIT if max_wait is None else max_wait
+
+        self._pending = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        future = Future()
+        self._pending.put((text, future, time.perf_counter()))
+        return future
+
+    def __call__(self, input: List[str]) -> Embeddings:
+        futures = [self.submit(text) for text in input]
+        return [future.result() for future in futures]
+
+    def _collect(self):
+        batch = [self._pending.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._pending.get(timeout=remaining))
+                else:
+                    # Past the deadline, still take whatever is already waiting
+                    batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for text, _, _ in batch]
+
+            observe_stage("embedding_batch_wait", time.perf_counter() - batch[0][2])
+            record_batch_size("embedding", len(batch))
+
+            try:
+                embeddings = self.embed_fn(texts)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), embedding in zip(batch, embeddings):
+                future.set_result(list(embedding))
+
+
+class RemoteEmbeddingFunction:
+    """Embeds through a shared embedding sidecar instead of a local encoder."""
+
+    def __init__(self, url: str = None, timeout: float = None):
+        self.url = (url or Config.EMBEDDING_SERVICE_URL).rstrip("/") + "/embed"
+        self.timeout = timeout or Config.TIMEOUT
+
+    def __call__(self, input: List[str]) -> Embeddings:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"texts": list(input)}).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)["embeddings"]
+
+
+BATCHER = web.AppKey("batcher", EmbeddingBatcher)
+
+
+async def _embed(request: web.Request) -> web.Response:
+    body = await request.json()
+    texts = body.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        raise web.HTTPBadRequest(text="'texts' must be a list of strings")
+
+    # Each text joins the shared batch, so requests from different app workers coalesce
+    batcher = request.app[BATCHER]
+    embeddings = await asyncio.gather(
+        *(asyncio.wrap_future(batcher.submit(text)) for text in texts)
+    )
+    return web.json_response({"embeddings": embeddings})
+
+
+async def _health(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "model": Config.EMBEDDING_MODEL})
+
+
+def create_embedding_app(batcher: EmbeddingBatcher = None) -> web.Application:
+    if batcher is None:
+        from chromadb.utils import embedding_functions
+
+        batcher = EmbeddingBatcher(
+            embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=Config.EMBEDDING_MODEL
+            )
+        )
+
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app[BATCHER] = batcher
+    app.router.add_post("/embed", _embed)
+    app.router.add_get("/healthz", _health)
+    return app
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tarfile
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_NAME = "snapshot_manifest.json"
+# The backup API already folds committed WAL pages into the copy
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm", "-journal")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def index_config() -> Dict[str, Any]:
+    return {
+        "embedding_model": Config.EMBEDDING_MODEL,
+        "chunking_strategy": Config.CHUNKING_STRATEGY,
+        "chunk_token_size": Config.CHUNK_TOKEN_SIZE,
+        "chunk_token_overlap": Config.CHUNK_TOKEN_OVERLAP,
+        "chunk_size": Config.CHUNK_SIZE,
+        "chunk_overlap": Config.CHUNK_OVERLAP,
+    }
+
+
+def _copy_consistent(source: Path, target: Path):
+    # A plain copy of a live SQLite file can be torn; use the backup API instead
+    if source.suffix in (".sqlite3", ".sqlite", ".db"):
+        with sqlite3.connect(str(source)) as src, sqlite3.connect(str(target)) as dst:
+            src.backup(dst)
+    else:
+        shutil.copy2(source, target)
+
+
+def export_snapshot(output_path: Path = None, source_dir: Path = None) -> Path:
+    source_dir = Path(source_dir or Config.VECTOR_DB_DIR)
+    if not source_dir.exists() or not any(source_dir.iterdir()):
+        raise SnapshotError(f"Nothing to snapshot in {source_dir}")
+
+    created_at = datetime.now()
+    output_path = Path(
+        output_path
+        or Config.SNAPSHOT_DIR
+        / f"index_snapshot_v{SNAPSHOT_FORMAT_VERSION}_{created_at.strftime('%Y%m%d_%H%M%S')}.tar.gz"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(dir=output_path.parent) as staging:
+        staging = Path(staging)
+        files = {}
+
+        for path in sorted(source_dir.rglob("*")):
+            if not path.is_file() or path.name == MANIFEST_NAME:
+                continue
+            if path.name.endswith(SQLITE_SIDECAR_SUFFIXES):
+                continue
+
+            relative = path.relative_to(source_dir)
+            target = staging / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _copy_consistent(path, target)
+            files[str(relative)] = {"sha256": _sha256(target), "size": target.stat().st_size}
+
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "snapshot_id": hashlib.sha256(
+                json.dumps(files, sort_keys=True).encode()
+            ).hexdigest()[:16],
+            "created_at": created_at.isoformat(),
+            "created_by": Config.CURRENT_USER,
+            "index_config": index_config(),
+            "hnsw": Config.hnsw_metadata(),
+            "files": files,
+        }
+        with open(staging / MANIFEST_NAME, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        with tarfile.open(output_path, "w:gz", compresslevel=6) as archive:
+            for path in sorted(staging.rglob("*")):
+                if path.is_file():
+                    archive.add(path, arcname=str(path.relative_to(staging)))
+
+    checksum = _sha256(output_path)
+    output_path.with_name(output_path.name + ".sha256").write_text(
+        f"{checksum}  {output_path.name}\n"
+    )
+
+    logger.info(
+        f"Exported snapshot {manifest['snapshot_id']} with {len(files)} files to {output_path}"
+    )
+    return output_path
+
+
+def read_manifest(snapshot_path: Path) -> Dict[str, Any]:
+    with tarfile.open(snapshot_path, "r:*") as archive:
+        member = archive.extractfile(MANIFEST_NAME)
+        if member is None:
+            raise SnapshotError(f"{snapshot_path} has no manifest")
+        return json.load(member)
+
+
+def verify_snapshot(snapshot_path: Path) -> Dict[str, Any]:
+    snapshot_path = Path(snapshot_path)
+    checksum_path = snapshot_path.with_name(snapshot_path.name + ".sha256")
+
+    if checksum_path.exists():
+        expected = checksum_path.read_text().split()[0]
+        if _sha256(snapshot_path) != expected:
+            raise SnapshotError(f"Checksum mismatch for {snapshot_path}")
+
+    manifest = read_manifest(snapshot_path)
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot format {manifest.get('format_version')}"
+        )
+
+    mismatched = {
+        key: (value, manifest["index_config"].get(key))
+        for key, value in index_config().items()
+        if manifest["index_config"].get(key) != value
+    }
+    if mismatched:
+        details = ", ".join(
+            f"{key}: running {ours!r}, snapshot {theirs!r}"
+            for key, (ours, theirs) in mismatched.items()
+        )
+        raise SnapshotError(f"Snapshot was built with a different configuration ({details})")
+
+    return manifest
+
+
+def installed_snapshot_id(target_dir: Path = None) -> Optional[str]:
+    manifest_path = Path(target_dir or Config.VECTOR_DB_DIR) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path) as f:
+            return json.load(f).get("snapshot_id")
+    except Exception:
+        return None
+
+
+def restore_snapshot(snapshot_path: Path, target_dir: Path = None) -> Dict[str, Any]:
+    snapshot_path = Path(snapshot_path)
+    target_dir = Path(target_dir or Config.VECTOR_DB_DIR)
+    manifest = verify_snapshot(snapshot_path)
+
+    target_dir.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".snapshot_", dir=target_dir.parent))
+
+    try:
+        with tarfile.open(snapshot_path, "r:*") as archive:
+            for member in archive.getmembers():
+                destination = (staging / member.name).resolve()
+                if not member.isfile() or staging.resolve() not in destination.parents:
+                    raise SnapshotError(f"Unexpected entry in snapshot: {member.name}")
+            archive.extractall(staging)
+
+        for relative, expected in manifest["files"].items():
+            if _sha256(staging / relative) != expected["sha256"]:
+                raise SnapshotError(f"Checksum mismatch for {relative} in snapshot")
+
+        backup = None
+        if target_dir.exists():
+            backup = target_dir.with_name(target_dir.name + ".previous")
+            shutil.rmtree(backup, ignore_errors=True)
+            os.replace(target_dir, backup)
+
+        os.replace(staging, target_dir)
+
+        if backup:
+            shutil.rmtree(backup, ignore_errors=True)
+
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    logger.info(f"Restored snapshot {manifest['snapshot_id']} into {target_dir}")
+    return manifest
+
+
+def restore_if_needed(snapshot_path: Path = None) -> bool:
+    snapshot_path = Path(snapshot_path or Config.INDEX_SNAPSHOT_PATH)
+
+    if not snapshot_path.exists():
+        logger.info(f"No index snapshot at {snapshot_path}")
+        return False
+
+    manifest = read_manifest(snapshot_path)
+    if installed_snapshot_id() == manifest.get("snapshot_id"):
+        logger.info(f"Snapshot {manifest.get('snapshot_id')} already installed")
+        return False
+
+    restore_snapshot(snapshot_path)
+    return True
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+from .config import Config
+from .document_processor import DocumentProcessor
+from .pdf_catalog import ChunkRecord
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def _init_parse_worker():
+    global _worker_processor
+    _worker_processor = DocumentProcessor()
+
+
+def _parse_pdf(pdf_path: str, metadata: Dict[str, Any]) -> List[ChunkRecord]:
+    return _worker_processor.process_pdf(pdf_path, metadata)
+
+
+class IngestPipeline:
+    """Parse and index PDFs while the crawler is still downloading.
+
+    Downloaded PDFs go onto a bounded parse queue served by a process pool,
+    and parsed chunks go onto a bounded index queue drained by a single
+    writer. A full queue blocks the stage feeding it, so a slow stage
+    throttles the ones upstream instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore = None,
+        parse_workers: int = None,
+        parse_queue_size: int = None,
+        index_queue_size: int = None,
+        index_batch_size: int = None,
+    ):
+        self.vector_store = vector_store or VectorStore()
+        self.parse_workers = parse_workers or Config.INGEST_PARSE_WORKERS
+        self.index_batch_size = index_batch_size or Config.INGEST_INDEX_BATCH_SIZE
+
+        self.parse_queue = asyncio.Queue(parse_queue_size or Config.INGEST_PARSE_QUEUE_SIZE)
+        self.index_queue = asyncio.Queue(index_queue_size or Config.INGEST_INDEX_QUEUE_SIZE)
+
+        self.pool = None
+        self._parse_tasks = []
+        self._index_task = None
+
+        self.stats = {
+            "submitted": 0,
+            "parsed": 0,
+            "failed": 0,
+            "chunks_indexed": 0,
+            "parse_seconds": 0.0,
+            "index_seconds": 0.0,
+            "submit_wait_seconds": 0.0,
+        }
+
+    async def start(self):
+        # spawn keeps torch and chroma state in the parent out of the workers
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parse_worker,
+        )
+        self._parse_tasks = [
+            asyncio.create_task(self._parse_loop()) for _ in range(self.parse_workers)
+        ]
+        self._index_task = asyncio.create_task(self._index_loop())
+        logger.info(f"Ingest pipeline started with {self.parse_workers} parse workers")
+        return self
+
+    async def submit(self, pdf_path: str, metadata: Dict[str, Any]):
+        start = time.perf_counter()
+        await self.parse_queue.put((pdf_path, metadata))
+        self.stats["submit_wait_seconds"] += time.perf_counter() - start
+        self.stats["submitted"] += 1
+
+    async def _parse_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await self.parse_queue.get()
+            if item is None:
+                return
+
+            pdf_path, metadata = item
+            start = time.perf_counter()
+            try:
+                documents = await loop.run_in_executor(
+                    self.pool, _parse_pdf, pdf_path, metadata
+                )
+            except Exception as e:
+                logger.error(f"Error parsing {pdf_path}: {e}")
+                documents = []
+            self.stats["parse_seconds"] += time.perf_counter() - start
+
+            if not documents:
+                self.stats["failed"] += 1
+                continue
+
+            self.stats["parsed"] += 1
+            await self.index_queue.put((metadata.get("ministry"), documents))
+
+    async def _flush(self, pending: Dict[str, List[ChunkRecord]]):
+        for ministry, documents in pending.items():
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(
+                    self.vector_store.add_documents, documents, ministry=ministry
+                )
+                self.stats["chunks_indexed"] += len(documents)
+            except Exception as e:
+                logger.error(f"Error indexing {len(documents)} chunks for {ministry}: {e}")
+                self.stats["failed"] += 1
+            self.stats["index_seconds"] += time.perf_counter() - start
+        pending.clear()
+
+    async def _index_loop(self):
+        pending = defaultdict(list)
+        buffered = 0
+
+        # Partitions are rewritten once at the end of the run, not after every flush
+        with self.vector_store.deferred_partition_refresh():
+            while True:
+                item = await self.index_queue.get()
+                if item is None:
+                    await self._flush(pending)
+                    await asyncio.to_thread(self.vector_store.refresh_dirty_partitions)
+                    return
+
+                ministry, documents = item
+                pending[ministry].extend(documents)
+                buffered += len(documents)
+
+                # Batch across PDFs for embedding throughput, but never wait on an empty queue
+                if buffered >= self.index_batch_size or self.index_queue.empty():
+                    await self._flush(pending)
+                    buffered = 0
+
+    async def close(self) -> Dict[str, Any]:
+        for _ in self._parse_tasks:
+            await self.parse_queue.put(None)
+        await asyncio.gather(*self._parse_tasks)
+
+        await self.index_queue.put(None)
+        await self._index_task
+
+        self.pool.shutdown()
+        logger.info(f"Ingest pipeline finished: {self.stats}")
+        return self.stats
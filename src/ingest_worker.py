@@ -0,0 +1,164 @@
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Callable
+from .config import Config
+from .document_processor import DocumentProcessor
+from .job_queue import JobQueue
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+INDEX_PDFS = "index_pdfs"
+REEMBED_MINISTRY = "reembed_ministry"
+
+
+def limit_resources(nice: int = None, threads: int = None):
+    nice = Config.INGEST_WORKER_NICE if nice is None else nice
+    threads = threads or Config.INGEST_WORKER_THREADS
+
+    if nice and hasattr(os, "nice"):
+        try:
+            os.nice(nice)
+        except OSError as e:
+            logger.warning(f"Could not lower worker priority: {e}")
+
+    # Embedding runs in torch, which otherwise grabs every core
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+class IngestWorker:
+    def __init__(
+        self,
+        queue: JobQueue = None,
+        vector_store: VectorStore = None,
+        cpu_budget: float = None,
+    ):
+        self.queue = queue or JobQueue()
+        self.vector_store = vector_store or VectorStore()
+        self.cpu_budget = min(1.0, max(0.05, cpu_budget or Config.INGEST_WORKER_CPU_BUDGET))
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            INDEX_PDFS: self.index_pdfs,
+            REEMBED_MINISTRY: self.reembed_ministry,
+        }
+
+    @contextmanager
+    def _heartbeating(self, job_id: int):
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(Config.JOB_HEARTBEAT_INTERVAL):
+                try:
+                    self.queue.heartbeat(job_id)
+                except Exception as e:
+                    logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+
+        thread = threading.Thread(target=beat, name=f"job-{job_id}-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _pace(self, busy_seconds: float):
+        # Duty cycle: after working for t seconds, rest long enough to average out at the budget
+        if self.cpu_budget < 1.0:
+            time.sleep(busy_seconds * (1.0 - self.cpu_budget) / self.cpu_budget)
+
+    def _index_pdf(self, processor: DocumentProcessor, pdf_path: Path, metadata: Dict[str, Any]) -> int:
+        documents = processor.process_pdf(str(pdf_path), metadata)
+        if documents:
+            self.vector_store.add_documents(documents, ministry=metadata["ministry"])
+        return len(documents)
+
+    def index_pdfs(self, job: Dict[str, Any]):
+        payload = job["payload"]
+        paths = [Path(path) for path in payload.get("paths", [])]
+        processor = DocumentProcessor()
+        chunks = 0
+
+        for done, pdf_path in enumerate(paths, start=1):
+            start = time.perf_counter()
+
+            if not pdf_path.exists():
+                logger.warning(f"Skipping missing PDF {pdf_path}")
+            else:
+                # The sidecar can override the ministry, so check under the one it is indexed as
+                metadata = processor.ministry_pdf_metadata(
+                    payload.get("ministry") or "Unknown Ministry", pdf_path
+                )
+                if self.vector_store.has_source(pdf_path.name, metadata["ministry"]):
+                    logger.info(f"{pdf_path.name} already indexed, skipping")
+                else:
+                    chunks += self._index_pdf(processor, pdf_path, metadata)
+
+            self.queue.heartbeat(job["id"], done, len(paths), f"{chunks} chunks indexed")
+            self._pace(time.perf_counter() - start)
+
+    def reembed_ministry(self, job: Dict[str, Any]):
+        ministry = job["payload"]["ministry"]
+        pdf_files = sorted(Config.get_ministry_dir(ministry).glob("*.pdf"))
+        if not pdf_files:
+            raise ValueError(f"No PDFs found for ministry: {ministry}")
+
+        # Build the replacement chunks first so the ministry stays searchable throughout
+        old_ids = self.vector_store.ids_for_ministry(ministry)
+        processor = DocumentProcessor()
+        chunks = 0
+
+        for done, pdf_path in enumerate(pdf_files, start=1):
+            start = time.perf_counter()
+            chunks += self._index_pdf(
+                processor, pdf_path, processor.ministry_pdf_metadata(ministry, pdf_path)
+            )
+            self.queue.heartbeat(job["id"], done, len(pdf_files), f"{chunks} chunks re-embedded")
+            self._pace(time.perf_counter() - start)
+
+        self.vector_store.delete_ids(old_ids)
+        logger.info(f"Re-embedded {ministry}: {chunks} chunks replaced {len(old_ids)}")
+
+    def run_job(self, job: Dict[str, Any]) -> bool:
+        handler = self.handlers.get(job["kind"])
+        logger.info(f"Running {job['kind']} job {job['id']} (attempt {job['attempts']})")
+
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            # Partitions are rewritten once per job, not once per PDF
+            with self._heartbeating(job["id"]), self.vector_store.deferred_partition_refresh():
+                handler(job)
+        except Exception as e:
+            self.queue.fail(job["id"], str(e))
+            return False
+
+        self.queue.complete(job["id"])
+        logger.info(f"Finished {job['kind']} job {job['id']}")
+        return True
+
+    def run(self, once: bool = False, poll_interval: float = None):
+        poll_interval = poll_interval or Config.JOB_POLL_INTERVAL
+        logger.info(f"Ingest worker {self.worker_id} started (CPU budget {self.cpu_budget:.0%})")
+
+        while True:
+            self.queue.requeue_stale()
+            job = self.queue.claim(self.worker_id)
+
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            self.run_job(job)
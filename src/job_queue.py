@@ -0,0 +1,235 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    not_before REAL NOT NULL,
+    progress_done INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER NOT NULL DEFAULT 0,
+    progress_note TEXT,
+    error TEXT,
+    worker TEXT,
+    heartbeat_at REAL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, not_before);
+"""
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 5
+PRIORITY_HIGH = 10
+
+
+class JobQueue:
+    """SQLite-backed queue of ingestion jobs shared by producers and workers.
+
+    Higher priority jobs are claimed first, failed jobs are retried with
+    exponential backoff, and jobs whose worker stopped heartbeating are
+    handed back to the queue.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or Config.JOB_QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any] = None,
+        priority: int = PRIORITY_NORMAL,
+        max_attempts: int = None,
+    ) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO jobs (kind, payload, priority, status, max_attempts, not_before, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    kind,
+                    json.dumps(payload or {}),
+                    priority,
+                    QUEUED,
+                    max_attempts or Config.JOB_MAX_ATTEMPTS,
+                    time.time(),
+                    datetime.now().isoformat(),
+                ),
+            )
+            job_id = cursor.lastrowid
+
+        logger.info(f"Enqueued {kind} job {job_id} with priority {priority}")
+        return job_id
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so two workers cannot claim the same row
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT * FROM jobs WHERE status=? AND not_before <= ?
+                    ORDER BY priority DESC, id LIMIT 1
+                    """,
+                    (QUEUED, now),
+                ).fetchone()
+
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET status=?, attempts=attempts + 1, worker=?, heartbeat_at=?,
+                        started_at=?, error=NULL
+                    WHERE id=?
+                    """,
+                    (RUNNING, worker, now, datetime.now().isoformat(), row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job = self._to_dict(row)
+        job["attempts"] += 1
+        job["status"] = RUNNING
+        return job
+
+    def heartbeat(self, job_id: int, done: int = None, total: int = None, note: str = None):
+        self._execute(
+            """
+            UPDATE jobs SET heartbeat_at=?,
+                progress_done=COALESCE(?, progress_done),
+                progress_total=COALESCE(?, progress_total),
+                progress_note=COALESCE(?, progress_note)
+            WHERE id=?
+            """,
+            (time.time(), done, total, note, job_id),
+        )
+
+    def complete(self, job_id: int):
+        self._execute(
+            "UPDATE jobs SET status=?, finished_at=? WHERE id=?",
+            (DONE, datetime.now().isoformat(), job_id),
+        )
+
+    def fail(self, job_id: int, error: str) -> str:
+        rows = self._execute("SELECT attempts, max_attempts FROM jobs WHERE id=?", (job_id,))
+        if not rows:
+            return FAILED
+
+        attempts, max_attempts = rows[0]["attempts"], rows[0]["max_attempts"]
+        if attempts >= max_attempts:
+            self._execute(
+                "UPDATE jobs SET status=?, error=?, finished_at=? WHERE id=?",
+                (FAILED, error, datetime.now().isoformat(), job_id),
+            )
+            logger.error(f"Job {job_id} failed permanently after {attempts} attempts: {error}")
+            return FAILED
+
+        delay = min(Config.JOB_RETRY_BASE_DELAY * (2 ** (attempts - 1)), Config.JOB_RETRY_MAX_DELAY)
+        self._execute(
+            "UPDATE jobs SET status=?, error=?, not_before=?, worker=NULL WHERE id=?",
+            (QUEUED, error, time.time() + delay, job_id),
+        )
+        logger.warning(f"Job {job_id} failed (attempt {attempts}), retrying in {delay}s: {error}")
+        return QUEUED
+
+    def requeue_stale(self, timeout: float = None) -> int:
+        """Hand back jobs whose worker stopped heartbeating.
+
+        The lost run already counted as an attempt when it was claimed, so a job
+        that keeps killing its worker fails once it reaches max_attempts.
+        """
+        cutoff = time.time() - (timeout or Config.JOB_STALE_TIMEOUT)
+        error = "worker stopped heartbeating"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                failed = self._conn.execute(
+                    """
+                    UPDATE jobs SET status=?, error=?, worker=NULL, finished_at=?
+                    WHERE status=? AND heartbeat_at < ? AND attempts >= max_attempts
+                    """,
+                    (FAILED, error, datetime.now().isoformat(), RUNNING, cutoff),
+                ).rowcount
+                requeued = self._conn.execute(
+                    "UPDATE jobs SET status=?, error=?, worker=NULL WHERE status=? AND heartbeat_at < ?",
+                    (QUEUED, error, RUNNING, cutoff),
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs abandoned by their worker")
+        if failed:
+            logger.error(f"Failed {failed} jobs that lost their worker on every attempt")
+        return requeued + failed
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._execute("SELECT * FROM jobs WHERE id=?", (job_id,))
+        return self._to_dict(rows[0]) if rows else None
+
+    def list_jobs(self, status: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        if status:
+            rows = self._execute(
+                "SELECT * FROM jobs WHERE status=? ORDER BY id DESC LIMIT ?", (status, limit)
+            )
+        else:
+            rows = self._execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [self._to_dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for row in self._execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
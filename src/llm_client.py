@@ -1,21 +1,46 @@
 import logging
 import google.generativeai as genai
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from collections import Counter
+from .admission import AdmissionController, AdmissionRejected
 from .config import Config
+from .metrics import (
+    observe_stage,
+    record_circuit_rejection,
+    record_error,
+    record_hedge,
+    track_stage,
+)
+from .profiler import profile_request, profiled_thread
+from .resilience import (
+    CallTracker,
+    CircuitBreaker,
+    CircuitOpen,
+    LatencyTracker,
+    UpstreamTimeout,
+    is_upstream_failure,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class LLMClient:
-    def __init__(self):
+    def __init__(self, model=None):
         try:
             genai.configure(api_key=Config.GEMINI_API_KEY)
 
-            self.model = genai.GenerativeModel("gemini-2.0-flash-exp")
+            self.model = model or genai.GenerativeModel("gemini-2.0-flash-exp")
 
-            self.executor = ThreadPoolExecutor(max_workers=1)
+            # Every call gets its own thread, so neither a hedge nor the next question
+            # queues behind a call that is stuck past its deadline
+            self.calls = CallTracker("gemini")
+            self.admission = AdmissionController(slots=Config.LLM_MAX_WORKERS)
+            self.breaker = CircuitBreaker("gemini")
+            self.latency = LatencyTracker()
+            self.hedges = Counter()
 
             logger.info("Successfully initialized LLM client")
         except Exception as e:
@@ -41,36 +66,195 @@ class LLMClient:
             )
 
     async def generate_response(
-        self, question: str, context: List[Dict[str, Any]], ministry: str
+        self, question: str, context: List[Dict[str, Any]], ministry: str, session_id: str = None
     ) -> str:
-        try:
-            prompt = self._construct_prompt(question, context, ministry)
+        with profile_request(ministry, stage_root="generate_response"):
+            try:
+                with track_stage("prompt_construction"):
+                    prompt = self._construct_prompt(question, context, ministry)
+
+                async with self.admission.slot(session_id):
+                    response = await self._generate_guarded(prompt)
+
+                if not response or not response.text:
+                    logger.warning("Empty response from LLM")
+                    return (
+                        "I apologize, but I couldn't generate a meaningful response. "
+                        "Please try rephrasing your question."
+                    )
 
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                self.executor, self._generate_content, prompt
-            )
+                formatted_response = self._format_response(response.text, context)
 
-            if not response or not response.text:
-                logger.warning("Empty response from LLM")
+                return formatted_response
+
+            except (AdmissionRejected, CircuitOpen, UpstreamTimeout) as e:
+                logger.warning(f"Answering retrieval-only: {e}")
+                return self.retrieval_only_answer(context)
+
+            except Exception as e:
+                logger.error(f"Error generating response: {e}")
                 return (
-                    "I apologize, but I couldn't generate a meaningful response. "
-                    "Please try rephrasing your question."
+                    "I apologize, but I encountered an error while generating the response. "
+                    "This might be due to connection issues or service limitations. "
+                    "Please try again with a simpler question or wait a moment before retrying."
                 )
 
-            formatted_response = self._format_response(response.text, context)
-
-            return formatted_response
+    async def generate_response_stream(
+        self, question: str, context: List[Dict[str, Any]], ministry: str, session_id: str = None
+    ) -> AsyncIterator[str]:
+        streamed = False
+        try:
+            async with self.admission.slot(session_id):
+                async for text in self._stream(question, context, ministry):
+                    streamed = True
+                    yield text
+        except (AdmissionRejected, CircuitOpen, UpstreamTimeout) as e:
+            if streamed:
+                raise
+            logger.warning(f"Answering retrieval-only: {e}")
+            yield self.retrieval_only_answer(context)
+
+    async def _generate_guarded(self, prompt: str):
+        """Call the model under the circuit breaker, a deadline, and one hedged request.
+
+        If the first request has not answered by the observed p95 latency, or fails
+        outright, an identical second request is started and the first success
+        wins. The slower call cannot be interrupted on its thread; its result is
+        dropped when it arrives.
+        """
+        self._check_abandoned()
+        self.breaker.allow()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + Config.LLM_CALL_TIMEOUT
+        hedge_at = loop.time() + self.latency.hedge_delay()
+        can_hedge = Config.LLM_HEDGING_ENABLED
+        pending = {self._submit(loop, prompt): "primary"}
+        error = None
 
-        except Exception as e:
-            logger.error(f"Error generating response: {e}")
-            return (
-                "I apologize, but I encountered an error while generating the response. "
-                "This might be due to connection issues or service limitations. "
-                "Please try again with a simpler question or wait a moment before retrying."
+        try:
+            while pending:
+                wake = min(hedge_at, deadline) if can_hedge else deadline
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, wake - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for future in done:
+                    attempt = pending.pop(future)
+                    if future.exception() is None:
+                        if attempt == "hedge":
+                            self.hedges["won"] += 1
+                            record_hedge("won")
+                        self.breaker.record_success()
+                        return future.result()
+                    error = future.exception()
+
+                now = loop.time()
+                if can_hedge and now < deadline and (now >= hedge_at or not pending):
+                    can_hedge = False
+                    if not self.calls.saturated:
+                        self.hedges["sent"] += 1
+                        record_hedge("sent")
+                        pending[self._submit(loop, prompt)] = "hedge"
+                elif not done and now >= deadline:
+                    break
+        finally:
+            for future in pending:
+                self.calls.abandon(future)
+
+        if pending:
+            record_error("llm_timeout")
+            self.breaker.record_failure()
+            raise UpstreamTimeout(f"No LLM response within {Config.LLM_CALL_TIMEOUT:g}s")
+
+        if is_upstream_failure(error):
+            self.breaker.record_failure()
+        else:
+            # The upstream answered, it just refused this request
+            self.breaker.record_success()
+        raise error
+
+    def _check_abandoned(self):
+        # Calls still hung past their deadline mean the upstream is not answering
+        if self.calls.saturated:
+            record_circuit_rejection(self.calls.name)
+            raise CircuitOpen(
+                f"{self.calls.abandoned} abandoned {self.calls.name} calls are still running"
             )
 
-    def _generate_content(self, prompt: str):
+    def _submit(self, loop, prompt: str) -> asyncio.Future:
+        return self.calls.start(loop, self._timed_attempt, prompt, time.perf_counter())
+
+    def _timed_attempt(self, prompt: str, submitted_at: float):
+        response = self._generate_content(prompt, submitted_at)
+        # Abandoned slow calls still count, so the hedge delay tracks the real tail
+        self.latency.observe(time.perf_counter() - submitted_at)
+        return response
+
+    async def _stream(
+        self, question: str, context: List[Dict[str, Any]], ministry: str
+    ) -> AsyncIterator[str]:
+        with track_stage("prompt_construction"):
+            prompt = self._construct_prompt(question, context, ministry)
+
+        self._check_abandoned()
+        self.breaker.allow()
+
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        finished = object()
+        abandoned = threading.Event()
+
+        # The SDK streams through a blocking iterator, so drain it on a thread of its own
+        def produce(submitted_at):
+            try:
+                with profiled_thread(), track_stage("llm_generation"):
+                    for chunk in self._generate_content(prompt, submitted_at, stream=True):
+                        if abandoned.is_set():
+                            break
+                        text = getattr(chunk, "text", "")
+                        if text:
+                            loop.call_soon_threadsafe(chunks.put_nowait, text)
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, finished)
+
+        producer = self.calls.start(loop, produce, time.perf_counter())
+        completed = False
+
+        # Streams are not hedged; the deadline applies to the gap between chunks
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(chunks.get(), Config.LLM_CALL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    record_error("llm_timeout")
+                    self.breaker.record_failure()
+                    raise UpstreamTimeout(
+                        f"LLM stream stalled for {Config.LLM_CALL_TIMEOUT:g}s"
+                    ) from None
+                if item is finished:
+                    completed = True
+                    break
+                if isinstance(item, Exception):
+                    if is_upstream_failure(item):
+                        self.breaker.record_failure()
+                    raise item
+                yield item
+        finally:
+            abandoned.set()
+            if not completed:
+                self.calls.abandon(producer)
+
+        self.breaker.record_success()
+        await producer
+
+    def _generate_content(self, prompt: str, submitted_at: float = None, stream: bool = False):
+        if submitted_at is not None:
+            observe_stage("llm_queue_wait", time.perf_counter() - submitted_at)
+
         try:
             generation_config = {
                 "temperature": 0.7,
@@ -98,16 +282,50 @@ class LLMClient:
                 },
             ]
 
-            return self.model.generate_content(
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings,
-            )
+            if stream:
+                return self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                    stream=True,
+                )
+
+            with profiled_thread(), track_stage("llm_generation"):
+                return self.model.generate_content(
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                )
 
         except Exception as e:
             logger.error(f"Error in content generation: {e}")
             raise
 
+    def retrieval_only_answer(self, context: List[Dict[str, Any]]) -> str:
+        """What a shed, timed-out or circuit-broken LLM call answers with: the best records, quoted directly."""
+        if not context:
+            return (
+                "The assistant cannot write an answer right now. "
+                "Please try again in a minute."
+            )
+
+        parts = [
+            "The assistant cannot write a full answer right now. "
+            "These are the most relevant parliamentary records; please try again in a minute "
+            "for a complete answer."
+        ]
+        for i, doc in enumerate(context[:3], 1):
+            metadata = doc.get("metadata", {})
+            excerpt = " ".join((doc.get("text") or "").split())
+            if len(excerpt) > 400:
+                excerpt = excerpt[:400].rsplit(" ", 1)[0] + "..."
+            parts.append(
+                f"**[{i}] {metadata.get('filename', 'Unknown source')}** "
+                f"(Session {metadata.get('session', 'Unknown session')}, "
+                f"dated {metadata.get('date', 'Unknown date')})\n\n> {excerpt}"
+            )
+        return "\n\n".join(parts)
+
     def _is_irrelevant_question(self, text: str) -> bool:
         irrelevance_phrases = [
             "unable to answer this question as it is not relevant to the ministry's affairs",
@@ -129,6 +347,10 @@ class LLMClient:
         self, question: str, context: List[Dict[str, Any]], ministry: str
     ) -> str:
         try:
+            # Cross-ministry answers speak for the government as a whole
+            if ministry == Config.ALL_MINISTRIES:
+                ministry = "Government of India"
+
             context_parts = []
 
             for i, doc in enumerate(context, 1):
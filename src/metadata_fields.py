@@ -0,0 +1,162 @@
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+EPOCH = date(1970, 1, 1)
+
+# Sansad answers use dd.mm.yyyy; sidecars written by hand or older crawls vary
+DATE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d %B %Y", "%d %b %Y")
+
+# Above this many enumerated buckets an $in list stops being cheaper than a range compare
+MAX_IN_BUCKETS = 120
+
+
+def parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    text = value.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        return None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def epoch_day(day: date) -> int:
+    return (day - EPOCH).days
+
+
+def month_bucket(day: date) -> int:
+    return day.year * 12 + day.month - 1
+
+
+def session_seq(lok_sabha: int, session: int) -> int:
+    # Orders sessions across Lok Sabhas: 18th LS session 4 -> 1804
+    return lok_sabha * 100 + session
+
+
+def typed_metadata(metadata: Dict[str, Any]) -> Dict[str, int]:
+    """Integer columns written next to the original string fields so ranges can be filtered."""
+    typed = {}
+
+    day = parse_date(metadata.get("date"))
+    if day is not None:
+        typed["epoch_day"] = epoch_day(day)
+        typed["date_month"] = month_bucket(day)
+
+    lok_sabha = parse_int(metadata.get("lok_sabha"))
+    session = parse_int(metadata.get("session"))
+    if lok_sabha is not None:
+        typed["lok_sabha_no"] = lok_sabha
+    if session is not None:
+        typed["session_no"] = session
+    if lok_sabha is not None and session is not None:
+        typed["session_seq"] = session_seq(lok_sabha, session)
+
+    processed_at = metadata.get("processed_at")
+    if isinstance(processed_at, str):
+        try:
+            typed["processed_at_ts"] = int(datetime.fromisoformat(processed_at).timestamp())
+        except ValueError:
+            pass
+
+    return typed
+
+
+class RangeFilter(NamedTuple):
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    lok_sabha: Optional[int] = None
+    session_from: Optional[int] = None
+    session_to: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self)
+
+    def where_clauses(self) -> List[Dict[str, Any]]:
+        """Coarse prefilter on integer buckets; ``matches`` applies the exact bounds."""
+        clauses = []
+
+        if self.date_from or self.date_to:
+            low = month_bucket(self.date_from) if self.date_from else None
+            high = month_bucket(self.date_to) if self.date_to else None
+            clauses.extend(_bucket_clauses("date_month", low, high))
+
+        if self.lok_sabha is not None:
+            low = session_seq(self.lok_sabha, self.session_from or 0)
+            high = session_seq(self.lok_sabha, self.session_to if self.session_to is not None else 99)
+            clauses.extend(_bucket_clauses("session_seq", low, high))
+        elif self.session_from is not None or self.session_to is not None:
+            clauses.extend(_bucket_clauses("session_no", self.session_from, self.session_to))
+
+        return clauses
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        day = metadata.get("epoch_day")
+        if self.date_from and (day is None or day < epoch_day(self.date_from)):
+            return False
+        if self.date_to and (day is None or day > epoch_day(self.date_to)):
+            return False
+
+        if self.lok_sabha is not None and metadata.get("lok_sabha_no") != self.lok_sabha:
+            return False
+
+        session = metadata.get("session_no")
+        if self.session_from is not None and (session is None or session < self.session_from):
+            return False
+        if self.session_to is not None and (session is None or session > self.session_to):
+            return False
+
+        return True
+
+
+def _bucket_clauses(key: str, low: Optional[int], high: Optional[int]) -> List[Dict[str, Any]]:
+    if low is not None and high is not None and low > high:
+        raise ValueError(f"Empty {key} range: {low} > {high}")
+
+    # Closed, narrow ranges become one $in lookup instead of chroma's OR'd int/float comparisons
+    if low is not None and high is not None and high - low < MAX_IN_BUCKETS:
+        buckets = list(range(low, high + 1))
+        return [{key: {"$eq": buckets[0]}} if len(buckets) == 1 else {key: {"$in": buckets}}]
+
+    clauses = []
+    if low is not None:
+        clauses.append({key: {"$gte": low}})
+    if high is not None:
+        clauses.append({key: {"$lte": high}})
+    return clauses
+
+
+def build_where(ministry: Optional[str], range_filter: Optional[RangeFilter] = None) -> Optional[Dict[str, Any]]:
+    clauses = [{"ministry": {"$eq": ministry}}] if ministry else []
+    if range_filter is not None:
+        clauses.extend(range_filter.where_clauses())
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
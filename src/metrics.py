@@ -0,0 +1,376 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Tuple, Optional
+from .config import Config
+from .profiler import current_profile
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Tuple[str, str] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{value}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines)
+
+
+class Gauge:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self.values[key] = value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self.series: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                # per-bucket counts, then sum and count
+                series = self.series[key] = [0] * len(self.buckets) + [0.0, 0]
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self.series.items()):
+                cumulative = 0
+                for i, bound in enumerate(self.buckets):
+                    cumulative += series[i]
+                    lines.append(
+                        f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}"
+                    )
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series[-1]}"
+                )
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help_text, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str, buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "ragdb_stage_duration_seconds", "Time spent in each stage of answering a question"
+)
+ERRORS = registry.counter("ragdb_errors_total", "Errors raised per stage")
+CACHE_HITS = registry.counter("ragdb_cache_hits_total", "Cache hits per cache")
+CACHE_MISSES = registry.counter("ragdb_cache_misses_total", "Cache misses per cache")
+REQUEST_RATE = registry.gauge(
+    "ragdb_upstream_request_rate", "Current rate limit in requests per second per upstream"
+)
+THROTTLES = registry.counter(
+    "ragdb_upstream_throttles_total", "Throttled (429/5xx) upstream responses"
+)
+PARTITIONS_SKIPPED = registry.counter(
+    "ragdb_partitions_skipped_total", "Ministry partitions left out of a cross-ministry search"
+)
+PARTITION_RESIDENT_BYTES = registry.gauge(
+    "ragdb_partition_resident_bytes", "Bytes of ministry index partitions held in memory"
+)
+PARTITIONS_RESIDENT = registry.gauge(
+    "ragdb_partitions_resident", "Ministry index partitions held in memory"
+)
+LLM_QUEUE_DEPTH = registry.gauge(
+    "ragdb_llm_queue_depth", "Questions waiting for an LLM slot"
+)
+LLM_IN_FLIGHT = registry.gauge("ragdb_llm_in_flight", "LLM calls running")
+LLM_SHED = registry.counter(
+    "ragdb_llm_shed_total", "Questions answered retrieval-only because the LLM queue was overloaded"
+)
+LLM_HEDGES = registry.counter(
+    "ragdb_llm_hedges_total", "Second LLM requests started for a slow or failed first one"
+)
+CIRCUIT_STATE = registry.gauge(
+    "ragdb_circuit_state", "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)"
+)
+LLM_ABANDONED = registry.gauge(
+    "ragdb_llm_abandoned_calls", "LLM calls still running after their caller gave up on them"
+)
+CIRCUIT_REJECTIONS = registry.counter(
+    "ragdb_circuit_rejections_total", "Calls refused because the upstream's circuit was open"
+)
+RELEVANCE_GATE = registry.counter(
+    "ragdb_relevance_gate_total", "Questions passed or turned away before the LLM by the relevance gate"
+)
+BATCH_SIZES = registry.histogram(
+    "ragdb_batch_size",
+    "Items per batched call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+@contextmanager
+def _timed(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        record_error(stage)
+        raise
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def track_stage(stage: str):
+    if not Config.METRICS_ENABLED and not Config.PROFILING_ENABLED:
+        return _NULL_TIMER
+    return _timed(stage)
+
+
+def observe_stage(stage: str, seconds: float):
+    if Config.METRICS_ENABLED:
+        STAGE_SECONDS.observe(seconds, stage=stage)
+
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record_stage(stage, seconds)
+
+
+def record_error(stage: str):
+    if Config.METRICS_ENABLED:
+        ERRORS.inc(stage=stage)
+
+
+def record_cache(cache: str, hit: bool):
+    if Config.METRICS_ENABLED:
+        (CACHE_HITS if hit else CACHE_MISSES).inc(cache=cache)
+
+
+def record_partition_skip(reason: str):
+    if Config.METRICS_ENABLED:
+        PARTITIONS_SKIPPED.inc(reason=reason)
+
+
+def record_partition_residency(resident_bytes: int, partitions: int):
+    if Config.METRICS_ENABLED:
+        PARTITION_RESIDENT_BYTES.set(resident_bytes)
+        PARTITIONS_RESIDENT.set(partitions)
+
+
+def record_admission(queue_depth: int, in_flight: int):
+    if Config.METRICS_ENABLED:
+        LLM_QUEUE_DEPTH.set(queue_depth)
+        LLM_IN_FLIGHT.set(in_flight)
+
+
+def record_shed(reason: str):
+    if Config.METRICS_ENABLED:
+        LLM_SHED.inc(reason=reason)
+
+
+def record_hedge(outcome: str):
+    if Config.METRICS_ENABLED:
+        LLM_HEDGES.inc(outcome=outcome)
+
+
+def record_circuit_state(upstream: str, state: str):
+    if Config.METRICS_ENABLED:
+        CIRCUIT_STATE.set({"closed": 0, "half_open": 1, "open": 2}[state], upstream=upstream)
+
+
+def record_circuit_rejection(upstream: str):
+    if Config.METRICS_ENABLED:
+        CIRCUIT_REJECTIONS.inc(upstream=upstream)
+
+
+def record_abandoned_calls(upstream: str, count: int):
+    if Config.METRICS_ENABLED:
+        LLM_ABANDONED.set(count, upstream=upstream)
+
+
+def record_gate_decision(reason: str):
+    if Config.METRICS_ENABLED:
+        RELEVANCE_GATE.inc(reason=reason)
+
+
+def record_batch_size(batcher: str, size: int):
+    if Config.METRICS_ENABLED:
+        BATCH_SIZES.observe(size, batcher=batcher)
+
+
+def record_rate_limit(upstream: str, rate: float, throttled: bool = False):
+    if Config.METRICS_ENABLED:
+        REQUEST_RATE.set(rate, upstream=upstream)
+        if throttled:
+            THROTTLES.inc(upstream=upstream)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _dump_periodically(path: Path, interval: float):
+    while True:
+        time.sleep(interval)
+        try:
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(registry.render())
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Error writing metrics dump: {e}")
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter(worker: int = 0) -> Optional[str]:
+    """Serve /metrics and, if METRICS_DUMP_PATH is set, also dump them to a file.
+
+    Worker processes pass their index so each binds its own port and dump file.
+    """
+    global _exporter_started
+
+    if not Config.METRICS_ENABLED:
+        return None
+
+    with _exporter_lock:
+        if _exporter_started:
+            return None
+        _exporter_started = True
+
+    location = None
+
+    if Config.METRICS_PORT:
+        port = Config.METRICS_PORT + worker
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            location = f"http://127.0.0.1:{port}/metrics"
+            logger.info(f"Serving metrics on {location}")
+        except Exception as e:
+            logger.error(f"Error starting metrics exporter on port {port}: {e}")
+
+    if Config.METRICS_DUMP_PATH:
+        path = Path(Config.METRICS_DUMP_PATH)
+        if worker:
+            path = path.with_name(f"{path.stem}.{worker}{path.suffix}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            threading.Thread(
+                target=_dump_periodically,
+                args=(path, Config.METRICS_DUMP_INTERVAL),
+                daemon=True,
+            ).start()
+            logger.info(f"Dumping metrics to {path} every {Config.METRICS_DUMP_INTERVAL}s")
+            location = location or str(path)
+        except Exception as e:
+            logger.error(f"Error starting metrics dump to {path}: {e}")
+
+    return location
@@ -0,0 +1,231 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from .config import Config
+from .metadata_fields import RangeFilter, epoch_day
+from .metrics import observe_stage, record_partition_residency
+
+logger = logging.getLogger(__name__)
+
+# Typed filter columns kept beside the vectors; -1 marks a chunk without the field
+FILTER_COLUMNS = ("epoch_day", "lok_sabha_no", "session_no")
+
+
+class Partition:
+    """One ministry's vectors and filter columns, searched exactly in memory."""
+
+    __slots__ = ("ministry", "ids", "vectors", "columns", "version", "nbytes")
+
+    def __init__(self, ministry: str, ids: np.ndarray, vectors: np.ndarray, columns: Dict[str, np.ndarray], version: int):
+        self.ministry = ministry
+        self.ids = ids
+        self.vectors = vectors
+        self.columns = columns
+        self.version = version
+        self.nbytes = ids.nbytes + vectors.nbytes + sum(column.nbytes for column in columns.values())
+
+    def _mask(self, range_filter: RangeFilter) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        day = self.columns["epoch_day"]
+        session = self.columns["session_no"]
+
+        if range_filter.date_from:
+            mask &= day >= epoch_day(range_filter.date_from)
+        if range_filter.date_to:
+            mask &= (day >= 0) & (day <= epoch_day(range_filter.date_to))
+        if range_filter.lok_sabha is not None:
+            mask &= self.columns["lok_sabha_no"] == range_filter.lok_sabha
+        if range_filter.session_from is not None:
+            mask &= session >= range_filter.session_from
+        if range_filter.session_to is not None:
+            mask &= (session >= 0) & (session <= range_filter.session_to)
+        return mask
+
+    def search(
+        self, query: np.ndarray, n_results: int, range_filter: Optional[RangeFilter] = None
+    ) -> List[Tuple[str, float]]:
+        # Vectors are stored normalized, so cosine distance is 1 - dot product, as in chroma
+        distances = 1.0 - self.vectors @ query
+        candidates = np.arange(len(self.ids))
+
+        if range_filter is not None:
+            candidates = candidates[self._mask(range_filter)]
+            distances = distances[candidates]
+
+        if len(candidates) > n_results:
+            top = np.argpartition(distances, n_results)[:n_results]
+            candidates, distances = candidates[top], distances[top]
+
+        order = np.argsort(distances)
+        return [
+            (self.ids[i].decode("utf-8"), float(distance))
+            for i, distance in zip(candidates[order], distances[order])
+        ]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class PartitionCache:
+    """Per-ministry partitions loaded on first use and evicted least-recently-used.
+
+    Writers save a partition file whenever a ministry changes; readers notice a
+    newer file by its mtime and reload it on the next query.
+    """
+
+    def __init__(self, directory: Path = None, budget_bytes: int = None):
+        self.directory = Path(directory or Path(Config.VECTOR_DB_DIR) / "partitions")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.budget_bytes = budget_bytes or Config.PARTITION_MEMORY_BUDGET_MB * 1024 * 1024
+
+        self._partitions: "OrderedDict[str, Partition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.resident_bytes = 0
+
+        self.traffic: Dict[str, float] = self._load_traffic()
+        self._queries_since_save = 0
+
+    def path(self, ministry: str) -> Path:
+        return self.directory / f"{Config.sanitize_ministry_name(ministry)}.npz"
+
+    def write(self, ministry: str, ids: List[str], embeddings: List[List[float]], metadatas: List[Dict[str, Any]]):
+        vectors = normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        columns = {
+            name: np.array([(metadata or {}).get(name, -1) for metadata in metadatas], dtype=np.int32)
+            for name in FILTER_COLUMNS
+        }
+
+        path = self.path(ministry)
+        tmp_path = path.with_suffix(".tmp.npz")
+        # Fixed-width UTF-8 bytes take a quarter of numpy's unicode form for the usual hex ids
+        encoded = np.array([doc_id.encode("utf-8") for doc_id in ids], dtype=bytes)
+        np.savez(tmp_path, ids=encoded, vectors=vectors, **columns)
+        os.replace(tmp_path, path)
+        logger.info(f"Wrote partition for {ministry}: {len(ids)} vectors")
+
+    def remove(self, ministry: str):
+        self.path(ministry).unlink(missing_ok=True)
+        self._evict(ministry)
+
+    def _evict(self, ministry: str):
+        with self._lock:
+            partition = self._partitions.pop(ministry, None)
+            if partition is not None:
+                self.resident_bytes -= partition.nbytes
+            self._report()
+
+    def _report(self):
+        record_partition_residency(self.resident_bytes, len(self._partitions))
+
+    def _load(self, ministry: str, path: Path, version: int) -> Partition:
+        start = time.perf_counter()
+        with np.load(path) as data:
+            partition = Partition(
+                ministry,
+                data["ids"],
+                data["vectors"],
+                {name: data[name] for name in FILTER_COLUMNS},
+                version,
+            )
+        seconds = time.perf_counter() - start
+        observe_stage("partition_load", seconds)
+        logger.info(
+            f"Loaded partition {ministry} ({partition.nbytes / 1e6:.1f} MB) in {seconds * 1000:.0f}ms"
+        )
+        return partition
+
+    def get(self, ministry: str) -> Optional[Partition]:
+        path = self.path(ministry)
+        try:
+            version = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            partition = self._partitions.get(ministry)
+            if partition is not None and partition.version == version:
+                self._partitions.move_to_end(ministry)
+                return partition
+
+        partition = self._load(ministry, path, version)
+
+        with self._lock:
+            previous = self._partitions.pop(ministry, None)
+            if previous is not None:
+                self.resident_bytes -= previous.nbytes
+            self._partitions[ministry] = partition
+            self.resident_bytes += partition.nbytes
+
+            # The partition just loaded stays even if it alone exceeds the budget
+            while self.resident_bytes > self.budget_bytes and len(self._partitions) > 1:
+                evicted_name, evicted = self._partitions.popitem(last=False)
+                self.resident_bytes -= evicted.nbytes
+                logger.info(f"Evicted partition {evicted_name} ({evicted.nbytes / 1e6:.1f} MB)")
+            self._report()
+
+        return partition
+
+    def resident(self) -> Dict[str, int]:
+        with self._lock:
+            return {ministry: partition.nbytes for ministry, partition in self._partitions.items()}
+
+    def _traffic_path(self) -> Path:
+        return Path(Config.PARTITION_TRAFFIC_PATH)
+
+    def _load_traffic(self) -> Dict[str, float]:
+        try:
+            with open(self._traffic_path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def record_query(self, ministry: str):
+        # Exponentially decayed counts, so yesterday's busy ministry fades out
+        with self._lock:
+            for name in self.traffic:
+                self.traffic[name] *= Config.PARTITION_TRAFFIC_DECAY
+            self.traffic[ministry] = self.traffic.get(ministry, 0.0) + 1.0
+            self._queries_since_save += 1
+            if self._queries_since_save < 50:
+                return
+            self._queries_since_save = 0
+            traffic = dict(self.traffic)
+
+        try:
+            path = self._traffic_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(traffic, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save partition traffic: {e}")
+
+    def preload(self, limit_bytes: int = None) -> List[str]:
+        """Load the busiest ministries first until the budget is used."""
+        limit_bytes = limit_bytes or self.budget_bytes
+        loaded = []
+
+        for ministry in sorted(self.traffic, key=self.traffic.get, reverse=True):
+            try:
+                size = self.path(ministry).stat().st_size
+            except FileNotFoundError:
+                continue
+
+            # Loading past the budget would evict a busier partition loaded just before
+            if self.resident_bytes + size > limit_bytes:
+                continue
+            if self.get(ministry) is not None:
+                loaded.append(ministry)
+
+        if loaded:
+            logger.info(f"Preloaded {len(loaded)} partitions ({self.resident_bytes / 1e6:.1f} MB)")
+        return loaded
@@ -0,0 +1,218 @@
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdfs (
+    pdf_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ministry TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    source TEXT,
+    total_chunks INTEGER NOT NULL,
+    processed_at TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    UNIQUE (ministry, filename)
+);
+"""
+
+# Catalogs from before the ministry column keyed on the bare filename. Rows keep their
+# pdf_id; ones whose metadata names no ministry get '' and match any ministry on lookup.
+MIGRATE_FILENAME_KEY = """
+ALTER TABLE pdfs RENAME TO pdfs_by_filename;
+""" + SCHEMA + """
+INSERT INTO pdfs (pdf_id, ministry, filename, source, total_chunks, processed_at, metadata)
+SELECT pdf_id, COALESCE(json_extract(metadata, '$.ministry'), ''), filename, source,
+       total_chunks, processed_at, metadata
+FROM pdfs_by_filename;
+DROP TABLE pdfs_by_filename;
+"""
+
+
+class PdfRecord:
+    """Metadata shared by every chunk of one PDF, stored once in the catalog."""
+
+    __slots__ = (
+        "pdf_id", "ministry", "filename", "source", "metadata", "filter_fields", "total_chunks", "processed_at"
+    )
+
+    def __init__(
+        self,
+        filename: str,
+        source: str,
+        metadata: Dict[str, Any],
+        filter_fields: Dict[str, int],
+        total_chunks: int,
+        processed_at: str,
+    ):
+        self.pdf_id: Optional[int] = None
+        # The ministry the chunks are indexed under; set when the record is cataloged
+        self.ministry: Optional[str] = None
+        self.filename = filename
+        self.source = source
+        self.metadata = metadata
+        self.filter_fields = filter_fields
+        self.total_chunks = total_chunks
+        self.processed_at = processed_at
+
+    def full_metadata(self) -> Dict[str, Any]:
+        return {
+            **self.metadata,
+            **self.filter_fields,
+            "total_chunks": self.total_chunks,
+            "source": self.source,
+            "filename": self.filename,
+            "processed_at": self.processed_at,
+        }
+
+
+class ChunkRecord:
+    """One chunk of text; everything else lives on the shared PdfRecord."""
+
+    __slots__ = ("id", "text", "chunk_index", "pdf")
+
+    def __init__(self, id: str, text: str, chunk_index: int, pdf: PdfRecord):
+        self.id = id
+        self.text = text
+        self.chunk_index = chunk_index
+        self.pdf = pdf
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return {**self.pdf.full_metadata(), "chunk_index": self.chunk_index}
+
+
+class PdfCatalog:
+    """Per-PDF metadata table referenced by integer ``pdf_id`` from each indexed chunk.
+
+    Lives next to the chroma files so index snapshots carry it along.
+    """
+
+    def __init__(self, path: Path = None):
+        self.path = Path(path or Path(Config.VECTOR_DB_DIR) / "pdf_catalog.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pdfs)")}
+        if "ministry" not in columns:
+            self._conn.executescript(f"BEGIN; {MIGRATE_FILENAME_KEY} COMMIT;")
+            logger.info(f"Re-keyed {self.path} on (ministry, filename)")
+        self._conn.commit()
+
+        # Rows are small and read far more often than written. data_version changes when
+        # another connection (the ingest worker, another API worker) commits, so the cache
+        # is dropped then; this connection's own writes evict their row directly.
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._rows_version = None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple = ()):
+        with self._lock:
+            with self._conn:
+                return self._conn.execute(sql, params).fetchall()
+
+    def add(self, pdf: PdfRecord) -> int:
+        # The same file can be indexed under two ministries, so it is keyed on both.
+        # Re-indexing a PDF keeps its pdf_id so chunks written earlier still resolve.
+        rows = self._execute(
+            """
+            INSERT INTO pdfs (ministry, filename, source, total_chunks, processed_at, metadata)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(ministry, filename) DO UPDATE SET
+                source=excluded.source,
+                total_chunks=excluded.total_chunks,
+                processed_at=excluded.processed_at,
+                metadata=excluded.metadata
+            RETURNING pdf_id
+            """,
+            (
+                pdf.ministry or "",
+                pdf.filename,
+                pdf.source,
+                pdf.total_chunks,
+                pdf.processed_at,
+                json.dumps(pdf.metadata, default=str),
+            ),
+        )
+        pdf.pdf_id = rows[0][0]
+        self._rows.pop(pdf.pdf_id, None)
+        return pdf.pdf_id
+
+    def records(self) -> List[PdfRecord]:
+        rows = self._execute(
+            "SELECT pdf_id, ministry, filename, source, total_chunks, processed_at, metadata FROM pdfs"
+        )
+        records = []
+        for pdf_id, ministry, filename, source, total_chunks, processed_at, metadata in rows:
+            record = PdfRecord(filename, source, json.loads(metadata), {}, total_chunks, processed_at)
+            record.pdf_id = pdf_id
+            record.ministry = ministry
+            records.append(record)
+        return records
+
+    def pdf_id(self, filename: str, ministry: str = None) -> Optional[int]:
+        if ministry is None:
+            rows = self._execute("SELECT pdf_id FROM pdfs WHERE filename=? LIMIT 1", (filename,))
+        else:
+            rows = self._execute(
+                "SELECT pdf_id FROM pdfs WHERE filename=? AND ministry IN (?, '') "
+                "ORDER BY ministry DESC LIMIT 1",
+                (filename, ministry),
+            )
+        return rows[0][0] if rows else None
+
+    def get_many(self, pdf_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        wanted = {pdf_id for pdf_id in pdf_ids if pdf_id is not None}
+        if not wanted:
+            return {}
+
+        version = self._execute("PRAGMA data_version")[0][0]
+        if version != self._rows_version:
+            self._rows.clear()
+            self._rows_version = version
+
+        missing = [pdf_id for pdf_id in wanted if pdf_id not in self._rows]
+
+        if missing:
+            placeholders = ", ".join("?" for _ in missing)
+            rows = self._execute(
+                f"SELECT pdf_id, filename, source, total_chunks, processed_at, metadata "
+                f"FROM pdfs WHERE pdf_id IN ({placeholders})",
+                tuple(missing),
+            )
+            for pdf_id, filename, source, total_chunks, processed_at, metadata in rows:
+                self._rows[pdf_id] = {
+                    **json.loads(metadata),
+                    "total_chunks": total_chunks,
+                    "source": source,
+                    "filename": filename,
+                    "processed_at": processed_at,
+                }
+
+        return {pdf_id: self._rows[pdf_id] for pdf_id in wanted if pdf_id in self._rows}
+
+    def resolve(self, metadatas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Expand compact chunk metadata into the full per-chunk view.
+
+        Chunks indexed before the catalog existed carry their metadata inline
+        and pass through unchanged.
+        """
+        rows = self.get_many(metadata.get("pdf_id") for metadata in metadatas)
+        return [
+            {**rows.get(metadata.get("pdf_id"), {}), **metadata} for metadata in metadatas
+        ]
+
+    def clear(self):
+        self._execute("DELETE FROM pdfs")
+        self._rows.clear()
@@ -0,0 +1,205 @@
+import contextvars
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self, ministry: str, **attributes):
+        self.ministry = ministry
+        self.attributes = attributes
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.thread_ids = {threading.get_ident()}
+        self.samples = Counter()
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_thread(self, thread_id: int):
+        with self._lock:
+            self.thread_ids.add(thread_id)
+
+    def remove_thread(self, thread_id: int):
+        with self._lock:
+            self.thread_ids.discard(thread_id)
+
+    def record_stage(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def sample(self, frames):
+        with self._lock:
+            thread_ids = list(self.thread_ids)
+
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            if frame is not None:
+                self.samples[_fold(frame)] += 1
+
+
+def _fold(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        filename = "/".join(Path(code.co_filename).parts[-2:])
+        parts.append(f"{code.co_name} ({filename}:{frame.f_lineno})".replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SamplingProfiler:
+    """One background thread samples the stacks of every active request."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.active = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def register(self, profile: RequestProfile):
+        with self._lock:
+            self.active.add(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def unregister(self, profile: RequestProfile):
+        with self._lock:
+            self.active.discard(profile)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                profiles = list(self.active)
+
+            if not profiles:
+                self._wakeup.clear()
+                self._wakeup.wait(timeout=5.0)
+                continue
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                profile.sample(frames)
+            del frames
+
+            time.sleep(self.interval)
+
+
+_profiler: Optional[SamplingProfiler] = None
+
+
+def _get_profiler() -> SamplingProfiler:
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler(Config.PROFILE_SAMPLE_INTERVAL)
+    return _profiler
+
+
+@contextmanager
+def profile_request(ministry: str, **attributes):
+    if not Config.PROFILING_ENABLED or current_profile.get() is not None:
+        yield current_profile.get()
+        return
+
+    profile = RequestProfile(ministry, **attributes)
+    token = current_profile.set(profile)
+    profiler = _get_profiler()
+    profiler.register(profile)
+
+    try:
+        yield profile
+    finally:
+        profiler.unregister(profile)
+        current_profile.reset(token)
+        profile.duration = time.perf_counter() - profile.start
+
+        if profile.duration >= Config.PROFILE_SLOW_THRESHOLD:
+            _save_profile(profile)
+
+
+@contextmanager
+def profiled_thread():
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    thread_id = threading.get_ident()
+    profile.add_thread(thread_id)
+    try:
+        yield
+    finally:
+        profile.remove_thread(thread_id)
+
+
+def _save_profile(profile: RequestProfile):
+    try:
+        profile_dir = Path(Config.PROFILE_DIR)
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        name = (
+            f"{profile.started_at.strftime('%Y%m%d_%H%M%S_%f')}_"
+            f"{Config.sanitize_ministry_name(profile.ministry or 'unknown')}_"
+            f"{int(profile.duration * 1000)}ms"
+        )
+
+        with open(profile_dir / f"{name}.folded", "w") as f:
+            for stack, count in profile.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        with open(profile_dir / f"{name}.json", "w") as f:
+            json.dump(
+                {
+                    "ministry": profile.ministry,
+                    "started_at": profile.started_at.isoformat(),
+                    "duration": profile.duration,
+                    "threshold": Config.PROFILE_SLOW_THRESHOLD,
+                    "sample_interval": Config.PROFILE_SAMPLE_INTERVAL,
+                    "samples": sum(profile.samples.values()),
+                    "stages": profile.stages,
+                    **profile.attributes,
+                },
+                f,
+                indent=2,
+            )
+
+        logger.info(
+            f"Saved slow request profile {name} ({profile.duration:.2f}s for {profile.ministry})"
+        )
+        _enforce_retention(profile_dir)
+
+    except Exception as e:
+        logger.warning(f"Error saving request profile: {e}")
+
+
+def _enforce_retention(profile_dir: Path):
+    profiles = sorted(
+        profile_dir.glob("*.folded"), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+
+    total_bytes = 0
+    for index, folded_path in enumerate(profiles):
+        sidecar = folded_path.with_suffix(".json")
+        size = folded_path.stat().st_size + (sidecar.stat().st_size if sidecar.exists() else 0)
+        total_bytes += size
+
+        if index >= Config.PROFILE_MAX_FILES or total_bytes > Config.PROFILE_MAX_BYTES:
+            folded_path.unlink(missing_ok=True)
+            sidecar.unlink(missing_ok=True)
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from .config import Config
+from .metrics import record_rate_limit
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose rate adapts with AIMD.
+
+    Every success nudges the rate up additively and every throttled response
+    halves it, so the limiter settles just under what the upstream tolerates.
+    State is guarded by a thread lock rather than an asyncio lock so one
+    instance can be shared by clients running on different event loops.
+    """
+
+    def __init__(
+        self,
+        name: str = "sansad",
+        rate: float = None,
+        min_rate: float = None,
+        max_rate: float = None,
+        burst: float = None,
+        increase: float = None,
+        decrease_factor: float = None,
+    ):
+        self.name = name
+        self._rate = rate or Config.SANSAD_RATE_INITIAL
+        self.min_rate = min_rate or Config.SANSAD_RATE_MIN
+        self.max_rate = max_rate or Config.SANSAD_RATE_MAX
+        self.burst = burst or Config.SANSAD_RATE_BURST
+        self.increase = increase or Config.SANSAD_RATE_INCREASE
+        self.decrease_factor = decrease_factor or Config.SANSAD_RATE_DECREASE_FACTOR
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+        record_rate_limit(self.name, self._rate)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self._rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            # Tokens may go negative: each waiter queues behind the ones before it
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self._rate)
+            return max(wait, self._paused_until - now)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+            rate = self._rate
+        record_rate_limit(self.name, rate)
+
+    def on_throttle(self, retry_after: Optional[str] = None, attempt: int = 1) -> float:
+        """Record a 429/5xx and return how long the caller should back off."""
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.backoff(attempt)
+
+        with self._lock:
+            now = time.monotonic()
+
+            # Concurrent requests often fail together; count that as one congestion signal
+            if now - self._last_decrease >= 1.0 / self._rate:
+                self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+                self._last_decrease = now
+
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = min(self._tokens, 0.0)
+            rate = self._rate
+
+        record_rate_limit(self.name, rate, throttled=True)
+        logger.warning(
+            f"{self.name} throttled; backing off {delay:.1f}s, rate now {rate:.2f} req/s"
+        )
+        return delay
+
+    def backoff(self, attempt: int) -> float:
+        # Jitter keeps concurrent retries from arriving in lockstep
+        cap = min(Config.RATE_LIMIT_MAX_BACKOFF, Config.RATE_LIMIT_DELAY * (2**attempt))
+        return random.uniform(cap / 2, cap)
+
+
+_limiter: Optional[AdaptiveRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> AdaptiveRateLimiter:
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = AdaptiveRateLimiter()
+
+    return _limiter
@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, NamedTuple, Optional
+import numpy as np
+from .config import Config
+from .metrics import record_gate_decision, track_stage
+from .partition_cache import normalize
+
+logger = logging.getLogger(__name__)
+
+OFF_TOPIC_MESSAGE = (
+    "I am unable to answer this question as it is not relevant to the ministry's affairs."
+)
+
+
+class GateDecision(NamedTuple):
+    allowed: bool
+    reason: str
+    ministry_score: Optional[float] = None
+    top_score: Optional[float] = None
+    suggested_ministry: Optional[str] = None
+
+
+def prototypes(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 13) -> np.ndarray:
+    """Spherical k-means: up to ``k`` unit vectors that together cover a ministry's chunks."""
+    vectors = normalize(np.asarray(vectors, dtype=np.float32))
+    if len(vectors) <= k:
+        return vectors
+
+    rng = np.random.default_rng(seed)
+    centres = vectors[rng.choice(len(vectors), k, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centres.T, axis=1)
+        for i in range(k):
+            members = vectors[assignment == i]
+            if len(members):
+                centres[i] = members.sum(axis=0)
+        centres = normalize(centres)
+    return centres
+
+
+class RelevanceGate:
+    """Turns away questions that no indexed ministry covers before they reach the LLM.
+
+    Each ministry is summarised by a few prototype vectors built from its chunks. A
+    question passes when it is close enough to the selected ministry's prototypes
+    and retrieval found a close enough chunk.
+    """
+
+    def __init__(self, directory: Path = None):
+        directory = Path(directory or Config.VECTOR_DB_DIR)
+        self.prototypes_path = directory / "ministry_prototypes.npz"
+        self.thresholds_path = directory / "relevance_gate.json"
+
+        self._lock = threading.Lock()
+        self._prototypes: Dict[str, np.ndarray] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._versions = (None, None)
+
+    def write_prototypes(self, vectors_by_ministry: Dict[str, np.ndarray]):
+        names = sorted(vectors_by_ministry)
+        arrays = {
+            f"p{i}": prototypes(vectors_by_ministry[name], Config.RELEVANCE_PROTOTYPES_PER_MINISTRY)
+            for i, name in enumerate(names)
+        }
+
+        tmp_path = self.prototypes_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, names=np.array(names), **arrays)
+        os.replace(tmp_path, self.prototypes_path)
+        logger.info(f"Wrote relevance prototypes for {len(names)} ministries")
+
+    def write_thresholds(self, min_ministry_score: float, min_top_score: float, **details):
+        tmp_path = self.thresholds_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"min_ministry_score": min_ministry_score, "min_top_score": min_top_score, **details},
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.thresholds_path)
+
+    @staticmethod
+    def _mtime(path: Path) -> Optional[int]:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        # Rebuilt prototypes or a new calibration are picked up without a restart
+        versions = (self._mtime(self.prototypes_path), self._mtime(self.thresholds_path))
+        if versions == self._versions:
+            return
+
+        with self._lock:
+            if versions == self._versions:
+                return
+
+            loaded = {}
+            if versions[0] is not None:
+                with np.load(self.prototypes_path) as data:
+                    loaded = {str(name): data[f"p{i}"] for i, name in enumerate(data["names"])}
+
+            thresholds = {}
+            if versions[1] is not None:
+                try:
+                    with open(self.thresholds_path, "r") as f:
+                        thresholds = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    logger.warning(f"Ignoring unreadable {self.thresholds_path}: {e}")
+
+            self._prototypes = loaded
+            self._thresholds = thresholds
+            self._versions = versions
+
+    @property
+    def min_ministry_score(self) -> float:
+        return self._thresholds.get("min_ministry_score", Config.RELEVANCE_MIN_MINISTRY_SCORE)
+
+    @property
+    def min_top_score(self) -> float:
+        return self._thresholds.get("min_top_score", Config.RELEVANCE_MIN_TOP_SCORE)
+
+    def ministry_scores(self, embedding: List[float]) -> Dict[str, float]:
+        self._refresh()
+        query = normalize(np.asarray(embedding, dtype=np.float32))
+        return {name: float((vectors @ query).max()) for name, vectors in self._prototypes.items()}
+
+    def check(
+        self, embedding: List[float], ministry: Optional[str], documents: List[Dict[str, Any]]
+    ) -> GateDecision:
+        if not Config.RELEVANCE_GATE_ENABLED:
+            return GateDecision(True, "disabled")
+
+        with track_stage("relevance_gate"):
+            scores = self.ministry_scores(embedding)
+            best = max(scores, key=scores.get) if scores else None
+
+            if not ministry or ministry == Config.ALL_MINISTRIES:
+                ministry_score = scores[best] if best else None
+            else:
+                ministry_score = scores.get(ministry)
+            top_score = max((document["relevance_score"] for document in documents), default=None)
+
+            if top_score is None:
+                reason = "no_context"
+            elif top_score < self.min_top_score:
+                reason = "low_retrieval_score"
+            elif ministry_score is not None and ministry_score < self.min_ministry_score:
+                reason = "off_topic"
+            else:
+                reason = "ok"
+
+            suggested = None
+            if reason != "ok" and best and best != ministry and scores[best] >= self.min_ministry_score:
+                suggested = best
+
+        record_gate_decision(reason)
+        return GateDecision(reason == "ok", reason, ministry_score, top_score, suggested)
@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from .config import Config
+from .metrics import record_abandoned_calls, record_circuit_rejection, record_circuit_state
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class UpstreamTimeout(Exception):
+    pass
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    # Bad requests and blocked prompts mean the upstream answered; only outages count
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and 400 <= code < 500 and code not in (408, 429):
+        return False
+    return True
+
+
+class CircuitBreaker:
+    """Fails calls fast once an upstream keeps failing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and every
+    call is refused for ``cooldown`` seconds. Then a single probe call is let
+    through: success closes the circuit, failure opens it for another cooldown.
+    A probe that never reports back (its caller went away) is replaced after
+    another cooldown, so the circuit cannot stick half-open.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = None, cooldown: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURES
+        self.cooldown = cooldown or Config.LLM_BREAKER_COOLDOWN
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+
+        record_circuit_state(self.name, self._state)
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _set_state(self, state: str):
+        # Caller holds the lock
+        if state != self._state:
+            logger.warning(f"{self.name} circuit {self._state} -> {state}")
+            self._state = state
+            record_circuit_state(self.name, state)
+
+    def allow(self):
+        """Raise CircuitOpen unless a call may go to the upstream now."""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == OPEN and now - self._opened_at >= self.cooldown:
+                self._set_state(HALF_OPEN)
+
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and (
+                not self._probing or now - self._probe_started >= self.cooldown
+            ):
+                self._probing = True
+                self._probe_started = now
+                return
+
+        record_circuit_rejection(self.name)
+        raise CircuitOpen(f"{self.name} is unavailable; retrying after the cooldown")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+
+class LatencyTracker:
+    """Recent successful call latencies, for choosing when to hedge."""
+
+    def __init__(self, window: int = None, min_samples: int = 20):
+        self._samples = deque(maxlen=window or Config.LLM_LATENCY_WINDOW)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def hedge_delay(self) -> float:
+        p95 = self.quantile(0.95)
+        if p95 is None:
+            return Config.LLM_HEDGE_INITIAL_DELAY
+        return max(Config.LLM_HEDGE_MIN_DELAY, p95)
+
+
+class CallTracker:
+    """Runs blocking upstream calls on threads of their own and counts the abandoned ones.
+
+    The SDK call cannot be interrupted, so a call its caller gave up on keeps its
+    thread until the upstream answers. Giving every call its own thread means an
+    abandoned call never holds a pooled thread that later calls and half-open
+    probes would queue behind; past ``limit`` abandoned calls the tracker reports
+    itself saturated instead.
+    """
+
+    def __init__(self, name: str, limit: int = None):
+        self.name = name
+        self.limit = limit or Config.LLM_MAX_ABANDONED_CALLS
+        self._lock = threading.Lock()
+        self._running = {}
+        self._abandoned = 0
+
+    @property
+    def abandoned(self) -> int:
+        return self._abandoned
+
+    @property
+    def saturated(self) -> bool:
+        return self._abandoned >= self.limit
+
+    def _count(self, delta: int):
+        # Caller holds the lock
+        self._abandoned += delta
+        record_abandoned_calls(self.name, self._abandoned)
+
+    def start(self, loop: asyncio.AbstractEventLoop, fn: Callable, *args) -> asyncio.Future:
+        future = loop.create_future()
+        context = contextvars.copy_context()
+
+        def settle(result, error):
+            if future.done():
+                return
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+        def run():
+            result, error = None, None
+            try:
+                result = context.run(fn, *args)
+            except Exception as e:
+                error = e
+
+            with self._lock:
+                if self._running.pop(future):
+                    self._count(-1)
+            try:
+                loop.call_soon_threadsafe(settle, result, error)
+            except RuntimeError:
+                # The caller's event loop has already closed
+                pass
+
+        with self._lock:
+            self._running[future] = False
+        threading.Thread(target=run, name=f"{self.name}-call", daemon=True).start()
+        return future
+
+    def abandon(self, future: asyncio.Future):
+        """Stop waiting for a call; it counts as abandoned until its thread returns."""
+        with self._lock:
+            if self._running.get(future) is False:
+                self._running[future] = True
+                self._count(1)
+        future.cancel()
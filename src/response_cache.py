@@ -0,0 +1,90 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def session_closed(lok_sabha: int, session: int) -> bool:
+    # Anything before the configured current session has stopped changing
+    return (int(lok_sabha), int(session)) < (Config.DEFAULT_LOK_SABHA, Config.DEFAULT_SESSION)
+
+
+class ResponseCache:
+    """Gzipped JSON API responses on disk, one file per URL and parameter set."""
+
+    def __init__(self, cache_dir: Path = None):
+        self.cache_dir = Path(cache_dir or Config.RESPONSE_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str, params: Dict[str, Any]) -> Path:
+        key = json.dumps({"url": url, "params": params}, sort_keys=True, default=str)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json.gz"
+
+    def get(self, url: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = self._path(url, params)
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        body: Any,
+        etag: str = None,
+        last_modified: str = None,
+    ) -> Dict[str, Any]:
+        entry = {
+            "url": url,
+            "params": params,
+            "stored_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+        }
+        path = self._path(url, params)
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Error writing response cache entry: {e}")
+
+        return entry
+
+    def touch(self, url: str, params: Dict[str, Any], entry: Dict[str, Any]):
+        """Mark an entry fresh again after a 304 Not Modified."""
+        self.put(url, params, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], ttl: Optional[float]) -> bool:
+        if ttl is None:
+            return True
+        return time.time() - entry.get("stored_at", 0) < ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
@@ -6,12 +6,21 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, urlparse
 from .config import Config
+from .metrics import record_cache
+from .rate_limiter import AdaptiveRateLimiter, get_rate_limiter
+from .response_cache import ResponseCache, session_closed
 
 logger = logging.getLogger(__name__)
 
 
 class SansadClient:
-    def __init__(self):
+    def __init__(
+        self, rate_limiter: AdaptiveRateLimiter = None, response_cache: ResponseCache = None
+    ):
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.response_cache = response_cache or (
+            ResponseCache() if Config.RESPONSE_CACHE_ENABLED else None
+        )
         self.base_url = Config.SANSAD_API_URL
         self.pdf_base_url = Config.PDF_BASE_URL
         self.headers = {
@@ -21,6 +30,10 @@ class SansadClient:
 
         os.makedirs(Config.PDF_CACHE_DIR, exist_ok=True)
 
+    @staticmethod
+    def _is_throttled(status: int) -> bool:
+        return status == 429 or status >= 500
+
     def _format_pdf_url(self, pdf_url: str) -> str:
         if not pdf_url:
             return ""
@@ -41,11 +54,23 @@ class SansadClient:
         )
 
     async def fetch_questions(
-        self, ministry: str = None, page: int = 1
-    ) -> List[Dict[str, Any]]:
+        self,
+        ministry: str = None,
+        page: int = 1,
+        lok_sabha: int = None,
+        session: int = None,
+        revalidate: bool = False,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """One listing page; ``[]`` past the last page, ``None`` if the page could not be fetched.
+
+        ``revalidate`` skips the cache's freshness window and asks the server with the
+        cached ETag, for callers that must see questions answered in the last minutes.
+        """
+        lok_sabha = lok_sabha or Config.DEFAULT_LOK_SABHA
+        session_no = session or Config.DEFAULT_SESSION
         params = {
-            "loksabhaNo": Config.DEFAULT_LOK_SABHA,
-            "sessionNumber": Config.DEFAULT_SESSION,
+            "loksabhaNo": lok_sabha,
+            "sessionNumber": session_no,
             "pageNo": page,
             "pageSize": Config.DEFAULT_PAGE_SIZE,
             "locale": "en",
@@ -54,30 +79,67 @@ class SansadClient:
         if ministry:
             params["ministry"] = ministry
 
+        cached = None
+        if self.response_cache:
+            cached = self.response_cache.get(self.base_url, params)
+
+            if cached and not revalidate:
+                questions = await self._questions_from(cached["body"], lok_sabha, session_no)
+                # A closed session's page never changes, but an empty or unreadable one
+                # may have been a transient failure, so only real pages are kept for good
+                permanent = bool(questions) and session_closed(lok_sabha, session_no)
+                ttl = None if permanent else Config.RESPONSE_CACHE_TTL
+
+                if self.response_cache.is_fresh(cached, ttl):
+                    record_cache("sansad_api", hit=True)
+                    logger.info(f"Using cached questions for {ministry} (page {page})")
+                    return questions
+
+            record_cache("sansad_api", hit=False)
+
+        headers = {**self.headers, **ResponseCache.conditional_headers(cached)}
         retry_count = 0
         max_retries = Config.MAX_RETRIES
-        delay = Config.RATE_LIMIT_DELAY
 
         while retry_count < max_retries:
             try:
+                await self.rate_limiter.acquire()
                 async with aiohttp.ClientSession() as session:
                     async with session.get(
                         self.base_url,
                         params=params,
-                        headers=self.headers,
+                        headers=headers,
                         timeout=Config.TIMEOUT,
                     ) as response:
-                        if response.status == 429:  # Rate limited
+                        if self._is_throttled(response.status):
                             retry_count += 1
-                            wait_time = delay * (2**retry_count)  # Exponential backoff
+                            wait_time = self.rate_limiter.on_throttle(
+                                response.headers.get("Retry-After"), retry_count
+                            )
                             logger.warning(
-                                f"Rate limited. Waiting {wait_time} seconds before retry."
+                                f"Throttled ({response.status}). Waiting {wait_time:.1f} seconds before retry."
                             )
                             await asyncio.sleep(wait_time)
                             continue
 
+                        if response.status == 304 and cached:
+                            self.rate_limiter.on_success()
+                            self.response_cache.touch(self.base_url, params, cached)
+                            logger.info(f"Questions for {ministry} (page {page}) not modified")
+                            return await self._questions_from(cached["body"], lok_sabha, session_no)
+
                         response.raise_for_status()
                         data = await response.json()
+                        self.rate_limiter.on_success()
+
+                        if self.response_cache:
+                            self.response_cache.put(
+                                self.base_url,
+                                params,
+                                data,
+                                etag=response.headers.get("ETag"),
+                                last_modified=response.headers.get("Last-Modified"),
+                            )
 
                         if not data:
                             logger.warning(f"Empty response for ministry: {ministry}")
@@ -86,7 +148,7 @@ class SansadClient:
                         logger.info(
                             f"Successfully fetched questions for {ministry} (page {page})"
                         )
-                        return await self._process_response(data)
+                        return await self._questions_from(data, lok_sabha, session_no)
 
             except aiohttp.ClientResponseError as e:
                 retry_count += 1
@@ -95,8 +157,8 @@ class SansadClient:
                     logger.error(
                         f"Failed to fetch questions after {max_retries} attempts: {e}"
                     )
-                    return []
-                await asyncio.sleep(delay * (2**retry_count))
+                    return None
+                await asyncio.sleep(self.rate_limiter.backoff(retry_count))
 
             except aiohttp.ClientError as e:
                 retry_count += 1
@@ -105,14 +167,17 @@ class SansadClient:
                     logger.error(
                         f"Failed to fetch questions after {max_retries} attempts: {e}"
                     )
-                    return []
-                await asyncio.sleep(delay)
+                    return None
+                await asyncio.sleep(self.rate_limiter.backoff(retry_count))
 
             except Exception as e:
                 logger.error(f"Unexpected error fetching questions: {e}")
-                return []
+                return None
+
+        logger.error(f"Still throttled after {max_retries} attempts for {ministry} (page {page})")
+        return None
 
-    async def download_pdf(self, pdf_url: str) -> Optional[str]:
+    async def download_pdf(self, pdf_url: str, filename_prefix: str = "") -> Optional[str]:
         if not pdf_url:
             return None
 
@@ -125,17 +190,24 @@ class SansadClient:
             if not filename.endswith(".pdf"):
                 filename = f"{filename}.pdf"
 
+            # Question numbers restart every session, so sharded crawls namespace the file
+            filename = f"{filename_prefix}{filename}"
+
             file_path = Path(Config.PDF_CACHE_DIR) / filename
 
             if file_path.exists():
                 logger.info(f"Using cached PDF: {filename}")
+                record_cache("pdf", hit=True)
                 return str(file_path)
 
+            record_cache("pdf", hit=False)
+
             logger.info(f"Downloading PDF from: {formatted_url}")
 
             retry_count = 0
             while retry_count < Config.MAX_RETRIES:
                 try:
+                    await self.rate_limiter.acquire()
                     async with aiohttp.ClientSession() as session:
                         async with session.get(
                             formatted_url, headers=self.headers, timeout=Config.TIMEOUT
@@ -144,17 +216,20 @@ class SansadClient:
                                 logger.error(f"PDF not found: {formatted_url}")
                                 return None
 
-                            if response.status == 429:
+                            if self._is_throttled(response.status):
                                 retry_count += 1
-                                wait_time = Config.RATE_LIMIT_DELAY * (2**retry_count)
+                                wait_time = self.rate_limiter.on_throttle(
+                                    response.headers.get("Retry-After"), retry_count
+                                )
                                 logger.warning(
-                                    f"Rate limited. Waiting {wait_time} seconds before retry."
+                                    f"Throttled ({response.status}). Waiting {wait_time:.1f} seconds before retry."
                                 )
                                 await asyncio.sleep(wait_time)
                                 continue
 
                             response.raise_for_status()
                             content = await response.read()
+                            self.rate_limiter.on_success()
 
                             if not content.startswith(b"%PDF"):
                                 logger.error(
@@ -178,7 +253,7 @@ class SansadClient:
                             f"Failed to download PDF after {Config.MAX_RETRIES} attempts: {e}"
                         )
                         return None
-                    await asyncio.sleep(Config.RATE_LIMIT_DELAY)
+                    await asyncio.sleep(self.rate_limiter.backoff(retry_count))
 
                 except aiohttp.ClientError as e:
                     retry_count += 1
@@ -190,12 +265,27 @@ class SansadClient:
                             f"Failed to download PDF after {Config.MAX_RETRIES} attempts: {e}"
                         )
                         return None
-                    await asyncio.sleep(Config.RATE_LIMIT_DELAY)
+                    await asyncio.sleep(self.rate_limiter.backoff(retry_count))
+
+            logger.error(f"Still throttled after {Config.MAX_RETRIES} attempts: {formatted_url}")
+            return None
 
         except Exception as e:
             logger.error(f"Error downloading PDF: {e}")
             return None
 
+    async def _questions_from(
+        self, data: Any, lok_sabha: int, session: int
+    ) -> List[Dict[str, Any]]:
+        if not data:
+            return []
+
+        questions = await self._process_response(data)
+        for question in questions:
+            question["lok_sabha"] = lok_sabha
+            question["session"] = question["session"] or session
+        return questions
+
     async def _process_response(self, data: Dict) -> List[Dict[str, Any]]:
         """Process API response with error handling"""
         processed_questions = []
@@ -0,0 +1,144 @@
+import heapq
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Dict, Any, NamedTuple
+from .config import Config
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class BuildUnit(NamedTuple):
+    ministry: str
+    pdf_paths: List[str]
+
+
+def plan_shards(ministries: List[str], workers: int) -> List[List[BuildUnit]]:
+    """Split ministries across workers so each gets about the same number of PDFs.
+
+    A ministry with more than its fair share of PDFs is cut into slices first,
+    so one large ministry cannot leave a single worker running long after the
+    others have finished.
+    """
+    pdfs = {
+        ministry: sorted(str(path) for path in Config.get_ministry_dir(ministry).glob("*.pdf"))
+        for ministry in ministries
+    }
+    total = sum(len(paths) for paths in pdfs.values())
+    if not total:
+        return []
+
+    workers = max(1, min(workers, total))
+    slice_size = math.ceil(total / workers)
+
+    units = [
+        BuildUnit(ministry, paths[i : i + slice_size])
+        for ministry, paths in pdfs.items()
+        for i in range(0, len(paths), slice_size)
+    ]
+
+    # Longest-processing-time first: biggest unit goes to the least loaded worker
+    loads = [(0, worker, []) for worker in range(workers)]
+    for unit in sorted(units, key=lambda unit: len(unit.pdf_paths), reverse=True):
+        load, worker, assigned = heapq.heappop(loads)
+        assigned.append(unit)
+        heapq.heappush(loads, (load + len(unit.pdf_paths), worker, assigned))
+
+    return [assigned for _, _, assigned in sorted(loads, key=lambda entry: entry[1]) if assigned]
+
+
+def build_shard(shard_dir: str, units: List[BuildUnit], threads: int) -> Dict[str, Any]:
+    # Runs in a spawned process with its own encoder, writing to a private chroma directory
+    from .document_processor import DocumentProcessor
+    from .ingest_worker import limit_resources
+
+    limit_resources(nice=0, threads=threads)
+    Config.VECTOR_DB_DIR = Path(shard_dir)
+    Config.VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
+
+    vector_store = VectorStore()
+    processor = DocumentProcessor()
+    stats = {"shard": shard_dir, "pdfs": 0, "failed": 0, "chunks": 0}
+    start = time.perf_counter()
+
+    with vector_store.deferred_partition_refresh():
+        for unit in units:
+            pending = []
+            for pdf_path in unit.pdf_paths:
+                metadata = processor.ministry_pdf_metadata(unit.ministry, Path(pdf_path))
+                documents = processor.process_pdf(pdf_path, metadata)
+                if not documents:
+                    stats["failed"] += 1
+                    continue
+
+                stats["pdfs"] += 1
+                pending.extend(documents)
+                if len(pending) >= Config.INGEST_INDEX_BATCH_SIZE:
+                    vector_store.add_documents(pending, ministry=unit.ministry)
+                    stats["chunks"] += len(pending)
+                    pending = []
+
+            if pending:
+                vector_store.add_documents(pending, ministry=unit.ministry)
+                stats["chunks"] += len(pending)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def build_sharded_index(
+    vector_store: VectorStore, ministries: List[str], workers: int = None
+) -> Dict[str, Any]:
+    workers = workers or Config.INDEX_BUILD_WORKERS
+    plan = plan_shards(ministries, workers)
+    if not plan:
+        logger.warning("No PDFs found to index")
+        return {"pdfs": 0, "failed": 0, "chunks": 0, "merged": 0, "shards": []}
+
+    for i, units in enumerate(plan):
+        pdf_count = sum(len(unit.pdf_paths) for unit in units)
+        names = ", ".join(sorted({unit.ministry for unit in units}))
+        logger.info(f"Shard {i}: {pdf_count} PDFs from {names}")
+
+    shard_root = Path(Config.INDEX_BUILD_SHARD_DIR)
+    shutil.rmtree(shard_root, ignore_errors=True)
+    shard_root.mkdir(parents=True, exist_ok=True)
+
+    # Every worker loads its own encoder; split the cores so they do not oversubscribe
+    threads = max(1, (os.cpu_count() or 1) // len(plan))
+    context = multiprocessing.get_context("spawn")
+    shard_stats = []
+
+    with ProcessPoolExecutor(max_workers=len(plan), mp_context=context) as pool:
+        futures = [
+            pool.submit(build_shard, str(shard_root / f"shard_{i}"), units, threads)
+            for i, units in enumerate(plan)
+        ]
+        for future in as_completed(futures):
+            stats = future.result()
+            shard_stats.append(stats)
+            logger.info(
+                f"Built {stats['shard']}: {stats['chunks']} chunks from {stats['pdfs']} PDFs "
+                f"in {stats['seconds']:.1f}s"
+            )
+
+    # A single writer folds the shards into the live store without re-embedding
+    merged = 0
+    with vector_store.deferred_partition_refresh():
+        for i in range(len(plan)):
+            merged += vector_store.merge_from(shard_root / f"shard_{i}")
+    shutil.rmtree(shard_root, ignore_errors=True)
+
+    return {
+        "pdfs": sum(stats["pdfs"] for stats in shard_stats),
+        "failed": sum(stats["failed"] for stats in shard_stats),
+        "chunks": sum(stats["chunks"] for stats in shard_stats),
+        "merged": merged,
+        "shards": sorted(shard_stats, key=lambda stats: stats["shard"]),
+    }
@@ -0,0 +1,148 @@
+import logging
+import re
+from typing import List, Optional, Tuple
+from transformers import AutoTokenizer
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+|\n\s*\n+")
+
+# [CLS] and [SEP] are added by the encoder and count against its window
+SPECIAL_TOKENS = 2
+
+
+class TokenTextSplitter:
+    def __init__(
+        self,
+        chunk_tokens: int = None,
+        overlap_tokens: int = None,
+        model_name: str = None,
+    ):
+        self.model_name = model_name or Config.EMBEDDING_MODEL
+        self.chunk_tokens = chunk_tokens or Config.CHUNK_TOKEN_SIZE
+        self.overlap_tokens = (
+            overlap_tokens if overlap_tokens is not None else Config.CHUNK_TOKEN_OVERLAP
+        )
+
+        max_tokens = Config.EMBEDDING_MAX_TOKENS - SPECIAL_TOKENS
+        if self.chunk_tokens > max_tokens:
+            logger.warning(
+                f"Chunk size of {self.chunk_tokens} tokens exceeds the embedding window, "
+                f"using {max_tokens}"
+            )
+            self.chunk_tokens = max_tokens
+
+        if self.overlap_tokens >= self.chunk_tokens:
+            self.overlap_tokens = self.chunk_tokens // 4
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+
+        encoded = self.tokenizer(
+            texts, add_special_tokens=False, return_attention_mask=False
+        )
+        return [len(ids) + SPECIAL_TOKENS for ids in encoded["input_ids"]]
+
+    def split_text(self, text: str) -> List[str]:
+        if not text or not text.strip():
+            return []
+
+        spans = self._sentence_spans(text)
+        if not spans:
+            return []
+
+        # A single batched call through the Rust tokenizer for the whole document
+        encoded = self.tokenizer(
+            [text[start:end] for start, end in spans],
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_offsets_mapping=True,
+        )
+
+        units = []
+        for (start, end), ids, offsets in zip(
+            spans, encoded["input_ids"], encoded["offset_mapping"]
+        ):
+            if not ids:
+                continue
+
+            if len(ids) <= self.chunk_tokens:
+                units.append((start, end, len(ids)))
+            else:
+                units.extend(self._split_long_sentence(start, offsets))
+
+        return [text[start:end].strip() for start, end in self._pack(units)]
+
+    def _sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        spans = []
+        position = 0
+
+        for match in SENTENCE_BOUNDARY.finditer(text):
+            if match.start() > position:
+                spans.append((position, match.start()))
+            position = match.end()
+
+        if position < len(text):
+            spans.append((position, len(text)))
+
+        return [(start, end) for start, end in spans if text[start:end].strip()]
+
+    def _split_long_sentence(
+        self, base: int, offsets: List[Tuple[int, int]]
+    ) -> List[Tuple[int, int, int]]:
+        units = []
+
+        for i in range(0, len(offsets), self.chunk_tokens):
+            window = offsets[i : i + self.chunk_tokens]
+            units.append((base + window[0][0], base + window[-1][1], len(window)))
+
+        return units
+
+    def _pack(self, units: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+        chunks = []
+        current = []
+        current_tokens = 0
+
+        for unit in units:
+            if current and current_tokens + unit[2] > self.chunk_tokens:
+                chunks.append((current[0][0], current[-1][1]))
+                current, current_tokens = self._overlap_tail(current, unit[2])
+
+            current.append(unit)
+            current_tokens += unit[2]
+
+        if current:
+            chunks.append((current[0][0], current[-1][1]))
+
+        return chunks
+
+    def _overlap_tail(
+        self, units: List[Tuple[int, int, int]], incoming_tokens: int
+    ) -> Tuple[List[Tuple[int, int, int]], int]:
+        budget = min(self.overlap_tokens, self.chunk_tokens - incoming_tokens)
+        tail = []
+        tokens = 0
+
+        for unit in reversed(units):
+            if tokens + unit[2] > budget:
+                break
+            tail.insert(0, unit)
+            tokens += unit[2]
+
+        return tail, tokens
+
+
+_splitter: Optional[TokenTextSplitter] = None
+
+
+def get_token_splitter() -> TokenTextSplitter:
+    global _splitter
+
+    if _splitter is None:
+        _splitter = TokenTextSplitter()
+
+    return _splitter
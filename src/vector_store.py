@@ -1,14 +1,30 @@
+import contextvars
+import heapq
 import logging
+import random
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 import os
 import json
 from pathlib import Path
+from .chunk_store import ChunkTextStore, text_hash
 from .config import Config
+from .embedding_service import EmbeddingBatcher, RemoteEmbeddingFunction
+from .metadata_fields import RangeFilter, build_where, typed_metadata
+from .metrics import record_partition_skip, track_stage
+from .partition_cache import PartitionCache, normalize
+from .pdf_catalog import ChunkRecord, PdfCatalog
+from .profiler import profile_request
+from .relevance_gate import GateDecision, RelevanceGate
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +32,20 @@ logger = logging.getLogger(__name__)
 class VectorStore:
     def __init__(self):
         self._initialize_db()
+        self.pdf_catalog = PdfCatalog()
+        self.chunk_texts = ChunkTextStore()
+        self.partitions = PartitionCache() if Config.PARTITION_RESIDENCY_ENABLED else None
+        self.relevance_gate = RelevanceGate()
+        self.scatter_pool = ThreadPoolExecutor(
+            max_workers=Config.SCATTER_MAX_WORKERS, thread_name_prefix="ministry-search"
+        )
         self.indexed_ministries = set()
         self._load_indexed_ministries()
 
+        self._dirty_lock = threading.Lock()
+        self._dirty_partitions = set()
+        self._defer_depth = 0
+
     def _initialize_db(self):
         try:
             settings = Settings(
@@ -32,17 +59,28 @@ class VectorStore:
                 path=str(Config.VECTOR_DB_DIR), settings=settings
             )
 
-            self.embedding_function = (
-                embedding_functions.SentenceTransformerEmbeddingFunction(
-                    model_name=Config.EMBEDDING_MODEL
+            if Config.EMBEDDING_SERVICE_URL:
+                self.embedding_function = RemoteEmbeddingFunction()
+                self.query_embedder = self.embedding_function
+            else:
+                self.embedding_function = (
+                    embedding_functions.SentenceTransformerEmbeddingFunction(
+                        model_name=Config.EMBEDDING_MODEL
+                    )
+                )
+                self.query_embedder = (
+                    EmbeddingBatcher(self.embedding_function)
+                    if Config.EMBEDDING_BATCHING_ENABLED
+                    else self.embedding_function
                 )
-            )
 
             self.collection = self.client.get_or_create_collection(
                 name="ministry_documents",
                 embedding_function=self.embedding_function,
-                metadata={"hnsw:space": "cosine"},
+                metadata=Config.hnsw_metadata(),
             )
+            # Chroma has no index on metadata values, so ministry and range filters scan its
+            # metadata table; with PARTITION_RESIDENCY_ENABLED they run on partition columns instead
 
             logger.info("Successfully initialized vector database")
 
@@ -117,14 +155,236 @@ class VectorStore:
         self.indexed_ministries.add(ministry)
         self._save_indexed_ministries()
 
+    def has_source(self, filename: str, ministry: str = None) -> bool:
+        """Whether ``filename`` is indexed, under ``ministry`` if given, otherwise under any."""
+        try:
+            # Chunks reference their PDF by id; ones indexed before the catalog carry the filename
+            pdf_id = self.pdf_catalog.pdf_id(filename, ministry)
+            if pdf_id is not None:
+                where = {"pdf_id": {"$eq": pdf_id}}
+            elif ministry is not None:
+                where = {"$and": [{"filename": {"$eq": filename}}, {"ministry": {"$eq": ministry}}]}
+            else:
+                where = {"filename": {"$eq": filename}}
+            results = self.collection.get(where=where, limit=1, include=[])
+            return bool(results["ids"])
+        except Exception as e:
+            logger.warning(f"Error checking for indexed source {filename}: {e}")
+            return False
+
+    def ids_for_ministry(self, ministry: str) -> List[str]:
+        results = self.collection.get(where={"ministry": {"$eq": ministry}}, include=[])
+        return results["ids"]
+
+    def delete_ids(self, ids: List[str], batch_size: int = 5000):
+        ministries = set()
+        for i in range(0, len(ids), batch_size):
+            batch = ids[i : i + batch_size]
+            if self.partitions is not None:
+                results = self.collection.get(ids=batch, include=["metadatas"])
+                ministries.update((metadata or {}).get("ministry") for metadata in results["metadatas"])
+            self.collection.delete(ids=batch)
+            self.chunk_texts.delete_many(batch)
+
+        self._partitions_changed(ministries)
+        logger.info(f"Deleted {len(ids)} documents from vector store")
+
+    def refresh_partitions(self, ministries):
+        """Rewrite the partition files of ministries whose documents changed."""
+        if self.partitions is None:
+            return
+
+        for ministry in ministries:
+            if not ministry:
+                continue
+            results = self.collection.get(
+                where={"ministry": {"$eq": ministry}}, include=["embeddings", "metadatas"]
+            )
+            if results["ids"]:
+                self.partitions.write(ministry, results["ids"], results["embeddings"], results["metadatas"])
+            else:
+                self.partitions.remove(ministry)
+
+    def _partitions_changed(self, ministries):
+        if self.partitions is None:
+            return
+        with self._dirty_lock:
+            if self._defer_depth:
+                self._dirty_partitions.update(ministry for ministry in ministries if ministry)
+                return
+        self.refresh_partitions(ministries)
+
+    def refresh_dirty_partitions(self):
+        """Rewrite the partitions changed since the last refresh of a deferred block."""
+        with self._dirty_lock:
+            dirty, self._dirty_partitions = self._dirty_partitions, set()
+        self.refresh_partitions(sorted(dirty))
+
+    @contextmanager
+    def deferred_partition_refresh(self):
+        """Rewrite each changed partition once when the block exits instead of on every write.
+
+        Partition search keeps serving the previous files until then, so wrap
+        runs and jobs, not single requests.
+        """
+        with self._dirty_lock:
+            self._defer_depth += 1
+        try:
+            yield self
+        finally:
+            with self._dirty_lock:
+                self._defer_depth -= 1
+                outermost = self._defer_depth == 0
+            if outermost:
+                self.refresh_dirty_partitions()
+
+    def rebuild_partitions(self):
+        self.refresh_partitions(sorted(self.indexed_ministries))
+
+    def build_relevance_prototypes(self) -> int:
+        """Summarise each indexed ministry for the relevance gate from a sample of its vectors."""
+        rng = random.Random(13)
+        vectors = {}
+
+        for ministry in sorted(self.indexed_ministries):
+            where = {"ministry": {"$eq": ministry}}
+            ids = self.collection.get(where=where, include=[])["ids"]
+            if not ids:
+                continue
+            sample = rng.sample(ids, min(len(ids), Config.RELEVANCE_PROTOTYPE_SAMPLE))
+            vectors[ministry] = np.asarray(
+                self.collection.get(ids=sample, include=["embeddings"])["embeddings"], dtype=np.float32
+            )
+
+        self.relevance_gate.write_prototypes(vectors)
+        return len(vectors)
+
+    def preload_partitions(self) -> List[str]:
+        if self.partitions is None or not Config.PARTITION_PRELOAD:
+            return []
+        return self.partitions.preload()
+
+    def merge_from(self, shard_dir: Path, batch_size: int = 1000) -> int:
+        """Copy a separately built shard into this store, reusing its embeddings."""
+        shard_dir = Path(shard_dir)
+        shard_client = chromadb.PersistentClient(
+            path=str(shard_dir),
+            settings=Settings(anonymized_telemetry=False, is_persistent=True, persist_directory=str(shard_dir)),
+        )
+        shard = shard_client.get_collection(
+            "ministry_documents", embedding_function=self.embedding_function
+        )
+
+        # Each shard numbered its PDFs independently; renumber into this catalog
+        shard_catalog = PdfCatalog(shard_dir / "pdf_catalog.sqlite3")
+        pdf_ids = {}
+        for record in shard_catalog.records():
+            shard_pdf_id = record.pdf_id
+            pdf_ids[shard_pdf_id] = self.pdf_catalog.add(record)
+        shard_catalog.close()
+        shard_texts = ChunkTextStore(shard_dir)
+
+        merged = 0
+        ministries = set()
+        while True:
+            results = shard.get(
+                include=["embeddings", "metadatas"], limit=batch_size, offset=merged
+            )
+            if not results["ids"]:
+                break
+
+            metadatas = []
+            for metadata in results["metadatas"]:
+                metadata = dict(metadata or {})
+                if metadata.get("pdf_id") in pdf_ids:
+                    metadata["pdf_id"] = pdf_ids[metadata["pdf_id"]]
+                ministries.add(metadata.get("ministry", "Unknown Ministry"))
+                metadatas.append(metadata)
+
+            texts = shard_texts.get_many(results["ids"])
+            self.chunk_texts.put_many(list(texts), list(texts.values()))
+            self.collection.add(ids=results["ids"], embeddings=results["embeddings"], metadatas=metadatas)
+            merged += len(results["ids"])
+
+        self.indexed_ministries.update(ministries)
+        self._save_indexed_ministries()
+        self._partitions_changed(ministries)
+        shard_texts.close()
+        logger.info(f"Merged {merged} documents from {shard_dir}")
+        return merged
+
+    def backfill_typed_metadata(self, batch_size: int = 1000) -> int:
+        """Add the typed range-filter fields to chunks indexed before they existed."""
+        updated = 0
+        offset = 0
+        touched = set()
+
+        while True:
+            results = self.collection.get(include=["metadatas"], limit=batch_size, offset=offset)
+            if not results["ids"]:
+                break
+
+            ids = []
+            metadatas = []
+            for doc_id, metadata in zip(results["ids"], results["metadatas"]):
+                metadata = metadata or {}
+                typed = typed_metadata(metadata)
+                if any(metadata.get(key) != value for key, value in typed.items()):
+                    ids.append(doc_id)
+                    metadatas.append({**metadata, **typed})
+                    touched.add(metadata.get("ministry"))
+
+            if ids:
+                self.collection.update(ids=ids, metadatas=metadatas)
+                updated += len(ids)
+
+            offset += len(results["ids"])
+
+        self.refresh_partitions(touched)
+        logger.info(f"Backfilled typed metadata on {updated} documents")
+        return updated
+
+    def migrate_chunk_text(self, batch_size: int = 500) -> int:
+        """Move chunk texts that chroma still stores into the chunk text store."""
+        legacy_ids = []
+        offset = 0
+        while True:
+            results = self.collection.get(include=["documents"], limit=5000, offset=offset)
+            if not results["ids"]:
+                break
+            legacy_ids.extend(doc_id for doc_id, text in zip(results["ids"], results["documents"]) if text)
+            offset += len(results["ids"])
+
+        for i in range(0, len(legacy_ids), batch_size):
+            results = self.collection.get(
+                ids=legacy_ids[i : i + batch_size], include=["embeddings", "documents"]
+            )
+            self.chunk_texts.put_many(results["ids"], results["documents"])
+            # Blank the text in place so the vector is never missing; passing the embeddings
+            # stops chroma re-embedding, and a rerun after a crash just copies the batch again
+            self.collection.update(
+                ids=results["ids"],
+                embeddings=results["embeddings"],
+                documents=[""] * len(results["ids"]),
+            )
+
+        logger.info(f"Moved the text of {len(legacy_ids)} chunks out of chroma")
+        return len(legacy_ids)
+
+    def chunk_text(self, ids: List[str]) -> Dict[str, str]:
+        texts = self.chunk_texts.get_many(ids)
+        texts.update(self._legacy_texts([doc_id for doc_id in ids if doc_id not in texts]))
+        return texts
+
     def create_embedding(self, text: str) -> List[float]:
         try:
-            return self.embedding_function([text])[0]
+            with track_stage("query_embedding"):
+                return self.query_embedder([text])[0]
         except Exception as e:
             logger.error(f"Error creating embedding: {e}")
             raise
 
-    def add_documents(self, documents: List[Dict[str, Any]], ministry: str = None):
+    def add_documents(self, documents: List[Union[ChunkRecord, Dict[str, Any]]], ministry: str = None):
         try:
             if not documents:
                 logger.warning("No documents to add")
@@ -132,6 +392,7 @@ class VectorStore:
 
             batch_size = 100
             total_added = 0
+            touched = set()
 
             for i in range(0, len(documents), batch_size):
                 batch = documents[i : i + batch_size]
@@ -141,6 +402,13 @@ class VectorStore:
                 metadatas = []
 
                 for doc in batch:
+                    if isinstance(doc, ChunkRecord):
+                        if doc.text:
+                            ids.append(doc.id)
+                            texts.append(doc.text)
+                            metadatas.append(self._compact_metadata(doc, ministry))
+                        continue
+
                     if not isinstance(doc, dict) or "text" not in doc:
                         continue
 
@@ -160,10 +428,15 @@ class VectorStore:
                     metadatas.append(metadata)
 
                 if texts:
-                    self.collection.add(ids=ids, documents=texts, metadatas=metadatas)
+                    # chroma holds only ids, vectors and filter fields; the text goes to the chunk store
+                    embeddings = self.embedding_function(texts)
+                    self.chunk_texts.put_many(ids, texts)
+                    self.collection.add(ids=ids, embeddings=embeddings, metadatas=metadatas)
                     total_added += len(texts)
+                    touched.update(metadata["ministry"] for metadata in metadatas)
 
             logger.info(f"Added {total_added} documents to vector store")
+            self._partitions_changed(touched)
 
             if ministry:
                 self.add_ministry_to_indexed(ministry)
@@ -172,6 +445,20 @@ class VectorStore:
             logger.error(f"Error adding documents: {e}")
             raise
 
+    def _compact_metadata(self, chunk: ChunkRecord, ministry: str = None) -> Dict[str, Any]:
+        # Only what filters need is stored per chunk; the rest is one catalog row per PDF
+        pdf = chunk.pdf
+        if pdf.pdf_id is None:
+            pdf.ministry = pdf.metadata.get("ministry") or ministry or "Unknown Ministry"
+            self.pdf_catalog.add(pdf)
+
+        return {
+            "ministry": pdf.ministry,
+            "pdf_id": pdf.pdf_id,
+            "chunk_index": chunk.chunk_index,
+            **pdf.filter_fields,
+        }
+
     def _clean_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         cleaned = {}
 
@@ -190,59 +477,188 @@ class VectorStore:
         return cleaned
 
     def search_with_embedding(
-        self, embedding: List[float], ministry: str, n_results: int = 10
+        self,
+        embedding: List[float],
+        ministry: str,
+        n_results: int = 10,
+        range_filter: Optional[RangeFilter] = None,
     ) -> List[Dict[str, Any]]:
+        if range_filter is not None and range_filter.is_empty():
+            range_filter = None
+
         try:
             try:
-                where_clause = {"ministry": {"$eq": ministry}} if ministry else None
+                if self.partitions is not None and ministry:
+                    self.partitions.record_query(ministry)
 
-                results = self.collection.query(
-                    query_embeddings=[embedding],
-                    n_results=n_results * 2,
-                    where=where_clause,
-                )
+                with track_stage("vector_search"):
+                    results = self._query(
+                        embedding, ministry, n_results * Config.SEARCH_OVERFETCH_FACTOR, range_filter
+                    )
 
                 if results["ids"] and results["ids"][0]:
-                    return self._process_search_results(results, n_results)
+                    with track_stage("post_processing"):
+                        return self._process_search_results(results, n_results, range_filter)
 
             except Exception as inner_e:
                 logger.warning(f"Error searching with ministry filter: {inner_e}")
 
-            logger.info(f"Trying fallback search without ministry filter for {ministry}")
-            results = self.collection.query(
+            # The fallback widens the ministry, never the requested date or session range,
+            # and stays bounded by the per-ministry cap and deadline of a cross-ministry search
+            logger.info(f"Trying fallback search across all ministries for {ministry}")
+            documents = self.search_all_ministries(embedding, n_results, range_filter)
+            # Flag the widened hits so callers can say they come from other ministries
+            for document in documents:
+                document["metadata"] = {**(document.get("metadata") or {}), "fallback": True}
+            return documents
+
+        except Exception as e:
+            logger.error(f"Error searching with embedding: {e}")
+            return []
+
+    def _search_partition(
+        self, embedding: List[float], ministry: str, n_results: int, range_filter: Optional[RangeFilter]
+    ) -> List[Dict[str, Any]]:
+        with track_stage("partition_search"):
+            results = self._query(
+                embedding, ministry, n_results * Config.SEARCH_OVERFETCH_FACTOR, range_filter
+            )
+        return self._process_search_results(results, n_results, range_filter, hydrate=False)
+
+    def _query(
+        self, embedding: List[float], ministry: str, n_candidates: int, range_filter: Optional[RangeFilter]
+    ) -> Dict[str, Any]:
+        partition = self.partitions.get(ministry) if self.partitions is not None and ministry else None
+
+        if partition is None:
+            return self.collection.query(
                 query_embeddings=[embedding],
-                n_results=n_results * 2
+                n_results=n_candidates,
+                where=build_where(ministry, range_filter),
+                include=["metadatas", "distances"],
             )
 
-            return self._process_search_results(results, n_results)
+        # Only the partition's vectors are scanned; chroma's HNSW is never loaded for this query
+        query = normalize(np.asarray(embedding, dtype=np.float32))
+        hits = partition.search(query, n_candidates, range_filter)
+
+        found = self.collection.get(ids=[doc_id for doc_id, _ in hits], include=["metadatas"])
+        by_id = dict(zip(found["ids"], found["metadatas"]))
+        hits = [(doc_id, distance) for doc_id, distance in hits if doc_id in by_id]
+
+        return {
+            "ids": [[doc_id for doc_id, _ in hits]],
+            "metadatas": [[by_id[doc_id] for doc_id, _ in hits]],
+            "distances": [[distance for _, distance in hits]],
+        }
+
+    def search_all_ministries(
+        self,
+        embedding: List[float],
+        n_results: int = 10,
+        range_filter: Optional[RangeFilter] = None,
+        per_ministry_cap: int = None,
+        deadline: float = None,
+    ) -> List[Dict[str, Any]]:
+        """Query every indexed ministry in parallel and merge the best results.
 
-        except Exception as e:
-            logger.error(f"Error searching with embedding: {e}")
+        Partitions still running when the deadline passes are left out of the
+        answer rather than delaying it.
+        """
+        if range_filter is not None and range_filter.is_empty():
+            range_filter = None
+
+        ministries = sorted(self.indexed_ministries)
+        if not ministries:
             return []
 
-    def _process_search_results(self, results, n_results):
+        per_ministry_cap = per_ministry_cap or Config.SCATTER_PER_MINISTRY_CAP
+        deadline = Config.SCATTER_DEADLINE if deadline is None else deadline
+        partition_k = min(n_results, per_ministry_cap)
+
+        with track_stage("scatter_gather"):
+            futures = {
+                self.scatter_pool.submit(
+                    contextvars.copy_context().run,
+                    self._search_partition,
+                    embedding,
+                    ministry,
+                    partition_k,
+                    range_filter,
+                ): ministry
+                for ministry in ministries
+            }
+            done, not_done = wait(futures, timeout=deadline)
+
+            for future in not_done:
+                future.cancel()
+                record_partition_skip("deadline")
+            if not_done:
+                logger.warning(
+                    f"Skipped {len(not_done)} of {len(ministries)} ministries that missed the "
+                    f"{deadline:.2f}s deadline"
+                )
+
+            partials = []
+            for future in done:
+                try:
+                    partials.append(future.result())
+                except Exception as e:
+                    record_partition_skip("error")
+                    logger.warning(f"Error searching {futures[future]}: {e}")
+
+        with track_stage("post_processing"):
+            # Each partial list is already ordered by distance, so a heap merge keeps the global order
+            documents = []
+            per_ministry = Counter()
+            keys = self._dedup_keys([document["id"] for partial in partials for document in partial])
+            seen_keys = set()
+
+            for document in heapq.merge(*partials, key=lambda doc: doc["distance"]):
+                ministry = (document["metadata"] or {}).get("ministry")
+                key = keys.get(document["id"], document["id"])
+                if per_ministry[ministry] >= per_ministry_cap or key in seen_keys:
+                    continue
+
+                per_ministry[ministry] += 1
+                seen_keys.add(key)
+                documents.append(document)
+                if len(documents) >= n_results:
+                    break
+
+        return self._hydrate(documents)
+
+    def _process_search_results(
+        self, results, n_results, range_filter: RangeFilter = None, hydrate: bool = True
+    ):
         if not results["ids"] or not results["ids"][0]:
             return []
 
         documents = []
-        seen_texts = set()  
+        keys = self._dedup_keys(results["ids"][0])
+        seen_keys = set()
 
         for i in range(len(results["ids"][0])):
             doc_id = results["ids"][0][i]
-            doc_text = results["documents"][0][i]
             doc_metadata = results["metadatas"][0][i]
 
-            if doc_text in seen_texts:
+            # Duplicate chunks are recognised by content hash, before any text is read
+            key = keys.get(doc_id, doc_id)
+            if key in seen_keys:
                 continue
 
-            seen_texts.add(doc_text)
+            # The where clause matches whole months and sessions; trim to the exact bounds
+            if range_filter is not None and not range_filter.matches(doc_metadata or {}):
+                continue
+
+            seen_keys.add(key)
 
             distance = results["distances"][0][i] if "distances" in results else 0.0
             similarity = 1.0 - distance 
 
             document = {
                 "id": doc_id,
-                "text": doc_text,
+                "text": None,
                 "metadata": doc_metadata,
                 "distance": distance,
                 "relevance_score": similarity,
@@ -255,23 +671,84 @@ class VectorStore:
 
         documents.sort(key=lambda x: x["relevance_score"], reverse=True)
 
+        return self._hydrate(documents) if hydrate else documents
+
+    def _legacy_texts(self, ids: List[str]) -> Dict[str, str]:
+        # Chunks indexed before the chunk store existed still keep their text in chroma
+        if not ids:
+            return {}
+        found = self.collection.get(ids=ids, include=["documents"])
+        return {doc_id: text for doc_id, text in zip(found["ids"], found["documents"]) if text}
+
+    def _dedup_keys(self, ids: List[str]) -> Dict[str, str]:
+        keys = self.chunk_texts.hashes(ids)
+        legacy = self._legacy_texts([doc_id for doc_id in ids if doc_id not in keys])
+        keys.update((doc_id, text_hash(text)) for doc_id, text in legacy.items())
+        return keys
+
+    def _hydrate(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Text is read and decompressed for the returned chunks only
+        with track_stage("hydrate"):
+            texts = self.chunk_text([document["id"] for document in documents])
+            for document in documents:
+                document["text"] = texts.get(document["id"], "")
+        return self._resolve_metadata(documents)
+
+    def _resolve_metadata(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Resolve per-PDF metadata for the returned chunks only
+        resolved = self.pdf_catalog.resolve([document["metadata"] or {} for document in documents])
+        for document, metadata in zip(documents, resolved):
+            document["metadata"] = metadata
         return documents
 
     def search_by_text(
-        self, query: str, ministry: str, n_results: int = 10
+        self,
+        query: str,
+        ministry: str,
+        n_results: int = 10,
+        range_filter: Optional[RangeFilter] = None,
     ) -> List[Dict[str, Any]]:
-        try:
-            embedding = self.create_embedding(query)
+        with profile_request(ministry, stage_root="search_by_text"):
+            try:
+                embedding = self.create_embedding(query)
+                return self._search(embedding, ministry, n_results, range_filter)
 
-            return self.search_with_embedding(embedding, ministry, n_results)
+            except Exception as e:
+                logger.error(f"Error searching by text: {e}")
+                return []
+
+    def search_for_answer(
+        self,
+        query: str,
+        ministry: str,
+        n_results: int = 10,
+        range_filter: Optional[RangeFilter] = None,
+    ) -> Tuple[List[Dict[str, Any]], GateDecision]:
+        """Search, then decide with the same query embedding whether the LLM should be asked."""
+        with profile_request(ministry, stage_root="search_for_answer"):
+            embedding = self.create_embedding(query)
+            try:
+                documents = self._search(embedding, ministry, n_results, range_filter)
+            except Exception as e:
+                logger.error(f"Error searching for answer: {e}")
+                documents = []
+            return documents, self.relevance_gate.check(embedding, ministry, documents)
 
-        except Exception as e:
-            logger.error(f"Error searching by text: {e}")
-            return []
+    def _search(
+        self, embedding: List[float], ministry: str, n_results: int, range_filter: Optional[RangeFilter]
+    ) -> List[Dict[str, Any]]:
+        if not ministry or ministry == Config.ALL_MINISTRIES:
+            return self.search_all_ministries(embedding, n_results, range_filter)
+        return self.search_with_embedding(embedding, ministry, n_results, range_filter)
 
     def clear(self):
         try:
             self.collection.delete(where={})
+            self.pdf_catalog.clear()
+            self.chunk_texts.clear()
+            if self.partitions is not None:
+                for ministry in self.indexed_ministries:
+                    self.partitions.remove(ministry)
             self.indexed_ministries.clear()
             self._save_indexed_ministries()
             logger.info("Cleared vector store")
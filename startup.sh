@@ -8,4 +8,6 @@ python3 -m pip install --upgrade pysqlite3-binary
 export PYTHONPATH=/home/site/wwwroot/antenv/lib/python3.11/site-packages/pysqlite3
 export LD_PRELOAD=/home/site/wwwroot/antenv/lib/python3.11/site-packages/pysqlite3/libsqlite3.so
 
+python3 scripts/index_snapshot.py restore --if-needed || echo "Index snapshot restore skipped"
+
 streamlit run app.py --server.port 8000 --server.address 0.0.0.0
\ No newline at end of file
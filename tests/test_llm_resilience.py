@@ -0,0 +1,170 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stubs import StubGenerativeModel, StubUpstreamError
+from src.config import Config
+from src.llm_client import LLMClient
+from src.resilience import CLOSED, OPEN, CircuitBreaker, CircuitOpen, UpstreamTimeout
+
+PROMPT = "What has the ministry done about coal supply?"
+SLOW = 1.0
+COOLDOWN = 0.2
+
+
+class LLMResilienceTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patches = {
+            "LLM_CALL_TIMEOUT": 0.4,
+            "LLM_HEDGING_ENABLED": True,
+            "LLM_HEDGE_INITIAL_DELAY": 0.1,
+            "LLM_HEDGE_MIN_DELAY": 0.1,
+            "LLM_MAX_WORKERS": 1,
+            "LLM_MAX_ABANDONED_CALLS": 8,
+            "METRICS_ENABLED": False,
+        }
+        for name, value in patches.items():
+            patcher = mock.patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def client(self, **stub_options) -> LLMClient:
+        stub_options.setdefault("latency", 0.01)
+        stub_options.setdefault("jitter", 0.0)
+        client = LLMClient(model=StubGenerativeModel(seed=0, **stub_options))
+        client.breaker = CircuitBreaker("gemini", failure_threshold=3, cooldown=COOLDOWN)
+        return client
+
+    async def trip(self, client: LLMClient):
+        client.model.outage = True
+        for _ in range(client.breaker.failure_threshold):
+            with self.assertRaises(StubUpstreamError):
+                await client._generate_guarded(PROMPT)
+        self.assertEqual(client.breaker.state, OPEN)
+
+    async def test_hedge_fires_after_delay_and_first_success_wins(self):
+        client = self.client(latencies=[SLOW, 0.01])
+
+        start = time.monotonic()
+        response = await client._generate_guarded(PROMPT)
+        elapsed = time.monotonic() - start
+
+        self.assertIn("stub answer", response.text)
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.3)
+        self.assertEqual(client.model.calls, 2)
+        self.assertEqual(client.hedges, {"sent": 1, "won": 1})
+
+    async def test_no_hedge_when_the_first_call_answers_in_time(self):
+        client = self.client()
+
+        await client._generate_guarded(PROMPT)
+
+        self.assertEqual(client.model.calls, 1)
+        self.assertEqual(client.hedges["sent"], 0)
+
+    async def test_deadline_raises_upstream_timeout(self):
+        client = self.client(latencies=[SLOW, SLOW])
+
+        start = time.monotonic()
+        with self.assertRaises(UpstreamTimeout):
+            await client._generate_guarded(PROMPT)
+
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(client.calls.abandoned, 2)
+
+    async def test_abandoned_calls_do_not_block_the_next_call(self):
+        client = self.client(latencies=[SLOW, SLOW])
+        with self.assertRaises(UpstreamTimeout):
+            await client._generate_guarded(PROMPT)
+
+        # Both hung calls are still running, but the next one gets a thread at once
+        start = time.monotonic()
+        await client._generate_guarded(PROMPT)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    async def test_abandoned_calls_past_the_limit_are_refused(self):
+        client = self.client(latencies=[SLOW, SLOW])
+        client.calls.limit = 2
+        with self.assertRaises(UpstreamTimeout):
+            await client._generate_guarded(PROMPT)
+
+        with self.assertRaises(CircuitOpen):
+            await client._generate_guarded(PROMPT)
+        self.assertEqual(client.model.calls, 2)
+
+        # Calls are let through again once the hung ones return
+        time.sleep(SLOW)
+        self.assertEqual(client.calls.abandoned, 0)
+        client.breaker = CircuitBreaker("gemini", failure_threshold=3, cooldown=COOLDOWN)
+        await client._generate_guarded(PROMPT)
+
+    async def test_failures_open_the_breaker(self):
+        client = self.client()
+        await self.trip(client)
+
+        with self.assertRaises(CircuitOpen):
+            await client._generate_guarded(PROMPT)
+
+        # A failed first call is hedged at once, so each request reaches the stub twice
+        self.assertEqual(client.model.errors, 2 * client.breaker.failure_threshold)
+
+    async def test_probe_after_cooldown_closes_the_breaker(self):
+        client = self.client()
+        await self.trip(client)
+        client.model.outage = False
+        time.sleep(COOLDOWN)
+
+        response = await client._generate_guarded(PROMPT)
+
+        self.assertIn("stub answer", response.text)
+        self.assertEqual(client.breaker.state, CLOSED)
+
+    async def test_only_one_probe_is_let_through(self):
+        client = self.client()
+        await self.trip(client)
+        client.model.outage = False
+        time.sleep(COOLDOWN)
+
+        client.breaker.allow()
+        with self.assertRaises(CircuitOpen):
+            await client._generate_guarded(PROMPT)
+
+    async def test_failed_probe_reopens_the_breaker(self):
+        client = self.client()
+        await self.trip(client)
+        time.sleep(COOLDOWN)
+
+        with self.assertRaises(StubUpstreamError):
+            await client._generate_guarded(PROMPT)
+
+        self.assertEqual(client.breaker.state, OPEN)
+        with self.assertRaises(CircuitOpen):
+            await client._generate_guarded(PROMPT)
+
+    async def test_client_errors_do_not_count_as_failures(self):
+        client = self.client(error_code=400)
+        client.model.outage = True
+
+        for _ in range(2 * client.breaker.failure_threshold):
+            with self.assertRaises(StubUpstreamError):
+                await client._generate_guarded(PROMPT)
+
+        self.assertEqual(client.breaker.state, CLOSED)
+
+    async def test_open_breaker_answers_retrieval_only(self):
+        client = self.client()
+        await self.trip(client)
+        context = [{"text": "Coal supply rose 8%.", "metadata": {"filename": "AU123.pdf"}}]
+
+        answer = await client.generate_response(PROMPT, context, "Ministry of Coal")
+
+        self.assertIn("AU123.pdf", answer)
+
+
+if __name__ == "__main__":
+    unittest.main()